@@ -0,0 +1,148 @@
+"""
+Benchmark the analyze -> cover letter -> PDF pipeline
+
+Run from the app directory, offline against the mock backend by default:
+
+    python -m benchmarks.llm_pipeline --runs 20 --strategy full --stream
+
+Use --backend openai to measure the real API (this spends tokens).
+"""
+import os
+import argparse
+import tempfile
+
+import httpx
+
+from config import DEFAULT_MODEL
+from services.analyzer import JobResumeAnalyzer
+from services.generator import CoverLetterGenerator, STRATEGIES
+from services.openai_client import create_openai_client, BACKENDS
+from services.mock_transport import MockResponsesTransport
+from services.llm_cache import get_llm_cache
+from utils.pdf_generator import convert_response_to_pdf
+from benchmarks.timing import StageTimer
+
+SAMPLE_RESUME = """Data scientist with 4 years of experience in Python, SQL and machine learning.
+Built churn prediction models and forecasting pipelines deployed on AWS.
+Skills: Python, pandas, scikit-learn, SQL, Airflow, Docker, communication, mentoring."""
+
+SAMPLE_JOB = """Data Scientist (H/F) - Paris
+Vos missions
+- Concevoir et déployer des modèles de machine learning
+- Industrialiser les pipelines de données avec Airflow
+Profil recherché
+- 3 ans d'expérience minimum en Python et SQL
+- Connaissance d'un cloud public (AWS, GCP)"""
+
+
+def _read(path, default):
+    if not path:
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _drain(timer, stage, chunks):
+    """Consume a stream, recording the time to its first chunk, and return the chunks"""
+    with timer.time(stage):
+        iterator = iter(chunks)
+        first = next(iterator, None)
+    return ([] if first is None else [first]) + list(iterator)
+
+
+def run_benchmark(runs, backend, strategy, stream=False, resume=SAMPLE_RESUME, job_description=SAMPLE_JOB,
+                  model=None, latency=None, tokens_per_second=None):
+    """
+    Run the pipeline several times and time each stage
+
+    The response cache is turned off so every run makes its API calls and
+    benchmark outputs are never served to the app.
+
+    Args:
+        runs (int): Number of pipeline runs
+        backend (str): "mock", "openai" or "record"
+        strategy (str): Cover letter strategy
+        stream (bool): Use the streaming paths of the UI and also time the first chunk
+        resume (str): Resume text
+        job_description (str): Job description text
+        model (str, optional): Model name
+        latency (float, optional): Mock time to first token, MOCK_LLM_LATENCY by default
+        tokens_per_second (float, optional): Mock output throughput
+
+    Returns:
+        pd.DataFrame: p50/p95 latency per stage
+    """
+    get_llm_cache().enabled = False
+
+    http_client = None
+    if backend == "mock":
+        http_client = httpx.Client(transport=MockResponsesTransport(latency=latency, tokens_per_second=tokens_per_second))
+    client = create_openai_client(backend, http_client=http_client)
+    analyzer = JobResumeAnalyzer(model=model, client=client)
+    generator = CoverLetterGenerator(model=model, strategy=strategy, client=client)
+    timer = StageTimer()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for index in range(runs):
+            with timer.time("total"):
+                with timer.time("analysis"):
+                    if stream:
+                        chunks = _drain(timer, "analysis:first_chunk", analyzer.stream_analyze(
+                            resume, job_description, bypass_cache=True
+                        ))
+                        analysis = "".join(chunks)
+                    else:
+                        analysis = analyzer.analyze(resume, job_description, bypass_cache=True)
+
+                with timer.time("cover_letter"):
+                    if stream:
+                        chunks = _drain(timer, "cover_letter:first_chunk", generator.stream_generate(
+                            resume, job_description, analysis, bypass_cache=True
+                        ))
+                        cover_letter = "".join(text for stage, text in chunks if stage == "final")
+                        run = next((text for stage, text in chunks if stage == "stats"), None)
+                    else:
+                        cover_letter, run = generator.generate(
+                            resume, job_description, analysis, bypass_cache=True, return_stats=True
+                        )
+
+                run = run or {"stages": [], "stage_seconds": []}
+                for stage, seconds in zip(run["stages"], run["stage_seconds"]):
+                    timer.record(f"cover_letter:{stage}", seconds)
+
+                with timer.time("pdf"):
+                    convert_response_to_pdf(
+                        {"analysis": analysis, "final_cover_letter": cover_letter},
+                        os.path.join(output_dir, f"run_{index}.pdf")
+                    )
+
+    return timer.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis, cover letter and PDF pipeline")
+    parser.add_argument("--runs", type=int, default=10, help="Number of pipeline runs")
+    parser.add_argument("--backend", choices=BACKENDS, default="mock", help="LLM backend")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="full", help="Cover letter strategy")
+    parser.add_argument("--stream", action="store_true", help="Use the streaming code paths")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Model name")
+    parser.add_argument("--resume", help="Resume text file (a built-in sample by default)")
+    parser.add_argument("--job", help="Job description text file (a built-in sample by default)")
+    parser.add_argument("--latency", type=float, help="Mock time to first token in seconds")
+    parser.add_argument("--tokens-per-second", type=float, help="Mock output throughput")
+    args = parser.parse_args()
+
+    summary = run_benchmark(
+        args.runs, args.backend, args.strategy, stream=args.stream,
+        resume=_read(args.resume, SAMPLE_RESUME),
+        job_description=_read(args.job, SAMPLE_JOB),
+        model=args.model,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second
+    )
+    print(f"\n{args.runs} runs, backend={args.backend}, strategy={args.strategy}, stream={args.stream}")
+    print(summary.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Benchmark and regression-check scraper extraction against saved pages
+
+Capture fixtures from the live sites once (run from the app directory):
+
+    python -m benchmarks.scrapers capture --site hellowork --keywords "data scientist" --location Paris --details 5
+
+Then time extraction against the local replay server, and compare with a
+saved baseline to catch slower or changed extraction:
+
+    python -m benchmarks.scrapers run --repeat 5 --save-baseline scrapers_baseline.json
+    python -m benchmarks.scrapers run --repeat 5 --baseline scrapers_baseline.json
+
+--selenium also times the browser extraction paths (needs Chrome).
+Timing baselines are only comparable on the same machine.
+"""
+import sys
+import json
+import hashlib
+import argparse
+
+from scrapers.hellowork import HelloWorkScraper
+from scrapers.wttj import WTTJScraper
+from scrapers.fixtures import set_fixture_mode, get_fixture_store, get_replay_server
+from benchmarks.timing import StageTimer
+
+SCRAPERS = {"hellowork": HelloWorkScraper, "wttj": WTTJScraper}
+
+# Extraction steps per site and page kind:
+# (static HTML parser, Selenium extractor, readiness locator attribute)
+EXTRACTORS = {
+    "hellowork": {
+        "search": ("_parse_serp_cards", "_get_all_serp_cards", "SERP_CARD_LOCATOR"),
+        "detail": ("_parse_section_text", "_get_section_text", "JOB_DETAILS_LOCATOR"),
+    },
+    "wttj": {
+        "search": (None, "_get_all_job_cards", "JOB_CARD_LOCATOR"),
+        "detail": (None, "_extract_job_details", "JOB_DETAILS_LOCATOR"),
+    },
+}
+
+
+def fingerprint(result):
+    """Summarize an extraction result so that runs can be compared without storing it"""
+    if not result:
+        return None
+    if isinstance(result, list):
+        rows = [[card.get("title"), card.get("company"), card.get("location")] for card in result]
+        payload = json.dumps(rows, ensure_ascii=False)
+        return {"items": len(rows), "digest": hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]}
+
+    text = result.get("cleaned_text") if isinstance(result, dict) else result
+    text = text or ""
+    return {"chars": len(text), "digest": hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]}
+
+
+def capture(site, keywords, location, job_type=None, details=5, all_pages=False):
+    """Run a live search and detail fetches with every loaded page saved as a fixture"""
+    set_fixture_mode("capture")
+    scraper = SCRAPERS[site]()
+    cards = scraper.search_jobs(keywords, location, job_type, all_pages=all_pages)
+    print(f"Captured a search with {len(cards)} cards")
+
+    for card in cards[:details]:
+        if card.get("link"):
+            # Bypass the job cache so the page is actually loaded
+            scraper._fetch_job_details(card["link"])
+
+    store = get_fixture_store(site)
+    print(f"{len(store.pages())} {site} pages saved in {store.path}")
+
+
+def _time_selenium(timer, outputs, scraper, server, site, kind, page, repeat):
+    """Load a saved page in a browser and time the Selenium extractor on it"""
+    _, extractor, locator = EXTRACTORS[site][kind]
+    driver = scraper.acquire_driver()
+    if driver is None:
+        print("No WebDriver available, skipping the Selenium paths")
+        return False
+
+    try:
+        with timer.time(f"{site}:{kind}:load"):
+            driver.get(server.url(page["url"]))
+            scraper.wait_for_page_ready(driver, getattr(scraper, locator), f"{kind}_replay")
+
+        result = None
+        for _ in range(repeat):
+            with timer.time(f"{site}:{kind}:selenium"):
+                result = getattr(scraper, extractor)(driver)
+        outputs[f"{site}:{kind}:selenium:{server.store.key(page['url'])}"] = fingerprint(result)
+    finally:
+        scraper.release_driver(driver)
+    return True
+
+
+def run(sites, repeat=5, selenium=False):
+    """
+    Time every extraction path on every saved page
+
+    Returns:
+        tuple: (per-stage timing summary DataFrame, output fingerprints by page)
+    """
+    set_fixture_mode("replay")
+    timer = StageTimer()
+    outputs = {}
+
+    for site in sites:
+        scraper = SCRAPERS[site]()
+        store = get_fixture_store(site)
+        pages = store.pages()
+        if not pages:
+            print(f"No {site} fixtures in {store.path}, capture some first")
+            continue
+
+        server = get_replay_server(site, scraper.origin)
+        for page in pages:
+            kind = page["kind"]
+            parser = EXTRACTORS[site][kind][0]
+            page_id = store.key(page["url"])
+
+            if parser:
+                html = store.load_page(page["url"])
+                result = None
+                for _ in range(repeat):
+                    with timer.time(f"{site}:{kind}:parse_html"):
+                        result = getattr(scraper, parser)(html)
+                outputs[f"{site}:{kind}:parse_html:{page_id}"] = fingerprint(result)
+
+            if selenium:
+                # Stop trying the browser paths once no driver can be started
+                selenium = _time_selenium(timer, outputs, scraper, server, site, kind, page, repeat)
+
+            # End to end through search_jobs, over HTTP or with --selenium in the browser
+            if kind == "search" and page.get("params") and (parser or selenium):
+                for _ in range(repeat):
+                    with timer.time(f"{site}:search_jobs"):
+                        result = scraper.search_jobs(**page["params"])
+                outputs[f"{site}:search_jobs:{page_id}"] = fingerprint(result)
+
+    return timer.summary(), outputs
+
+
+def compare(summary, outputs, baseline, tolerance):
+    """List the stages slower than the baseline and the pages whose extraction changed"""
+    problems = []
+    for row in summary.itertuples():
+        base_p50 = baseline.get("timings", {}).get(row.stage)
+        if base_p50 and row.p50_ms > base_p50 * (1 + tolerance):
+            problems.append(f"SLOWER  {row.stage}: p50 {row.p50_ms:.1f} ms, baseline {base_p50:.1f} ms")
+
+    for key, result in outputs.items():
+        base_outputs = baseline.get("outputs", {})
+        if key not in base_outputs:
+            continue
+        if result is None and base_outputs[key] is not None:
+            problems.append(f"FAILED  {key}: nothing extracted, baseline {base_outputs[key]}")
+        elif result != base_outputs[key]:
+            problems.append(f"CHANGED {key}: {base_outputs[key]} -> {result}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper fixture capture and extraction benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    capture_parser = commands.add_parser("capture", help="Save live pages as fixtures")
+    capture_parser.add_argument("--site", choices=SCRAPERS, required=True)
+    capture_parser.add_argument("--keywords", required=True)
+    capture_parser.add_argument("--location", required=True)
+    capture_parser.add_argument("--job-type")
+    capture_parser.add_argument("--details", type=int, default=5, help="Number of job pages to save")
+    capture_parser.add_argument("--all-pages", action="store_true", help="Also save the following result pages")
+
+    run_parser = commands.add_parser("run", help="Time extraction against the saved pages")
+    run_parser.add_argument("--site", choices=SCRAPERS, action="append", help="Site to benchmark (default: all)")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Extractions per page")
+    run_parser.add_argument("--selenium", action="store_true", help="Also time the browser extraction paths")
+    run_parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    run_parser.add_argument("--save-baseline", help="Write this run as a baseline JSON")
+    run_parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown before failing")
+    args = parser.parse_args()
+
+    if args.command == "capture":
+        capture(args.site, args.keywords, args.location, args.job_type, args.details, args.all_pages)
+        return
+
+    summary, outputs = run(args.site or list(SCRAPERS), args.repeat, args.selenium)
+    print(summary.to_string(index=False))
+
+    if args.save_baseline:
+        baseline = {"timings": dict(zip(summary["stage"], summary["p50_ms"])), "outputs": outputs}
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        problems = compare(summary, outputs, baseline, args.tolerance)
+        for problem in problems:
+            print(problem)
+        if problems:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
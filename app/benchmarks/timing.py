@@ -0,0 +1,48 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+
+class StageTimer:
+    """Collect durations per benchmark stage and summarize them as percentiles"""
+
+    def __init__(self):
+        self._durations = defaultdict(list)
+
+    def record(self, stage, seconds):
+        """Store one duration in seconds"""
+        self._durations[stage].append(seconds)
+
+    @contextmanager
+    def time(self, stage):
+        """Time the enclosed block as one sample of a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def summary(self):
+        """
+        Summarize the recorded durations
+
+        Returns:
+            pd.DataFrame: One row per stage, in recording order, with the
+                sample count and p50, p95, mean and max in milliseconds
+        """
+        rows = []
+        for stage, durations in self._durations.items():
+            samples = np.array(durations) * 1000
+            p50, p95 = np.percentile(samples, [50, 95])
+            rows.append({
+                "stage": stage,
+                "count": len(samples),
+                "p50_ms": round(p50, 1),
+                "p95_ms": round(p95, 1),
+                "mean_ms": round(samples.mean(), 1),
+                "max_ms": round(samples.max(), 1),
+            })
+        return pd.DataFrame(rows, columns=["stage", "count", "p50_ms", "p95_ms", "mean_ms", "max_ms"])
@@ -0,0 +1,327 @@
+"""
+Headless batch run: search, rank, analyze and write a cover letter PDF for N jobs
+
+Run from the app directory, e.g. as a nightly job:
+
+    python cli.py --resume resume.txt --keywords "data scientist" --location Paris \\
+        --source all --pages 2 --top 20 --output-dir runs/data-scientist
+
+Jobs stream through the details, analysis, cover letter and PDF stages,
+each with its own parallelism. The output directory receives one PDF per
+job, a manifest (CSV or Parquet) and a checkpoint journal. After a crash,
+rerun the same command with --from-checkpoint to continue with the jobs
+and stages left unfinished.
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import threading
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from config import (
+    LLM_BACKEND, LLM_CONCURRENCY, DETAIL_FETCH_CONCURRENCY, PDF_CONCURRENCY, COVER_LETTER_STRATEGY, DEFAULT_MODEL
+)
+from scrapers.base import BaseScraper
+from scrapers.multi import ALL_SOURCES, scraper_class, search_all_sources
+from scrapers.job_cache import get_job_cache, canonical_url
+from services.analyzer import JobResumeAnalyzer
+from services.generator import CoverLetterGenerator, STRATEGIES
+from services.ranker import rank_jobs
+from services.dedup import dedup_jobs
+from services.pipeline import Pipeline, Stage
+from utils.pdf_generator import convert_response_to_pdf
+
+SOURCE_NAMES = {"hellowork": "HelloWork", "wttj": "Welcome to the Jungle", "all": ALL_SOURCES}
+
+# Manifest columns, in order
+MANIFEST_COLUMNS = [
+    "rank", "source", "title", "company", "location", "link", "score", "match_score", "status", "pdf", "error"
+]
+
+
+class Checkpoint:
+    """
+    Append-only journal of a batch run
+
+    The first entry is the list of selected jobs, every later entry the
+    fields a stage produced for one job. Replaying the journal rebuilds the
+    state of a run that stopped, whatever stage each job had reached.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def exists(self):
+        return self.path.exists()
+
+    def start(self, jobs):
+        """Start a new journal with the selected jobs"""
+        with self._lock, open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"jobs": jobs}, ensure_ascii=False) + "\n")
+
+    def record(self, job, **fields):
+        """Store fields of a job, in memory and in the journal"""
+        job.update(fields)
+        entry = json.dumps({"key": job["key"], "fields": fields}, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(entry + "\n")
+            f.flush()
+
+    def load(self):
+        """Replay the journal and return the jobs with their latest fields"""
+        jobs = []
+        by_key = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line cut short by the crash
+                    continue
+                if "jobs" in entry:
+                    jobs = entry["jobs"]
+                    by_key = {job["key"]: job for job in jobs}
+                elif entry.get("key") in by_key:
+                    by_key[entry["key"]].update(entry["fields"])
+        return jobs
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _slug(text, length=40):
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(text or "")).strip("_")[:length] or "job"
+
+
+def positive_int(value):
+    """argparse type of the counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def discover_jobs(source, keywords, location, job_type, pages, top, resume):
+    """
+    Search every page, drop duplicate postings and keep the best ranked jobs
+
+    Returns:
+        list: Job dictionaries with a key, rank and score, best first
+    """
+    cards = []
+    for page in range(1, pages + 1):
+        if source == ALL_SOURCES:
+            page_cards, errors = search_all_sources(keywords, location, job_type, page=page)
+        else:
+            page_cards = scraper_class(source)().search_jobs(keywords, location, job_type, page=page) or []
+            for card in page_cards:
+                card["source"] = source
+        print(f"Page {page}: {len(page_cards)} jobs")
+        if not page_cards:
+            break
+        cards.extend(page_cards)
+
+    cards = [card for card in cards if card.get("link")]
+    if not cards:
+        return []
+
+    # Reuse descriptions scraped before, they also make the ranking more accurate
+    job_cache = get_job_cache()
+    job_cache.put_cards(cards)
+    for card in cards:
+        cached_details = job_cache.get_details(card["link"])
+        if cached_details is not None:
+            card["text"] = BaseScraper.details_to_text(cached_details)
+
+    jobs_df = dedup_jobs(rank_jobs(pd.DataFrame(cards), resume))
+    jobs_df = jobs_df[jobs_df["is_representative"]].head(top)
+    print(f"Selected {len(jobs_df)} of {len(cards)} jobs")
+
+    jobs = []
+    for rank, (_, row) in enumerate(jobs_df.iterrows(), start=1):
+        jobs.append({
+            "key": canonical_url(row["link"]),
+            "rank": rank,
+            "source": row["source"],
+            "title": row.get("title"),
+            "company": row.get("company"),
+            "location": row.get("location"),
+            "link": row["link"],
+            "score": float(row["score"]),
+            "text": row["text"] if isinstance(row.get("text"), str) else None,
+        })
+    return jobs
+
+
+def fetch_details(job, checkpoint):
+    """Retrieve the description of a job that has none yet"""
+    if job.get("text"):
+        return job
+    job_details = scraper_class(job["source"])().get_job_details(job["link"])
+    if not job_details:
+        checkpoint.record(job, error="No job details found")
+        return None
+    checkpoint.record(job, text=BaseScraper.details_to_text(job_details), error=None)
+    return job
+
+
+def analyze_job(job, checkpoint, analyzer, resume):
+    """Analyze a job that has no analysis yet"""
+    if job.get("analysis"):
+        return job
+    analysis = analyzer.analyze_structured(resume, job["text"])
+    if analysis is None:
+        checkpoint.record(job, error="Analysis failed")
+        return None
+    checkpoint.record(job, analysis=analysis.to_markdown(), match_score=analysis.match_score, error=None)
+    return job
+
+
+def write_cover_letter(job, checkpoint, generator, resume, extra_info):
+    """Write the cover letter of a job that has none yet"""
+    if job.get("cover_letter"):
+        return job
+    cover_letter = generator.generate(resume, job["text"], job["analysis"], extra_info)
+    if not cover_letter or cover_letter.startswith("Error generating cover letter"):
+        checkpoint.record(job, error=cover_letter or "Cover letter generation failed")
+        return None
+    checkpoint.record(job, cover_letter=cover_letter, error=None)
+    return job
+
+
+def render_pdf(job, checkpoint, pdf_dir):
+    """Write the PDF of a job unless it is already on disk"""
+    if job.get("pdf") and os.path.exists(job["pdf"]):
+        return job
+    path = Path(pdf_dir) / f"{job['rank']:03d}_{_slug(job['company'])}_{_slug(job['title'])}.pdf"
+    convert_response_to_pdf(
+        {"analysis": job["analysis"], "final_cover_letter": job["cover_letter"]},
+        str(path)
+    )
+    checkpoint.record(job, pdf=str(path), error=None)
+    return job
+
+
+def job_status(job):
+    """Last stage a job completed"""
+    if job.get("pdf"):
+        return "done"
+    for stage, field in [("generated", "cover_letter"), ("analyzed", "analysis"), ("retrieved", "text")]:
+        if job.get(field):
+            return stage
+    return "found"
+
+
+def write_manifest(jobs, output_dir, output_format):
+    """Write one row per job with its status and PDF path"""
+    manifest = pd.DataFrame(
+        [{**job, "status": job_status(job)} for job in jobs]
+    ).reindex(columns=MANIFEST_COLUMNS)
+    path = Path(output_dir) / f"manifest.{output_format}"
+    if output_format == "parquet":
+        manifest.to_parquet(path, index=False)
+    else:
+        manifest.to_csv(path, index=False)
+    return path, manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search, analyze and write cover letter PDFs for many jobs")
+    parser.add_argument("--resume", required=True, help="Resume text file")
+    parser.add_argument("--extra-info", help="Additional candidate information text file")
+    parser.add_argument("--keywords", required=True, help="Job keywords to search for")
+    parser.add_argument("--location", required=True, help="Location to search in")
+    parser.add_argument("--job-type", help="Type of job, e.g. Internship")
+    parser.add_argument("--source", choices=SOURCE_NAMES, default="all", help="Job site to search")
+    parser.add_argument("--pages", type=positive_int, default=1, help="Result pages to search per site")
+    parser.add_argument("--top", type=positive_int, default=10, help="Number of best ranked jobs to process")
+    parser.add_argument("--strategy", choices=STRATEGIES, default=COVER_LETTER_STRATEGY, help="Cover letter strategy")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Model name")
+    parser.add_argument("--output-dir", required=True, help="Directory of the PDFs, manifest and checkpoint")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="Manifest format")
+    parser.add_argument("--detail-concurrency", type=positive_int, default=DETAIL_FETCH_CONCURRENCY,
+                        help="Parallel job page fetches, across all sites")
+    parser.add_argument("--llm-concurrency", type=positive_int, default=LLM_CONCURRENCY,
+                        help="Parallel AI requests per stage (analysis and cover letter)")
+    parser.add_argument("--pdf-concurrency", type=positive_int, default=PDF_CONCURRENCY, help="Parallel PDF renders")
+    parser.add_argument("--from-checkpoint", action="store_true",
+                        help="Continue the run saved in the output directory instead of searching again")
+    parser.add_argument("--allow-empty", action="store_true",
+                        help="Exit successfully when the search selects no jobs")
+    args = parser.parse_args()
+
+    load_dotenv()
+    if LLM_BACKEND != "mock" and os.getenv("OPENAI_API_KEY") is None:
+        print("OpenAI API key not found. Please add it to your .env file.")
+        sys.exit(1)
+
+    resume = _read(args.resume)
+    extra_info = _read(args.extra_info) if args.extra_info else ""
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint = Checkpoint(output_dir / "checkpoint.jsonl")
+
+    jobs = []
+
+    def discover():
+        if args.from_checkpoint and checkpoint.exists():
+            jobs.extend(checkpoint.load())
+            print(f"Continuing the run in {output_dir}: {len(jobs)} jobs")
+        else:
+            jobs.extend(discover_jobs(
+                SOURCE_NAMES[args.source], args.keywords, args.location, args.job_type,
+                args.pages, args.top, resume
+            ))
+            checkpoint.start(jobs)
+        yield from jobs
+
+    analyzer = JobResumeAnalyzer(model=args.model)
+    generator = CoverLetterGenerator(model=args.model, strategy=args.strategy)
+    pdf_dir = output_dir / "pdfs"
+    pdf_dir.mkdir(exist_ok=True)
+
+    # Each job moves on as soon as it is ready, stages with a full queue hold back the ones before
+    pipeline = Pipeline([
+        Stage("details", partial(fetch_details, checkpoint=checkpoint), workers=args.detail_concurrency),
+        Stage("analysis", partial(analyze_job, checkpoint=checkpoint, analyzer=analyzer, resume=resume),
+              workers=args.llm_concurrency),
+        Stage("cover_letter", partial(write_cover_letter, checkpoint=checkpoint, generator=generator,
+                                      resume=resume, extra_info=extra_info),
+              workers=args.llm_concurrency),
+        Stage("pdf", partial(render_pdf, checkpoint=checkpoint, pdf_dir=pdf_dir), workers=args.pdf_concurrency),
+    ], source_name="discovery")
+    results, errors = pipeline.run(discover())
+    # Errors of the discovery source have no job: the search itself failed
+    discovery_errors = [error for stage, job, error in errors if job is None]
+    for stage, job, error in errors:
+        if job is not None:
+            checkpoint.record(job, error=f"{stage}: {error}")
+    print(pd.DataFrame(pipeline.stats()).to_string(index=False))
+
+    path, manifest = write_manifest(jobs, output_dir, args.format)
+    print(manifest["status"].value_counts().to_string())
+    print(f"Manifest written to {path}")
+    if discovery_errors:
+        print(f"Job discovery failed: {'; '.join(discovery_errors)}")
+        sys.exit(1)
+    if not jobs and not args.allow_empty:
+        print("No jobs were selected. Pass --allow-empty if this is expected.")
+        sys.exit(1)
+    if (manifest["status"] != "done").any():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
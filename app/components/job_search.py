@@ -1,10 +1,14 @@
 import streamlit as st
-import pandas as pd
-from scrapers.hellowork import HelloWorkScraper
-from scrapers.wttj import WTTJScraper
-from services.analyzer import JobResumeAnalyzer
-from services.generator import CoverLetterGenerator
-from utils.pdf_generator import convert_response_to_pdf
+import asyncio
+from scrapers.multi import SOURCES, ALL_SOURCES, scraper_class, search_all_sources
+from scrapers.job_cache import get_job_cache
+from services.tasks import report_progress
+from components.llm_output import collect_cover_letter_stream, format_run_stats
+from components.resources import get_analyzer, get_generator
+from components.tasks import submit_task, show_tasks
+
+# pandas, scikit-learn, numpy, selenium and fpdf are imported by the functions
+# that use them, so the other pages render without loading them
 
 def show_job_search():
     """Display the job search page with integrated results."""
@@ -19,6 +23,9 @@ def show_job_search():
         st.warning("Please add your resume in the Profile tab before searching for jobs.")
         return
     
+    # Background searches, detail fetches and AI calls, filled in once the buttons below have run
+    tasks_container = st.container()
+    
     # Create two columns for the entire page layout
     search_col, analysis_col = st.columns([1, 1])
     
@@ -30,7 +37,7 @@ def show_job_search():
             col1, col2 = st.columns(2)
             
             with col1:
-                job_source = st.selectbox("Job Source", ["HelloWork", "Welcome to the Jungle"], index=0)
+                job_source = st.selectbox("Job Source", list(SOURCES) + [ALL_SOURCES], index=0)
                 job_title = st.text_input("Job Title", "data scientist")
                 page = st.number_input("Page Number", min_value=1, value=1, step=1, help="Specify which page of results to view")
             
@@ -56,10 +63,47 @@ def show_job_search():
             if not st.session_state.jobs_df.empty:
                 search_params = st.session_state.last_search
                 st.subheader(f"Search Results (Page {search_params['page']})")
+                if "is_representative" in st.session_state.jobs_df.columns:
+                    unique = int(st.session_state.jobs_df["is_representative"].sum())
+                    if unique < len(st.session_state.jobs_df):
+                        st.caption(f"{len(st.session_state.jobs_df)} jobs, {unique} unique offers")
+                
+                # Rank jobs locally so only the best matches are sent to the analyzer
+                rank_col, top_n_col, shortlist_col = st.columns(3)
+                
+                with rank_col:
+                    if st.button("Rank Against Resume"):
+                        from services.ranker import rank_jobs
+                        from services.dedup import dedup_jobs
+                        # Re-cluster so each cluster is represented by its best ranked copy
+                        st.session_state.jobs_df = dedup_jobs(rank_jobs(
+                            st.session_state.jobs_df,
+                            st.session_state.current_resume
+                        ), keep_representatives=False)
+                
+                with top_n_col:
+                    top_n = st.number_input(
+                        "Top N", min_value=1, max_value=len(st.session_state.jobs_df),
+                        value=min(5, len(st.session_state.jobs_df)), step=1
+                    )
+                
+                with shortlist_col:
+                    if st.button("Analyze Top N"):
+                        analyze_top_jobs(top_n)
                 
                 # Display job listings
                 filtered_df = st.session_state.jobs_df.copy()
-                st.dataframe(filtered_df[["title", "company", "location", "link"]], height=300)
+                if "is_representative" in filtered_df.columns and not filtered_df["is_representative"].all():
+                    if not st.checkbox("Show duplicate postings", value=False):
+                        filtered_df = filtered_df[filtered_df["is_representative"]]
+                if "match_score" in filtered_df.columns and filtered_df["match_score"].notna().any():
+                    min_match_score = st.slider("Minimum match score", 0, 100, 0)
+                    if min_match_score > 0:
+                        filtered_df = filtered_df[filtered_df["match_score"] >= min_match_score]
+                
+                display_columns = [column for column in ["match_score", "score", "cluster_size", "source", "title", "company", "location", "link"]
+                                   if column in filtered_df.columns]
+                st.dataframe(filtered_df[display_columns], height=300)
                 
                 # Job selection
                 job_indices = filtered_df.index.tolist()
@@ -70,8 +114,15 @@ def show_job_search():
                     format_func=lambda x: f"{filtered_df.loc[x, 'company']} - {filtered_df.loc[x, 'title']} - {filtered_df.loc[x, 'location']}"
                 )
                 
-                if st.button("Analyze Selected Job"):
-                    analyze_selected_job(filtered_df, job_index)
+                details_col, analyze_col = st.columns(2)
+                
+                with details_col:
+                    if st.button("Fetch All Job Details"):
+                        hydrate_job_details()
+                
+                with analyze_col:
+                    if st.button("Analyze Selected Job"):
+                        analyze_selected_job(filtered_df, job_index)
             else:
                 st.warning("No jobs found on this page. Try a different page number or modify your search criteria.")
                 
@@ -87,108 +138,345 @@ def show_job_search():
         if "analysis_result" in st.session_state and st.session_state.analysis_result:
             st.subheader("Analysis Results")
             display_job_results()
+    
+    with tasks_container:
+        show_tasks()
 
 def search_jobs(job_source, job_title, location, job_type, page=1):
-    """Search for jobs using the selected job source with pagination."""
-    with st.spinner(f"Searching for jobs on page {page}..."):
-        scraper = None
+    """Start a background search for jobs using the selected job source with pagination."""
+    if job_source != ALL_SOURCES and get_scraper(job_source) is None:
+        import pandas as pd
+        st.warning("This job source is not implemented yet.")
+        st.session_state.jobs_df = pd.DataFrame()  # Initialize with empty DataFrame
+        return
+    
+    st.session_state.last_search["task_id"] = submit_task(
+        "search",
+        f"Search for {job_title} in {location} ({job_source}, page {page})",
+        fetch_jobs, job_source, job_title, location, job_type, page,
+        on_done=apply_search_results
+    )
+
+def fetch_jobs(job_source, job_title, location, job_type, page):
+    """Run a search in a background task and return the job cards."""
+    from scrapers.base import BaseScraper
+    errors = {}
+    if job_source == ALL_SOURCES:
+        # Query every site at once, keeping what the responsive ones return
+        jobs, errors = search_all_sources(job_title, location, job_type, page=page)
+    else:
+        jobs = get_scraper(job_source).search_jobs(job_title, location, job_type, page=page) or []
+        for job in jobs:
+            job["source"] = job_source
+    
+    # Remember the cards and reuse any description scraped before
+    job_cache = get_job_cache()
+    job_cache.put_cards(jobs)
+    for job in jobs:
+        cached_details = job_cache.get_details(job.get("link"))
+        if cached_details is not None:
+            job["text"] = BaseScraper.details_to_text(cached_details)
+    
+    message = f"Found {len(jobs)} jobs on page {page}"
+    if errors:
+        message += ". No results from " + ", ".join(f"{source} ({error})" for source, error in errors.items())
+    report_progress(message=message)
+    return jobs
+
+def apply_search_results(task):
+    """Store the results of a finished search, unless a newer search was started since."""
+    if task["id"] != st.session_state.last_search.get("task_id"):
+        return
+    import pandas as pd
+    from services.dedup import dedup_jobs
+    
+    jobs = task["result"] if task["status"] == "done" else None
+    if jobs:
+        # Copies of the same offer are clustered
+        st.session_state.jobs_df = dedup_jobs(pd.DataFrame(jobs))
+    else:
+        st.session_state.jobs_df = pd.DataFrame()
+
+def get_scraper(job_source):
+    """Return the scraper for a job source, or None if it is not supported."""
+    scraper = scraper_class(job_source)
+    if scraper is None:
+        return None
+    return scraper()
+
+def job_source_of(job):
+    """Return the source of a job row, falling back to the source of the last search."""
+    source = job.get("source")
+    if isinstance(source, str) and source in SOURCES:
+        return source
+    return st.session_state.last_search.get("job_source", "HelloWork")
+
+def pending_links_by_source(indices=None):
+    """Return the links of the jobs (all or the given rows) without a description, by source."""
+    jobs_df = st.session_state.jobs_df
+    
+    if "text" not in jobs_df.columns:
+        jobs_df["text"] = None
+    
+    candidates = jobs_df if indices is None else jobs_df.loc[indices]
+    pending = candidates[candidates["text"].isna() & candidates["link"].notna()]
+    
+    # Results of an "All sources" search need the scraper of each row's site
+    links_by_source = {}
+    for _, job in pending.iterrows():
+        links_by_source.setdefault(job_source_of(job), []).append(job["link"])
+    return links_by_source
+
+def fetch_job_texts(links_by_source):
+    """
+    Fetch job descriptions in a background task, site by site, each site in parallel
+    
+    Returns:
+        dict: "texts" maps each link to its description, "failures" each failed link to an error
+    """
+    from scrapers.base import BaseScraper
+    total = sum(len(links) for links in links_by_source.values())
+    texts = {}
+    failures = {}
+    
+    for job_source, links in links_by_source.items():
+        scraper = get_scraper(job_source)
+        if scraper is None:
+            failures.update({link: "Unsupported job source" for link in links})
+            continue
         
-        if job_source == "HelloWork":
-            scraper = HelloWorkScraper()
-        elif job_source == "Welcome to the Jungle":
-            scraper = WTTJScraper()
-        else:
-            st.warning("This job source is not implemented yet.")
-            st.session_state.jobs_df = pd.DataFrame()  # Initialize with empty DataFrame
-            return
-            
-        try:
-            jobs = scraper.search_jobs(job_title, location, job_type, page=page)
-            if jobs:
-                # Store results in the jobs_df
-                df = pd.DataFrame(jobs)
-                st.session_state.jobs_df = df
-                st.success(f"Found {len(jobs)} jobs on page {page}!")
-            else:
-                # Store empty DataFrame
-                empty_df = pd.DataFrame()
-                st.session_state.jobs_df = empty_df
-                st.warning(f"No jobs found on page {page}. Try different search terms or a different page.")
-        except Exception as e:
-            st.error(f"Error searching for jobs: {e}")
-            st.session_state.jobs_df = pd.DataFrame()  # Initialize with empty DataFrame
+        done_before = len(texts) + len(failures)
+        
+        def update_progress(done, source_total, url, error):
+            report_progress((done_before + done) / total, f"Retrieved {done_before + done} of {total} job details")
+        
+        details, source_failures = scraper.get_job_details_many(links, progress_callback=update_progress)
+        texts.update({link: BaseScraper.details_to_text(job_details) for link, job_details in details.items()})
+        failures.update(source_failures)
+    
+    message = f"Retrieved details for {len(texts)} jobs."
+    if failures:
+        message += f" Could not retrieve {len(failures)}: " + "; ".join(
+            f"{url}: {error}" for url, error in failures.items()
+        )
+    report_progress(message=message)
+    return {"texts": texts, "failures": failures}
+
+def set_job_texts(texts):
+    """Store fetched descriptions in the results by link and re-cluster the duplicates."""
+    from services.dedup import dedup_jobs
+    jobs_df = st.session_state.jobs_df
+    if not texts or jobs_df is None or jobs_df.empty or "link" not in jobs_df.columns:
+        return
+    
+    if "text" not in jobs_df.columns:
+        jobs_df["text"] = None
+    for index, link in jobs_df["link"].items():
+        if link in texts:
+            jobs_df.at[index, "text"] = texts[link]
+    
+    # Descriptions reveal duplicates that the cards alone did not
+    st.session_state.jobs_df = dedup_jobs(jobs_df)
+
+def hydrate_job_details(indices=None):
+    """Fetch the description of every job in the results (or of the given rows) in a background task."""
+    links_by_source = pending_links_by_source(indices)
+    total = sum(len(links) for links in links_by_source.values())
+    if not total:
+        st.info("All job details are already retrieved.")
+        return
+    
+    submit_task(
+        "details",
+        f"Retrieve details for {total} jobs",
+        fetch_job_texts, links_by_source,
+        on_done=lambda task: set_job_texts(task["result"]["texts"]) if task["status"] == "done" else None
+    )
+
+def analyze_top_jobs(top_n):
+    """Analyze the top N jobs by local score concurrently in a background task."""
+    from services.ranker import rank_jobs
+    from services.dedup import dedup_jobs
+    if "score" not in st.session_state.jobs_df.columns:
+        st.session_state.jobs_df = dedup_jobs(
+            rank_jobs(st.session_state.jobs_df, st.session_state.current_resume), keep_representatives=False
+        )
+    
+    # Only one posting per cluster of duplicates is analyzed
+    jobs_df = st.session_state.jobs_df
+    top_jobs = jobs_df[jobs_df["is_representative"] & jobs_df["link"].notna()].head(top_n)
+    links_by_source = pending_links_by_source(top_jobs.index)
+    texts = {job["link"]: job["text"] for _, job in top_jobs.iterrows() if isinstance(job.get("text"), str)}
+    
+    submit_task(
+        "analyze",
+        f"Analyze the top {len(top_jobs)} jobs",
+        analyze_jobs, get_analyzer(), st.session_state.current_resume, texts, links_by_source,
+        on_done=apply_analyses
+    )
+
+def analyze_jobs(analyzer, resume, texts, links_by_source):
+    """
+    Fetch the missing descriptions, then analyze every job concurrently, in a background task
+    
+    Args:
+        analyzer (JobResumeAnalyzer): Analyzer to use
+        resume (str): The candidate's resume
+        texts (dict): Link -> description of the jobs already retrieved
+        links_by_source (dict): Links of the jobs to retrieve first, by source
+        
+    Returns:
+        dict: The fetched "texts" and "failures", and "analyses" mapping each
+            link to its analysis markdown and match score
+    """
+    fetched = fetch_job_texts(links_by_source) if links_by_source else {"texts": {}, "failures": {}}
+    texts = {**texts, **fetched["texts"]}
+    if not texts:
+        raise ValueError("No job details available to analyze.")
+    
+    report_progress(message=f"Analyzing {len(texts)} jobs...")
+    links = list(texts)
+    analyses = asyncio.run(analyzer.analyze_many(resume, [texts[link] for link in links], structured=True))
+    
+    results = {
+        link: {"analysis": analysis.to_markdown(), "match_score": analysis.match_score}
+        for link, analysis in zip(links, analyses) if analysis is not None
+    }
+    message = f"Analyzed {len(results)} jobs. Select one to see its analysis and cover letter."
+    if len(results) < len(links):
+        message += f" Could not analyze {len(links) - len(results)} jobs."
+    report_progress(message=message)
+    return {**fetched, "analyses": results}
+
+def apply_analyses(task):
+    """Store the analyses of a finished Analyze Top N task in the results."""
+    if task["status"] != "done":
+        return
+    from services.dedup import cluster_members
+    set_job_texts(task["result"]["texts"])
+    
+    jobs_df = st.session_state.jobs_df
+    if jobs_df is None or jobs_df.empty:
+        return
+    if "analysis" not in jobs_df.columns:
+        jobs_df["analysis"] = None
+    if "match_score" not in jobs_df.columns:
+        jobs_df["match_score"] = None
+    
+    analyses = task["result"]["analyses"]
+    for index, link in jobs_df["link"].items():
+        if link not in analyses:
+            continue
+        # Copies of the posting share the analysis of their representative
+        for member in [index] + cluster_members(jobs_df, index).index.tolist():
+            jobs_df.at[member, "analysis"] = analyses[link]["analysis"]
+            jobs_df.at[member, "match_score"] = analyses[link]["match_score"]
+    
+    # Best analyzed matches first, then the rest by local score
+    sort_columns = [column for column in ["match_score", "score"] if column in jobs_df.columns]
+    st.session_state.jobs_df = jobs_df.sort_values(
+        sort_columns, ascending=False, na_position="last", kind="stable"
+    )
 
 def analyze_selected_job(filtered_df, job_index):
     """Analyze the selected job against the user's resume."""
+    from services.dedup import cluster_members
     selected_job = filtered_df.loc[job_index]
     # Convert pandas Series to dictionary to avoid boolean evaluation issues
     st.session_state.selected_job = selected_job.to_dict()
+    st.session_state.selected_job["source"] = job_source_of(selected_job)
+    st.session_state.selected_job["duplicates"] = [
+        f"{duplicate.get('source', '')}: {duplicate['link']}".lstrip(": ")
+        for _, duplicate in cluster_members(st.session_state.jobs_df, job_index).iterrows()
+        if isinstance(duplicate.get("link"), str)
+    ]
     
-    # Get the job source from last search
-    job_source = st.session_state.last_search.get("job_source", "HelloWork")
-    
-    # If job content isn't already scraped, get it
-    if pd.isna(selected_job.get('text')):
-        with st.spinner("Retrieving job details..."):
-            try:
-                if job_source == "HelloWork":
-                    scraper = HelloWorkScraper()
-                elif job_source == "Welcome to the Jungle":
-                    scraper = WTTJScraper()
-                else:
-                    st.error("Unsupported job source")
-                    return
-                    
-                job_details = scraper.get_job_details(selected_job["link"])
-                if job_details:
-                    if isinstance(job_details, dict) and "cleaned_text" in job_details:
-                        # For HelloWork format
-                        st.session_state.selected_job["text"] = job_details["cleaned_text"]
-                    else:
-                        # For WTTJ or other formats that return text directly
-                        st.session_state.selected_job["text"] = job_details
-                    st.success("Job details retrieved successfully!")
-                else:
-                    st.error("Could not retrieve job details.")
-            except Exception as e:
-                st.error(f"Error retrieving job details: {e}")
-    
-    # Process the job if we have all requirements
-    if st.session_state.current_resume and not pd.isna(st.session_state.selected_job.get('text')):
-        process_job_and_resume()
+    # Process the job if we have all requirements, the description is retrieved
+    # in the task if needed (from the shared job cache when it was scraped before)
+    if not st.session_state.current_resume:
+        st.warning("Please upload or paste your resume first.")
+    elif get_scraper(st.session_state.selected_job["source"]) is None:
+        st.error("Unsupported job source")
     else:
-        if not st.session_state.current_resume:
-            st.warning("Please upload or paste your resume first.")
-        if pd.isna(st.session_state.selected_job.get('text')):
-            st.warning("No job details available to analyze.")
+        process_job_and_resume()
 
 def process_job_and_resume():
-    """Process the job and resume to generate analysis and cover letter."""
-    analyzer = JobResumeAnalyzer()
-    generator = CoverLetterGenerator()
-    
-    with st.spinner("Analyzing job and resume..."):
-        analysis = analyzer.analyze(
-            st.session_state.current_resume, 
-            st.session_state.selected_job["text"]
-        )
-        st.session_state.analysis_result = analysis
-    
-    with st.spinner("Generating cover letter..."):
-        cover_letter = generator.generate(
-            st.session_state.current_resume,
-            st.session_state.selected_job["text"],
-            st.session_state.analysis_result,
-            st.session_state.extra_info
-        )
-        st.session_state.cover_letter = cover_letter
+    """Start a background task generating the analysis and cover letter of the selected job."""
+    job = st.session_state.selected_job
+    previous_analysis = job.get("analysis")
+    text = job.get("text")
+    
+    st.session_state.analysis_result = None
+    st.session_state.cover_letter = None
+    st.session_state.application_task = submit_task(
+        "application",
+        f"Analysis and cover letter for {job.get('title', 'the selected job')}",
+        prepare_application,
+        get_analyzer(),
+        get_generator(st.session_state.cover_letter_strategy),
+        st.session_state.current_resume,
+        job.get("link"),
+        job["source"],
+        text if isinstance(text, str) else None,
+        st.session_state.extra_info,
+        analysis=previous_analysis if isinstance(previous_analysis, str) else None,
+        on_done=apply_application
+    )
+
+def prepare_application(analyzer, generator, resume, link, job_source, text, extra_info, analysis=None):
+    """
+    Retrieve the job description if needed, then stream the analysis and
+    cover letter, in a background task
+    
+    An analysis produced earlier (e.g. by a bulk run) is reused as is.
+    
+    Returns:
+        dict: The job "text", its "analysis", the "cover_letter" and the generator "run_stats"
+    """
+    from scrapers.base import BaseScraper
+    if text is None:
+        report_progress(message="Retrieving job details...")
+        job_details = get_scraper(job_source).get_job_details(link)
+        if not job_details:
+            raise ValueError("Could not retrieve job details.")
+        text = BaseScraper.details_to_text(job_details)
     
-    st.success("Analysis and cover letter generated!")
+    if not analysis:
+        report_progress(0.1, "Analyzing job and resume...")
+        analysis = ""
+        for delta in analyzer.stream_analyze(resume, text):
+            analysis += delta
+            report_progress(partial=analysis)
+    
+    report_progress(0.5, "Generating cover letter...")
+    cover_letter, run = collect_cover_letter_stream(generator.stream_generate(resume, text, analysis, extra_info))
+    report_progress(message="Analysis and cover letter generated!")
+    return {
+        "text": text,
+        "analysis": analysis,
+        "cover_letter": cover_letter,
+        "run_stats": format_run_stats(run),
+    }
+
+def apply_application(task):
+    """Show the analysis and cover letter of a finished task, unless another job was selected since."""
+    if task["id"] != st.session_state.get("application_task") or task["status"] != "done":
+        return
+    
+    result = task["result"]
+    st.session_state.selected_job["text"] = result["text"]
+    st.session_state.analysis_result = result["analysis"]
+    st.session_state.cover_letter = result["cover_letter"]
+    st.session_state.cover_letter_stats = result["run_stats"]
+    set_job_texts({st.session_state.selected_job.get("link"): result["text"]})
 
 def display_job_results():
     """Display the analysis results and cover letter."""
     job_title = st.session_state.selected_job.get("title", "Job")
     st.write(f"**Selected Job:** {job_title}")
+    duplicates = st.session_state.selected_job.get("duplicates")
+    if duplicates:
+        st.caption("Also posted at:\n" + "\n".join(f"- {duplicate}" for duplicate in duplicates))
     
     tabs = st.tabs(["Job Analysis", "Cover Letter", "Download PDF"])
     
@@ -197,6 +485,8 @@ def display_job_results():
     
     with tabs[1]:
         st.markdown(st.session_state.cover_letter)
+        if st.session_state.get("cover_letter_stats"):
+            st.caption(st.session_state.cover_letter_stats)
         
         if st.button("Regenerate Cover Letter", key="regenerate_job_search"):
             regenerate_cover_letter()
@@ -206,16 +496,31 @@ def display_job_results():
             generate_pdf(job_title)
 
 def regenerate_cover_letter():
-    """Regenerate the cover letter."""
-    with st.spinner("Generating new cover letter..."):
-        generator = CoverLetterGenerator()
-        new_cover_letter = generator.generate(
-            st.session_state.current_resume,
-            st.session_state.selected_job["text"],
-            st.session_state.analysis_result,
-            st.session_state.extra_info
-        )
-        st.session_state.cover_letter = new_cover_letter
+    """Start a background task writing a fresh cover letter, bypassing the response cache."""
+    st.session_state.application_task = submit_task(
+        "cover_letter",
+        f"New cover letter for {st.session_state.selected_job.get('title', 'the selected job')}",
+        rewrite_cover_letter,
+        get_generator(st.session_state.cover_letter_strategy),
+        st.session_state.current_resume,
+        st.session_state.selected_job["text"],
+        st.session_state.analysis_result,
+        st.session_state.extra_info,
+        on_done=apply_application
+    )
+
+def rewrite_cover_letter(generator, resume, text, analysis, extra_info):
+    """Stream a fresh cover letter in a background task, in the result format of prepare_application."""
+    cover_letter, run = collect_cover_letter_stream(
+        generator.stream_generate(resume, text, analysis, extra_info, bypass_cache=True)
+    )
+    report_progress(message="New cover letter generated!")
+    return {
+        "text": text,
+        "analysis": analysis,
+        "cover_letter": cover_letter,
+        "run_stats": format_run_stats(run),
+    }
 
 def generate_pdf(job_title):
     """Generate a PDF of the cover letter and analysis."""
@@ -225,6 +530,7 @@ def generate_pdf(job_title):
                 "analysis": st.session_state.analysis_result,
                 "final_cover_letter": st.session_state.cover_letter
             }
+            from utils.pdf_generator import convert_response_to_pdf  # fpdf is only loaded when a PDF is made
             pdf_file = convert_response_to_pdf(response_dict, "job_application_package.pdf")
             
             with open(pdf_file, "rb") as file:
@@ -0,0 +1,107 @@
+import streamlit as st
+from services.tasks import report_progress
+
+COVER_LETTER_STAGES = {
+    "draft": "First draft",
+    "review": "Review",
+    "final": "Final cover letter",
+}
+
+def write_cover_letter_stream(stream):
+    """Render each cover letter stage as its tokens arrive.
+
+    Returns the final letter and the stats of its run (None for a cached letter).
+    """
+    placeholders = {}
+    texts = {}
+    run = None
+
+    for stage, delta in stream:
+        if stage == "stats":
+            run = delta
+            continue
+        if stage not in placeholders:
+            st.markdown(f"**{COVER_LETTER_STAGES.get(stage, stage)}**")
+            placeholders[stage] = st.empty()
+            texts[stage] = ""
+        texts[stage] += delta
+        placeholders[stage].markdown(texts[stage])
+
+    return texts.get("final", ""), run
+
+def collect_cover_letter_stream(stream):
+    """Consume a cover letter stream in a background task, reporting each stage as it is written.
+
+    Returns the final letter and the stats of its run (None for a cached letter).
+    """
+    texts = {}
+    run = None
+
+    for stage, delta in stream:
+        if stage == "stats":
+            run = delta
+            continue
+        if stage not in texts:
+            report_progress(message=f"{COVER_LETTER_STAGES.get(stage, stage)}...")
+            texts[stage] = ""
+        texts[stage] += delta
+        report_progress(partial=texts[stage])
+
+    return texts.get("final", ""), run
+
+def format_run_stats(run):
+    """Describe the timing and token usage of a generator run, or return None."""
+    if not run:
+        return None
+    return (
+        f"{run['strategy']} strategy: {len(run['stages'])} calls in {run['seconds']:.1f}s, "
+        f"{run['input_tokens']} input tokens ({run['cached_tokens']} cached), "
+        f"{run['output_tokens']} output tokens"
+    )
+
+def write_run_stats(run):
+    """Show the timing and token usage of a generator run."""
+    run_stats = format_run_stats(run)
+    if run_stats:
+        st.caption(run_stats)
+
+def run_analysis_and_cover_letter(analyzer, generator, resume, job_description, extra_info, analysis=None):
+    """Stream the analysis and cover letter, storing the results in the session state.
+
+    An analysis produced earlier (e.g. by a bulk run) is reused as is.
+    """
+    with st.status("Analyzing job and resume...", expanded=True) as status:
+        if analysis:
+            st.session_state.analysis_result = analysis
+        else:
+            st.session_state.analysis_result = st.write_stream(
+                analyzer.stream_analyze(resume, job_description)
+            )
+
+        status.update(label="Generating cover letter...")
+        st.session_state.cover_letter, run = write_cover_letter_stream(
+            generator.stream_generate(
+                resume,
+                job_description,
+                st.session_state.analysis_result,
+                extra_info
+            )
+        )
+        write_run_stats(run)
+
+        status.update(label="Analysis and cover letter generated!", state="complete", expanded=False)
+
+def run_cover_letter_regeneration(generator, resume, job_description, analysis, extra_info):
+    """Stream a fresh cover letter, bypassing the response cache."""
+    with st.status("Generating new cover letter...", expanded=True) as status:
+        st.session_state.cover_letter, run = write_cover_letter_stream(
+            generator.stream_generate(
+                resume,
+                job_description,
+                analysis,
+                extra_info,
+                bypass_cache=True
+            )
+        )
+        write_run_stats(run)
+        status.update(label="New cover letter generated!", state="complete", expanded=False)
@@ -1,7 +1,6 @@
 import streamlit as st
-from services.analyzer import JobResumeAnalyzer
-from services.generator import CoverLetterGenerator
-from utils.pdf_generator import convert_response_to_pdf
+from components.llm_output import run_analysis_and_cover_letter, run_cover_letter_regeneration
+from components.resources import get_analyzer, get_generator
 
 def show_manual_input():
     """Display the manual job input page with integrated results."""
@@ -48,26 +47,13 @@ def process_manual_job(job_title, company, location, job_description):
     }
     st.session_state.selected_job = manual_job
     
-    analyzer = JobResumeAnalyzer()
-    generator = CoverLetterGenerator()
-    
-    with st.spinner("Analyzing job and resume..."):
-        analysis = analyzer.analyze(
-            st.session_state.current_resume, 
-            job_description
-        )
-        st.session_state.analysis_result = analysis
-    
-    with st.spinner("Generating cover letter..."):
-        cover_letter = generator.generate(
-            st.session_state.current_resume,
-            job_description,
-            st.session_state.analysis_result,
-            st.session_state.extra_info
-        )
-        st.session_state.cover_letter = cover_letter
-    
-    st.success("Analysis and cover letter generated!")
+    run_analysis_and_cover_letter(
+        get_analyzer(),
+        get_generator(st.session_state.cover_letter_strategy),
+        st.session_state.current_resume,
+        job_description,
+        st.session_state.extra_info
+    )
 
 def display_manual_results():
     """Display the analysis results and cover letter for manually entered jobs."""
@@ -96,15 +82,13 @@ def display_manual_results():
 
 def regenerate_cover_letter():
     """Regenerate the cover letter."""
-    with st.spinner("Generating new cover letter..."):
-        generator = CoverLetterGenerator()
-        new_cover_letter = generator.generate(
-            st.session_state.current_resume,
-            st.session_state.selected_job["text"],
-            st.session_state.analysis_result,
-            st.session_state.extra_info
-        )
-        st.session_state.cover_letter = new_cover_letter
+    run_cover_letter_regeneration(
+        get_generator(st.session_state.cover_letter_strategy),
+        st.session_state.current_resume,
+        st.session_state.selected_job["text"],
+        st.session_state.analysis_result,
+        st.session_state.extra_info
+    )
 
 def generate_pdf(job_title):
     """Generate a PDF of the cover letter and analysis."""
@@ -114,6 +98,7 @@ def generate_pdf(job_title):
                 "analysis": st.session_state.analysis_result,
                 "final_cover_letter": st.session_state.cover_letter
             }
+            from utils.pdf_generator import convert_response_to_pdf  # fpdf is only loaded when a PDF is made
             pdf_file = convert_response_to_pdf(response_dict, "job_application_package.pdf")
             
             with open(pdf_file, "rb") as file:
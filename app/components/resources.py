@@ -0,0 +1,16 @@
+import streamlit as st
+from config import DEFAULT_MODEL
+
+# The services import openai, so they are only loaded when a page first needs them
+
+@st.cache_resource
+def get_analyzer(model=DEFAULT_MODEL):
+    """Return the analyzer shared by all sessions and reruns."""
+    from services.analyzer import JobResumeAnalyzer
+    return JobResumeAnalyzer(model=model)
+
+@st.cache_resource
+def get_generator(strategy, model=DEFAULT_MODEL):
+    """Return the cover letter generator for a strategy, shared by all sessions and reruns."""
+    from services.generator import CoverLetterGenerator
+    return CoverLetterGenerator(model=model, strategy=strategy)
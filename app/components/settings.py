@@ -1,5 +1,13 @@
 import streamlit as st
 import os
+from scrapers.waits import wait_stats
+from scrapers.job_cache import get_job_cache
+from services.llm_cache import get_llm_cache
+from config import COVER_LETTER_STRATEGIES
+from services.usage_stats import usage_stats
+from services.scheduler import get_scheduler
+from services.tasks import get_task_queue
+from utils import import_profile
 
 def show_settings():
     """Display the settings page."""
@@ -8,6 +16,14 @@ def show_settings():
     st.subheader("API Settings")
     api_key = st.text_input("OpenAI API Key", value=os.getenv("OPENAI_API_KEY", ""), type="password")
     model = st.selectbox("AI Model", ["gpt-4.1", "o3-mini"], index=0)
+    st.selectbox(
+        "Cover Letter Strategy",
+        COVER_LETTER_STRATEGIES,
+        key="cover_letter_strategy",
+        help="single: one writing pass. write_review: draft, review, then a revision of the draft. "
+             "full: draft, review, then a rewrite from scratch. The review step is skipped "
+             "when the reviewer approves the draft."
+    )
     
     if st.button("Save Settings"):
         # In a real app, you would save these settings securely
@@ -16,4 +32,72 @@ def show_settings():
         st.success("Settings saved successfully!")
     
     st.subheader("Job Sources")
-    st.info("Currently supported job sources: HelloWork and Welcome to the Jungle. More job sources will be added in future updates.")
\ No newline at end of file
+    st.info("Currently supported job sources: HelloWork and Welcome to the Jungle. More job sources will be added in future updates.")
+    
+    st.subheader("Scraper Wait Timings")
+    wait_summary = wait_stats.summary()
+    if wait_summary:
+        st.caption("Time spent waiting for page readiness conditions, in seconds. Use it to tune the Selenium timeouts.")
+        st.dataframe(
+            [{"wait": label, **stats} for label, stats in sorted(wait_summary.items())],
+            hide_index=True
+        )
+    else:
+        st.caption("No page waits recorded yet. Run a job search to collect timings.")
+    
+    st.subheader("Job Posting Cache")
+    cache_stats = get_job_cache().stats()
+    cache_cols = st.columns(4)
+    cache_cols[0].metric("Hits", cache_stats["hits"] + cache_stats["stale_hits"])
+    cache_cols[1].metric("Misses", cache_stats["misses"])
+    cache_cols[2].metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+    cache_cols[3].metric("Cached Entries", cache_stats["entries"])
+    
+    st.subheader("AI Response Cache")
+    llm_cache_stats = get_llm_cache().stats()
+    llm_cache_cols = st.columns(4)
+    llm_cache_cols[0].metric("Hits", llm_cache_stats["hits"])
+    llm_cache_cols[1].metric("Misses", llm_cache_stats["misses"])
+    llm_cache_cols[2].metric("Cached Responses", llm_cache_stats["entries"])
+    llm_cache_cols[3].metric("Size", f"{llm_cache_stats['bytes'] / (1024 * 1024):.1f} MB")
+    
+    st.subheader("AI Usage")
+    usage_summary = usage_stats.summary()
+    if usage_summary:
+        st.caption("Latency and tokens per pipeline. Cached tokens are input tokens served from the provider's prompt cache.")
+        st.dataframe(
+            [{"pipeline": label, **stats} for label, stats in sorted(usage_summary.items())],
+            hide_index=True
+        )
+    else:
+        st.caption("No AI calls recorded yet.")
+    
+    scheduler_stats = get_scheduler().stats()
+    scheduler_cols = st.columns(4)
+    scheduler_cols[0].metric("API Attempts", scheduler_stats["attempts"])
+    scheduler_cols[1].metric("Retries", scheduler_stats["retries"])
+    scheduler_cols[2].metric("Rate Limited", scheduler_stats["rate_limited"])
+    scheduler_cols[3].metric("Throttled", f"{scheduler_stats['throttled_seconds']:.1f} s")
+    
+    st.subheader("Background Tasks")
+    task_stats = get_task_queue().stats()
+    task_cols = st.columns(4)
+    task_cols[0].metric("Queued", task_stats["queued"])
+    task_cols[1].metric("Running", task_stats["running"])
+    task_cols[2].metric("Done", task_stats["done"])
+    task_cols[3].metric("Failed", task_stats["failed"])
+    
+    st.subheader("Startup Profile")
+    milestones = import_profile.milestones()
+    if milestones:
+        profile_cols = st.columns(3)
+        profile_cols[0].metric("Profile Rendered", f"{milestones.get('profile_rendered', 0):.2f} s")
+        profile_cols[1].metric("First Run", f"{milestones.get('first_run_complete', 0):.2f} s")
+        profile_cols[2].metric("Time in Imports", f"{import_profile.total_seconds():.2f} s")
+    slowest_imports = import_profile.import_times(limit=20, min_ms=5)
+    if slowest_imports:
+        st.caption("Slowest first imports since startup, in milliseconds. Self time excludes the modules "
+                   "imported in turn; at_s is when the import started, so later rows were loaded on first use.")
+        st.dataframe(slowest_imports, hide_index=True)
+    else:
+        st.caption("Import timing is not enabled.")
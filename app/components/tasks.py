@@ -0,0 +1,60 @@
+import streamlit as st
+from config import TASK_POLL_INTERVAL
+from services.tasks import get_task_queue, ACTIVE_STATES
+
+STATUS_ICONS = {"queued": "⏳", "running": "🔄", "done": "✅", "failed": "❌"}
+
+def submit_task(kind, label, function, *args, on_done=None, **kwargs):
+    """Run a function in the background task queue and track it in this session.
+
+    on_done is called with the task record in a later rerun of this session,
+    once the task has finished, to move its result into the session state.
+    """
+    task_id = get_task_queue().submit(kind, label, function, *args, **kwargs)
+    st.session_state.tasks.append(task_id)
+    if on_done is not None:
+        st.session_state.task_callbacks[task_id] = on_done
+    return task_id
+
+def session_tasks():
+    """Return the records of this session's tasks, newest first."""
+    task_queue = get_task_queue()
+    records = [task_queue.get(task_id) for task_id in st.session_state.tasks]
+    return [record for record in reversed(records) if record is not None]
+
+def apply_finished_tasks():
+    """Run the callbacks of the tasks that finished since the last rerun."""
+    task_queue = get_task_queue()
+    applied = False
+    for task_id in list(st.session_state.task_callbacks):
+        record = task_queue.get(task_id)
+        if record is not None and record["status"] in ACTIVE_STATES:
+            continue
+        on_done = st.session_state.task_callbacks.pop(task_id)
+        if record is not None:
+            on_done(record)
+            applied = True
+    return applied
+
+def _task_panel(limit):
+    if apply_finished_tasks():
+        # Redraw the whole page with the new results
+        st.rerun()
+
+    for record in session_tasks()[:limit]:
+        st.markdown(f"{STATUS_ICONS[record['status']]} {record['label']}")
+        if record["status"] == "running":
+            st.progress(record["progress"] or 0.0, text=record["message"])
+            if record["partial"]:
+                with st.expander("Output so far"):
+                    st.markdown(record["partial"])
+        elif record["status"] == "failed":
+            st.caption(f"Failed: {record['error']}")
+        elif record["message"]:
+            st.caption(record["message"])
+
+def show_tasks(limit=5):
+    """Show this session's latest background tasks, refreshing while any of them is unfinished."""
+    running = any(record["status"] in ACTIVE_STATES for record in session_tasks())
+    # Poll only while there is something to wait for, an idle page does not rerun
+    st.fragment(_task_panel, run_every=TASK_POLL_INTERVAL if running else None)(limit)
@@ -5,12 +5,100 @@ DEBUG_MODE = True  # Set to True for detailed logging
 
 # Selenium browser settings
 SELENIUM_TIMEOUT = 10  # seconds
-SELENIUM_WAIT_TIME = 2  # seconds between page loads
+SELENIUM_READY_TIMEOUT = 5  # max seconds to wait for a page readiness condition
+SELENIUM_POLL_INTERVAL = 0.1  # seconds between readiness checks
+JS_CARD_EXTRACTION = True  # extract search result cards with a single script call
 HEADLESS_BROWSER = False  # Set to False for debugging
 
+# WebDriver pool settings
+DRIVER_POOL_SIZE = 2  # maximum number of warm drivers kept per site
+DRIVER_MAX_USES = 25  # recycle a driver after this many leases
+DRIVER_LEASE_TIMEOUT = 120  # seconds to wait for a free driver
+DETAIL_FETCH_CONCURRENCY = 2  # parallel job detail fetches in batch mode
+MULTI_SOURCE_TIMEOUT = 60  # seconds to wait for each site in an "All sources" search
+
+# ChromeDriver resolution: a pinned driver path is used as is (fully offline),
+# otherwise the driver webdriver_manager installs is cached per Chrome version
+CHROMEDRIVER_PATH = None  # e.g. "/usr/local/bin/chromedriver"
+CHROME_BINARY_PATH = None  # Chrome executable, when it is not the system default
+CHROMEDRIVER_CACHE_PATH = "cache/chromedriver.json"
+
+# HTTP fast path settings (server-rendered pages fetched without a browser)
+HTTP_FAST_PATH = True  # try plain HTTP before falling back to Selenium
+HTTP_TIMEOUT = 10  # seconds
+HTTP_POOL_SIZE = 10  # keep-alive connections per host
+HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+# Job posting cache settings
+JOB_CACHE_PATH = "cache/jobs.sqlite3"
+JOB_CACHE_TTL = 24 * 3600  # seconds before a cached posting is revalidated
+JOB_CACHE_MAX_ENTRIES = 5000  # least recently used postings beyond this are evicted
+
+# Duplicate posting detection (same offer on several sites or result pages)
+DEDUP_SIMILARITY_THRESHOLD = 0.8  # estimated Jaccard similarity of descriptions to merge postings
+DEDUP_SHINGLE_SIZE = 3  # words per description shingle
+DEDUP_NUM_PERM = 128  # MinHash signature length
+DEDUP_LSH_BANDS = 16  # LSH bands, each of DEDUP_NUM_PERM / DEDUP_LSH_BANDS rows
+
+# Scraper fixture settings: "capture" saves every page the scrapers load,
+# "replay" serves the saved pages from a local HTTP server instead of the live sites
+SCRAPER_FIXTURES_MODE = None  # None, "capture" or "replay"
+SCRAPER_FIXTURES_DIR = "fixtures/scrapers"
+
 # AI model settings
 DEFAULT_MODEL = "gpt-4.1"
 ALTERNATIVE_MODEL = "o3-mini"
+COVER_LETTER_STRATEGIES = ("single", "write_review", "full")
+COVER_LETTER_STRATEGY = "full"  # one of COVER_LETTER_STRATEGIES
+
+# Token budgets for prompt inputs, per model
+TOKEN_BUDGETS = {
+    "gpt-4.1": {"job_description": 4000, "resume": 3000},
+    "o3-mini": {"job_description": 3000, "resume": 2500},
+}
+DEFAULT_TOKEN_BUDGET = {"job_description": 3000, "resume": 2500}
+
+# LLM response cache settings
+LLM_CACHE_ENABLED = True
+LLM_CACHE_PATH = "cache/llm_responses.sqlite3"
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024  # least recently used responses beyond this are evicted
+
+# Bulk LLM processing settings
+LLM_CONCURRENCY = 5  # maximum concurrent requests in analyze_many / generate_many
+LLM_REQUEST_TIMEOUT = 120  # seconds per request
+
+# OpenAI rate limits and retries (match your account tier)
+LLM_REQUESTS_PER_MINUTE = 500
+LLM_TOKENS_PER_MINUTE = 200000
+LLM_OUTPUT_TOKENS_ESTIMATE = 1000  # output tokens reserved per call before its usage is known
+LLM_MAX_ATTEMPTS = 5
+LLM_BACKOFF_BASE = 1  # seconds, doubled on each retry with random jitter
+LLM_BACKOFF_MAX = 60  # seconds
+
+# OpenAI HTTP connection pool settings (shared by all services)
+OPENAI_MAX_CONNECTIONS = 20
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 10
+OPENAI_KEEPALIVE_EXPIRY = 60  # seconds an idle connection stays open for reuse
+OPENAI_CONNECT_TIMEOUT = 10  # seconds
+
+# LLM backend: "openai", "mock" (offline stand-in for the Responses API)
+# or "record" (call OpenAI and save each reply as a fixture the mock replays)
+LLM_BACKEND = "openai"
+MOCK_LLM_LATENCY = 0.5  # seconds before the first output token
+MOCK_LLM_TOKENS_PER_SECOND = 80  # output throughput
+MOCK_LLM_OUTPUT_TOKENS = 300  # length of synthesized outputs
+LLM_FIXTURES_DIR = "fixtures/llm"
+
+# Background task settings (searches, detail fetches and AI calls run outside the Streamlit script)
+TASK_WORKERS = 4  # tasks running at once across all sessions
+TASK_STORE_PATH = "cache/tasks.sqlite3"
+TASK_TTL = 24 * 3600  # seconds a finished task and its result are kept
+TASK_MAX_ENTRIES = 500
+TASK_POLL_INTERVAL = 1  # seconds between UI refreshes while tasks run
+
+# Batch pipeline settings (cli.py)
+PIPELINE_QUEUE_SIZE = 4  # jobs waiting between two stages before the upstream stage blocks
+PDF_CONCURRENCY = 2  # parallel PDF renders
 
 # File paths
 COOKIES_PATH = "cookies.json"
@@ -1,13 +1,18 @@
 import streamlit as st
 import os
 
-# Import components and pages
+# Time the imports below and every later first import, shown on the Settings page
+from utils import import_profile
+import_profile.enable()
+
+# Import components and pages (they import pandas, openai, selenium and fpdf on first use)
 from components.job_search import show_job_search
 from components.manual_input import show_manual_input
 from components.settings import show_settings
 from components.profile import show_profile
 from state import initialize_session_state
-from config import config
+import config
+from config import LLM_BACKEND
 
 if config.DEBUG_MODE:
     import logging
@@ -24,8 +29,8 @@ if config.DEV_MODE:
     # Load environment variables
     load_dotenv()
 
-# Check for API key
-if os.getenv("OPENAI_API_KEY") is None:
+# Check for API key (the offline mock backend does not need one)
+if LLM_BACKEND != "mock" and os.getenv("OPENAI_API_KEY") is None:
     st.error("OpenAI API key not found. Please add it to your .env file.")
     st.stop()
 
@@ -53,12 +58,14 @@ def main():
     # Display the selected page
     with tabs[0]:
         show_profile()
+    import_profile.mark("profile_rendered")
     with tabs[1]:
         show_job_search()
     with tabs[2]:
         show_manual_input()
     with tabs[3]:
         show_settings()
+    import_profile.mark("first_run_complete")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,70 @@
+from typing import Annotated, List
+
+from pydantic import AfterValidator, BaseModel
+
+
+def _check_score(value):
+    """Reject scores outside the 0-100 rubric"""
+    if not 0 <= value <= 100:
+        raise ValueError(f"score must be between 0 and 100, got {value}")
+    return value
+
+
+Score = Annotated[int, AfterValidator(_check_score)]
+
+
+class CategoryScore(BaseModel):
+    """Score of one category of the match (technical skills, experience, ...)"""
+
+    category: str
+    score: Score
+    explanation: str
+
+
+class JobAnalysis(BaseModel):
+    """Structured result of a resume-job match analysis"""
+
+    resume_hard_skills: List[str]
+    resume_soft_skills: List[str]
+    required_skills: List[str]
+    preferred_skills: List[str]
+    direct_matches: List[str]
+    transferable_skills: List[str]
+    skills_gaps: List[str]
+    match_score: Score
+    score_breakdown: List[CategoryScore]
+    summary: str
+
+    def to_markdown(self):
+        """Render the analysis in the same layout as the free-form markdown output"""
+        def bullets(items):
+            return "\n".join(f"- {item}" for item in items) if items else "- None"
+
+        breakdown = "\n".join(
+            f"- {category.category}: {category.score}/100 - {category.explanation}"
+            for category in self.score_breakdown
+        )
+
+        return f"""## Skills Extraction
+Resume Skills:
+{bullets(self.resume_hard_skills + self.resume_soft_skills)}
+
+Job Requirements:
+{bullets(self.required_skills + self.preferred_skills)}
+
+## Match Analysis
+Direct Matches:
+{bullets(self.direct_matches)}
+
+Transferable Skills:
+{bullets(self.transferable_skills)}
+
+Skills Gaps:
+{bullets(self.skills_gaps)}
+
+## Match Score: {self.match_score}
+{breakdown}
+
+## Summary Assessment
+{self.summary}
+"""
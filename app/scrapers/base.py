@@ -7,14 +7,71 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, SessionNotCreatedException
 import time
-from config import HEADLESS_BROWSER
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import HEADLESS_BROWSER, DETAIL_FETCH_CONCURRENCY, SELENIUM_READY_TIMEOUT, SELENIUM_POLL_INTERVAL
+from config import JS_CARD_EXTRACTION, CHROMEDRIVER_PATH, CHROME_BINARY_PATH
+from .chromedriver import resolve_chromedriver, chrome_updated, invalidate as invalidate_chromedriver
+from .driver_pool import get_pool
+from .http_client import get_http_session
+from .job_cache import get_job_cache
+from .waits import wait_stats, document_ready, element_present, network_idle
+from .fixtures import get_fixture_mode, get_fixture_store, get_replay_server
 
 class BaseScraper(ABC):
     """Base class for all job scrapers"""
     
+    # Key of the shared driver pool and cookie file for this site
+    site = None
+    
+    # Scheme and host of the live site, replaced by the local server when replaying fixtures
+    origin = None
+    
+    def acquire_driver(self):
+        """Lease a warm driver from this site's pool (None if one cannot be started)"""
+        try:
+            return get_pool(self.site, self.setup_driver).acquire()
+        except TimeoutError as e:
+            print(f"Error leasing WebDriver: {e}")
+            return None
+    
+    def release_driver(self, driver):
+        """Give a leased driver back to this site's pool instead of quitting it"""
+        get_pool(self.site, self.setup_driver).release(driver)
+    
+    def http_session(self):
+        """Return this site's keep-alive HTTP session, authenticated with the saved cookies"""
+        return get_http_session(self.site, self.get_cookies_path(self.site))
+    
+    def page_url(self, url):
+        """URL to load for a page: the live one, or its saved copy when replaying fixtures"""
+        if get_fixture_mode() != "replay":
+            return url
+        return get_replay_server(self.site, self.origin).url(url)
+    
+    def capture_page(self, url, html, kind, params=None, cookies=None):
+        """
+        Save a loaded page as a fixture when capturing
+        
+        Args:
+            url (str): Live URL of the page
+            html (str): Page HTML
+            kind (str): "search" or "detail"
+            params (dict, optional): search_jobs arguments that load this page
+            cookies (list, optional): Cookies of the session that loaded it
+        """
+        if get_fixture_mode() != "capture" or not html:
+            return
+        store = get_fixture_store(self.site)
+        store.save_page(url, html, kind, params)
+        store.save_cookies(cookies)
+    
+    def capture_driver_page(self, driver, url, kind, params=None):
+        """Save the page currently rendered by a driver as a fixture when capturing"""
+        if get_fixture_mode() == "capture":
+            self.capture_page(url, driver.page_source, kind, params, driver.get_cookies())
+    
     def setup_driver(self):
         """Set up and return a Chrome WebDriver instance with improved cookie handling"""
         # Set up Chrome options
@@ -25,18 +82,32 @@ class BaseScraper(ABC):
         
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
+        if CHROME_BINARY_PATH:
+            chrome_options.binary_location = CHROME_BINARY_PATH
         
-        # Use webdriver_manager to handle driver version compatibility
+        # The driver path is resolved once per process and cached per Chrome version
         try:
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+            try:
+                driver = webdriver.Chrome(service=Service(resolve_chromedriver()), options=chrome_options)
+            except SessionNotCreatedException:
+                # Usually Chrome was updated while the process ran. With the same
+                # version, resolving again would return the same rejected driver
+                if CHROMEDRIVER_PATH or not chrome_updated():
+                    raise
+                print("Chrome was updated and rejected the chromedriver, resolving it again")
+                invalidate_chromedriver()
+                driver = webdriver.Chrome(service=Service(resolve_chromedriver()), options=chrome_options)
+            
+            if get_fixture_mode() == "replay":
+                # Saved pages are served locally, there is no live session to set up
+                return driver
             
             # First navigate to the domain (required before adding cookies)
             domain = 'welcometothejungle.com' if 'WTTJ' in self.__class__.__name__ else 'hellowork.com'
             driver.get(f"https://www.{domain}")
             
-            # Add a small delay to ensure the page is loaded
-            time.sleep(1)
+            # Make sure the page is loaded before touching cookies
+            self.wait_for_document_ready(driver)
 
             cookies_name = "wttj_cookies" if 'WTTJ' in self.__class__.__name__ else "hellowork_cookies"
             
@@ -65,6 +136,82 @@ class BaseScraper(ABC):
             print(f"Error setting up WebDriver: {e}")
             return None
     
+    def wait_for(self, driver, condition, label, timeout=None):
+        """
+        Block until a readiness condition holds and record how long it took
+        
+        Args:
+            driver: WebDriver instance
+            condition (callable): Called with the driver, truthy when ready
+            label (str): Name under which the wait duration is recorded
+            timeout (float, optional): Maximum seconds to wait
+            
+        Returns:
+            bool: True if the condition was met, False on timeout
+        """
+        timeout = SELENIUM_READY_TIMEOUT if timeout is None else timeout
+        start = time.perf_counter()
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=SELENIUM_POLL_INTERVAL).until(condition)
+            ready = True
+        except TimeoutException:
+            ready = False
+        
+        wait_stats.record(f"{self.site}:{label}", time.perf_counter() - start, timed_out=not ready)
+        return ready
+    
+    def wait_for_document_ready(self, driver, timeout=None):
+        """Wait for document.readyState to be complete"""
+        return self.wait_for(driver, document_ready, "document_ready", timeout)
+    
+    def wait_for_network_idle(self, driver, idle_time=0.5, timeout=None):
+        """Wait until the page stops fetching resources for idle_time seconds"""
+        return self.wait_for(driver, network_idle(idle_time), "network_idle", timeout)
+    
+    def wait_for_element(self, driver, locator, label, timeout=None):
+        """Wait until at least one element matches the (By, value) locator"""
+        return self.wait_for(driver, element_present(locator), label, timeout)
+    
+    def wait_for_page_ready(self, driver, locator=None, label="page_ready", timeout=None):
+        """
+        Wait for a freshly loaded page to be usable
+        
+        Blocks on the document being loaded, then on the site-specific
+        locator if given, or on network idle otherwise.
+        """
+        if not self.wait_for_document_ready(driver, timeout):
+            return False
+        if locator is not None:
+            return self.wait_for_element(driver, locator, label, timeout)
+        return self.wait_for_network_idle(driver, timeout=timeout)
+    
+    def extract_cards_js(self, driver, script):
+        """
+        Extract all search result cards of the current page in one script call
+        
+        Args:
+            driver: WebDriver instance
+            script (str): JavaScript returning an array of card objects
+            
+        Returns:
+            list: Card dictionaries, or None when the script's selectors no
+                longer match and the caller should fall back to Selenium
+        """
+        if not JS_CARD_EXTRACTION:
+            return None
+        
+        try:
+            cards = driver.execute_script(script)
+        except Exception as e:
+            print(f"Error running card extraction script: {e}")
+            return None
+        
+        if not cards or not any(card.get("title") and card.get("link") for card in cards):
+            print("Card extraction script did not match the page, falling back to Selenium")
+            return None
+        
+        return cards
+    
     @abstractmethod
     def search_jobs(self, keywords, location, job_type=None):
         """
@@ -80,19 +227,106 @@ class BaseScraper(ABC):
         """
         pass
     
-    @abstractmethod
     def get_job_details(self, url):
         """
         Get detailed information about a specific job from its URL
         
+        Fresh entries of the shared job cache are returned without scraping.
+        Stale entries are revalidated, and only served if the page can no
+        longer be fetched.
+        
         Args:
             url (str): URL of the job posting
             
         Returns:
             dict: Detailed job information
         """
+        job_cache = get_job_cache()
+        
+        cached, fresh = job_cache.lookup_details(url)
+        if fresh:
+            return cached
+        
+        job_details = self._fetch_job_details(url)
+        if cached is not None:
+            # The stale entry only counts as a hit if it is what we return
+            job_cache.record_stale(served=not job_details)
+        if job_details:
+            job_cache.put_details(url, job_details)
+            return job_details
+        
+        return cached
+    
+    @abstractmethod
+    def _fetch_job_details(self, url):
+        """
+        Scrape detailed information about a specific job from its URL
+        
+        Args:
+            url (str): URL of the job posting
+            
+        Returns:
+            dict: Detailed job information, or None on failure
+        """
         pass
     
+    def get_job_details_many(self, urls, concurrency=None, progress_callback=None):
+        """
+        Get detailed information for many job postings in parallel
+        
+        Each worker leases its own driver from the site's pool, so the pool
+        size caps the number of browsers regardless of the concurrency.
+        
+        Args:
+            urls (list): URLs of the job postings
+            concurrency (int, optional): Number of parallel fetches
+            progress_callback (callable, optional): Called as
+                progress_callback(done, total, url, error) after each URL
+            
+        Returns:
+            tuple: (details, failures) where details maps each URL to its
+                job details and failures maps each failed URL to an error message
+        """
+        concurrency = concurrency or DETAIL_FETCH_CONCURRENCY
+        urls = list(dict.fromkeys(url for url in urls if url))
+        details = {}
+        failures = {}
+        
+        if not urls:
+            return details, failures
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {executor.submit(self.get_job_details, url): url for url in urls}
+            
+            for done, future in enumerate(as_completed(futures), start=1):
+                url = futures[future]
+                error = None
+                try:
+                    result = future.result()
+                    if result:
+                        details[url] = result
+                    else:
+                        error = "No job details found"
+                except Exception as e:
+                    error = str(e)
+                
+                if error:
+                    failures[url] = error
+                    print(f"Error getting job details for {url}: {error}")
+                
+                if progress_callback:
+                    progress_callback(done, len(urls), url, error)
+        
+        return details, failures
+    
+    @staticmethod
+    def details_to_text(job_details):
+        """Reduce the result of get_job_details to the plain description text"""
+        if isinstance(job_details, dict):
+            # HelloWork returns the extracted section structure
+            return job_details.get("cleaned_text")
+        return job_details
+    
     def get_cookies_path(self, domain):
         """Get the path to the cookies file for a specific domain."""
         cookies_dir = Path("cookies")
@@ -0,0 +1,110 @@
+import json
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path
+
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+
+from config import CHROMEDRIVER_PATH, CHROME_BINARY_PATH, CHROMEDRIVER_CACHE_PATH
+
+VERSION_RE = re.compile(r"\d+\.\d+\.\d+(\.\d+)?")
+
+_resolved = None
+_resolved_version = None
+_lock = threading.Lock()
+
+
+def chrome_version():
+    """Return the version of the installed Chrome without going to the network, or None"""
+    try:
+        if CHROME_BINARY_PATH:
+            output = subprocess.run(
+                [CHROME_BINARY_PATH, "--version"], capture_output=True, text=True, timeout=10
+            ).stdout
+            match = VERSION_RE.search(output)
+            return match.group(0) if match else None
+        return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception as e:
+        print(f"Could not detect the Chrome version: {e}")
+        return None
+
+
+def _load_cache():
+    try:
+        with open(CHROMEDRIVER_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(entry):
+    path = Path(CHROMEDRIVER_CACHE_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(entry, indent=2), encoding="utf-8")
+
+
+def resolve_chromedriver():
+    """
+    Return the path of a chromedriver matching the installed Chrome
+
+    The path is resolved once per process. A pinned CHROMEDRIVER_PATH is
+    used as is. Otherwise the path installed by webdriver_manager is saved
+    on disk with the Chrome version it matches and reused by later
+    processes, until Chrome's version changes.
+
+    Returns:
+        str: Path of the chromedriver executable
+    """
+    global _resolved, _resolved_version
+    with _lock:
+        if _resolved is not None:
+            return _resolved
+
+        if CHROMEDRIVER_PATH:
+            if not os.path.isfile(CHROMEDRIVER_PATH):
+                raise FileNotFoundError(f"CHROMEDRIVER_PATH does not exist: {CHROMEDRIVER_PATH}")
+            _resolved = CHROMEDRIVER_PATH
+            return _resolved
+
+        version = _resolved_version = chrome_version()
+        cached = _load_cache()
+        if version and cached.get("chrome_version") == version and os.path.isfile(cached.get("path", "")):
+            _resolved = cached["path"]
+            return _resolved
+
+        # First run or Chrome was updated: check versions, downloading a driver if needed.
+        # The detected version is passed on so a CHROME_BINARY_PATH browser gets its own
+        # driver rather than one matching the system Chrome
+        path = ChromeDriverManager(driver_version=version).install()
+        if version:
+            _save_cache({"chrome_version": version, "path": path})
+        print(f"Resolved chromedriver {path} for Chrome {version or 'unknown version'}")
+        _resolved = path
+        return _resolved
+
+
+def chrome_updated():
+    """
+    Tell whether the installed Chrome changed version since the driver was resolved
+
+    Only then can resolving again find a driver other than the one Chrome
+    rejected: for the same version, webdriver_manager returns its cached copy.
+    """
+    with _lock:
+        resolved_version = _resolved_version if _resolved is not None else None
+    if resolved_version is None:
+        return False
+    version = chrome_version()
+    return version is not None and version != resolved_version
+
+
+def invalidate():
+    """Forget the resolved driver, e.g. after Chrome rejected it, so the next call resolves it again"""
+    global _resolved
+    with _lock:
+        _resolved = None
+        if os.path.exists(CHROMEDRIVER_CACHE_PATH):
+            os.remove(CHROMEDRIVER_CACHE_PATH)
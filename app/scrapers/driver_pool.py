@@ -0,0 +1,153 @@
+import atexit
+import threading
+import time
+
+from config import DRIVER_POOL_SIZE, DRIVER_MAX_USES, DRIVER_LEASE_TIMEOUT
+
+
+class DriverPool:
+    """Pool of warm, already-authenticated WebDriver instances for a single site"""
+
+    def __init__(self, factory, size=None, max_uses=None, lease_timeout=None):
+        """
+        Args:
+            factory (callable): Returns a ready-to-use driver, or None on failure
+            size (int, optional): Maximum number of live drivers
+            max_uses (int, optional): Number of leases after which a driver is recycled
+            lease_timeout (float, optional): Seconds to wait for a free driver
+        """
+        self.factory = factory
+        self.size = size or DRIVER_POOL_SIZE
+        self.max_uses = max_uses or DRIVER_MAX_USES
+        self.lease_timeout = lease_timeout or DRIVER_LEASE_TIMEOUT
+
+        self._idle = []
+        self._uses = {}
+        self._alive = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Lease a healthy driver, creating one if the pool is not full"""
+        deadline = time.monotonic() + self.lease_timeout
+
+        while True:
+            with self._cond:
+                while not self._idle and self._alive >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No WebDriver available after {self.lease_timeout}s")
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    driver = None
+                    self._alive += 1
+
+            if driver is None:
+                return self._create()
+
+            if self.is_healthy(driver):
+                return driver
+
+            print("Discarding unhealthy WebDriver from pool")
+            self._discard(driver)
+
+    def release(self, driver):
+        """Return a leased driver to the pool, recycling it if worn out or crashed"""
+        if driver is None:
+            return
+
+        with self._cond:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+            worn_out = self._closed or uses >= self.max_uses
+
+        # The health check talks to the browser, so it runs outside the lock
+        if worn_out or not self.is_healthy(driver):
+            self._discard(driver)
+            return
+
+        with self._cond:
+            if not self._closed:
+                self._idle.append(driver)
+                self._cond.notify()
+                return
+        self._discard(driver)
+
+    def is_healthy(self, driver):
+        """Check that the browser session behind a driver still responds"""
+        try:
+            driver.execute_script("return document.readyState")
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        """Quit every idle driver and stop accepting returned ones"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+        for driver in idle:
+            self._discard(driver)
+
+    def stats(self):
+        """Return a snapshot of the pool occupancy"""
+        with self._cond:
+            return {
+                "size": self.size,
+                "alive": self._alive,
+                "idle": len(self._idle),
+                "leased": self._alive - len(self._idle),
+            }
+
+    def _create(self):
+        driver = None
+        try:
+            driver = self.factory()
+        finally:
+            if driver is None:
+                with self._cond:
+                    self._alive -= 1
+                    self._cond.notify()
+
+        with self._cond:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self._cond:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error quitting WebDriver: {e}")
+        finally:
+            with self._cond:
+                self._alive -= 1
+                self._cond.notify()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(site, factory):
+    """Return the process-wide driver pool for a site, creating it on first use"""
+    with _pools_lock:
+        if site not in _pools:
+            _pools[site] = DriverPool(factory)
+        return _pools[site]
+
+
+@atexit.register
+def close_all_pools():
+    """Quit every pooled driver"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,186 @@
+import re
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import SCRAPER_FIXTURES_MODE, SCRAPER_FIXTURES_DIR
+from .job_cache import canonical_url
+
+MODES = (None, "capture", "replay")
+
+SCRIPT_RE = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+
+_mode = SCRAPER_FIXTURES_MODE
+
+
+def get_fixture_mode():
+    """Return the current fixture mode (None, "capture" or "replay")"""
+    return _mode
+
+
+def set_fixture_mode(mode):
+    """Switch fixture capture or replay on or off for the whole process"""
+    global _mode
+    if mode not in MODES:
+        raise ValueError(f"Unknown fixture mode: {mode}")
+    _mode = mode
+
+
+def session_cookies(session):
+    """Cookies of a requests session in the format Selenium saves them"""
+    return [
+        {"name": cookie.name, "value": cookie.value, "domain": cookie.domain, "path": cookie.path}
+        for cookie in session.cookies
+    ]
+
+
+class FixtureStore:
+    """
+    Saved pages of one site, keyed by canonical URL
+
+    Layout: <root>/<site>/pages/<key>.html, an index.json describing each
+    page (original URL, "search" or "detail", search parameters) and the
+    cookies of the capture session in cookies.json.
+    """
+
+    def __init__(self, site, root=None):
+        self.site = site
+        self.path = Path(root or SCRAPER_FIXTURES_DIR) / site
+        self._lock = threading.Lock()
+
+    def key(self, url):
+        return hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()[:24]
+
+    def save_page(self, url, html, kind, params=None):
+        """
+        Save a page, without its scripts so replay shows the DOM as captured
+
+        Args:
+            url (str): Original URL of the page
+            html (str): Page HTML
+            kind (str): "search" or "detail"
+            params (dict, optional): search_jobs arguments that load this page
+        """
+        key = self.key(url)
+        with self._lock:
+            pages_dir = self.path / "pages"
+            pages_dir.mkdir(parents=True, exist_ok=True)
+            (pages_dir / f"{key}.html").write_text(SCRIPT_RE.sub("", html), encoding="utf-8")
+
+            index = self.index()
+            index[key] = {"url": url, "kind": kind, "params": params, "captured_at": time.time()}
+            (self.path / "index.json").write_text(json.dumps(index, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Captured {kind} page {url}")
+
+    def load_page(self, url):
+        """Return the saved HTML of a URL, or None"""
+        page_path = self.path / "pages" / f"{self.key(url)}.html"
+        if not page_path.exists():
+            return None
+        return page_path.read_text(encoding="utf-8")
+
+    def index(self):
+        """Return key -> page description for every saved page"""
+        index_path = self.path / "index.json"
+        if not index_path.exists():
+            return {}
+        return json.loads(index_path.read_text(encoding="utf-8"))
+
+    def pages(self, kind=None):
+        """Return the descriptions of the saved pages, optionally of one kind"""
+        return [page for page in self.index().values() if kind is None or page["kind"] == kind]
+
+    def save_cookies(self, cookies):
+        """Save the cookies of the capture session"""
+        if not cookies:
+            return
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            (self.path / "cookies.json").write_text(json.dumps(cookies, indent=2), encoding="utf-8")
+
+    def load_cookies(self):
+        cookies_path = self.path / "cookies.json"
+        if not cookies_path.exists():
+            return []
+        return json.loads(cookies_path.read_text(encoding="utf-8"))
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """Serve the saved page of origin + request path, or 404"""
+
+    def do_GET(self):
+        html = self.server.store.load_page(self.server.origin + self.path)
+        if html is None:
+            self.send_error(404, "No fixture for this page")
+            return
+
+        body = html.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+
+class ReplayServer:
+    """
+    Local HTTP server standing in for one site
+
+    Replayed URLs keep their path and query, only the origin changes, so
+    relative links inside saved pages keep pointing at saved pages.
+    """
+
+    def __init__(self, site, origin, root=None):
+        self.store = FixtureStore(site, root)
+        self.origin = origin.rstrip("/")
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _ReplayHandler)
+        self.server.store = self.store
+        self.server.origin = self.origin
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, name=f"replay-{site}", daemon=True)
+        self.thread.start()
+
+    def url(self, url):
+        """Map a live URL of the site to its replayed copy"""
+        if url and url.startswith(self.origin):
+            return self.base_url + url[len(self.origin):]
+        return url
+
+    def original_url(self, url):
+        """Map a replayed URL back to the live one"""
+        if url and url.startswith(self.base_url):
+            return self.origin + url[len(self.base_url):]
+        return url
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+_stores = {}
+_servers = {}
+_registry_lock = threading.Lock()
+
+
+def get_fixture_store(site):
+    """Return the process-wide fixture store of a site"""
+    with _registry_lock:
+        if site not in _stores:
+            _stores[site] = FixtureStore(site)
+        return _stores[site]
+
+
+def get_replay_server(site, origin):
+    """Return the replay server of a site, starting it on first use"""
+    with _registry_lock:
+        if site not in _servers:
+            _servers[site] = ReplayServer(site, origin)
+            print(f"Replaying {site} fixtures at {_servers[site].base_url}")
+        return _servers[site]
@@ -7,20 +7,55 @@ from selenium.common.exceptions import StaleElementReferenceException, TimeoutEx
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 
 import time
 import pandas as pd
 import string
 import os
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
 
 from .base import BaseScraper
-from config import SELENIUM_TIMEOUT, SELENIUM_WAIT_TIME, HEADLESS_BROWSER, COOKIES_PATH
+from .http_client import fetch_html
+from .fixtures import session_cookies
+from config import SELENIUM_TIMEOUT, HEADLESS_BROWSER, COOKIES_PATH
+from config import HTTP_FAST_PATH
+
+HELLOWORK_URL = "https://www.hellowork.com"
+
+# CSS equivalent of JOB_DETAILS_LOCATOR for parsing static HTML
+JOB_DETAILS_CSS = ("body > main > div:nth-of-type(4) > div:nth-of-type(3) > div:nth-of-type(1)"
+                   " > div:nth-of-type(2) > div > div:nth-of-type(2)")
+
+
+# Extracts every SERP card with the same selectors as the Selenium path
+SERP_CARDS_SCRIPT = """
+return Array.from(document.querySelectorAll('[data-cy="serpCard"]')).map(function (card) {
+    var heading = card.querySelector('h3');
+    var lines = heading ? heading.innerText.split('\\n') : [];
+    var location = card.querySelector('[data-cy="localisationCard"]');
+    var link = card.querySelector('a');
+    return {
+        title: lines.length > 0 ? lines[0] : null,
+        company: lines.length > 1 ? lines[1] : null,
+        location: location ? location.innerText : null,
+        link: link ? link.href : null,
+        text: null
+    };
+});
+"""
 
 
 class HelloWorkScraper(BaseScraper):
     """Scraper for HelloWork job site"""
     
+    site = "hellowork"
+    origin = HELLOWORK_URL
+    
+    # Readiness markers for search result and job detail pages
+    SERP_CARD_LOCATOR = (By.CSS_SELECTOR, '[data-cy="serpCard"]')
+    JOB_DETAILS_LOCATOR = (By.XPATH, "/html/body/main/div[4]/div[3]/div[1]/div[2]/div/div[2]")
+    
     def navigate_to_page(self, driver, page_number):
         """Navigate to a specific page number in search results"""
         try:
@@ -35,7 +70,8 @@ class HelloWorkScraper(BaseScraper):
             
             # Navigate to the new URL
             driver.get(new_url)
-            time.sleep(SELENIUM_WAIT_TIME)
+            self.wait_for_page_ready(driver, self.SERP_CARD_LOCATOR, "search_results")
+            self.capture_driver_page(driver, new_url, "search")
             return True
         except Exception as e:
             print(f"Error navigating to page {page_number}: {e}")
@@ -75,6 +111,29 @@ class HelloWorkScraper(BaseScraper):
         except (TimeoutException, NoSuchElementException):
             return False
 
+    def _build_search_url(self, keywords, location, job_type=None, page=1):
+        """Construct the search results URL for the given parameters"""
+        base_url = "https://www.hellowork.com/fr-fr/emploi/recherche.html"
+        search_url = f"{base_url}?k={keywords.replace(' ', '+')}&l={location.replace(' ', '+')}"
+        
+        # Add job type if specified
+        if job_type and job_type.lower() != "all":
+            job_type_param = ""
+            if job_type.lower() == "internship":
+                job_type_param = "&c=Stage"
+            elif job_type.lower() == "full-time":
+                job_type_param = "&c=CDI"
+            elif job_type.lower() == "part-time":
+                job_type_param = "&c=CDD"
+            
+            search_url += job_type_param
+        
+        # Add page parameter if specified and not page 1
+        if page > 1:
+            search_url += f"&p={page}"
+        
+        return search_url
+
     def search_jobs(self, keywords, location, job_type=None, page=1, all_pages=False, max_pages=3):
         """
         Search for jobs on HelloWork
@@ -87,34 +146,24 @@ class HelloWorkScraper(BaseScraper):
         - all_pages: whether to fetch all pages up to max_pages (default: False)
         - max_pages: maximum number of pages to fetch when all_pages is True (default: 3)
         """
-        driver = self.setup_driver()
+        search_url = self._build_search_url(keywords, location, job_type, page)
+        params = {"keywords": keywords, "location": location, "job_type": job_type, "page": page}
+        
+        # Fast path: server-rendered results fetched without a browser
+        if HTTP_FAST_PATH:
+            results = self._search_jobs_http(search_url, page, all_pages, max_pages, params)
+            if results:
+                return results
+        
+        driver = self.acquire_driver()
         if not driver:
             return []
             
         try:
-            # Construct the search URL
-            base_url = "https://www.hellowork.com/fr-fr/emploi/recherche.html"
-            search_url = f"{base_url}?k={keywords.replace(' ', '+')}&l={location.replace(' ', '+')}"
-            
-            # Add job type if specified
-            if job_type and job_type.lower() != "all":
-                job_type_param = ""
-                if job_type.lower() == "internship":
-                    job_type_param = "&c=Stage"
-                elif job_type.lower() == "full-time":
-                    job_type_param = "&c=CDI"
-                elif job_type.lower() == "part-time":
-                    job_type_param = "&c=CDD"
-                
-                search_url += job_type_param
-            
-            # Add page parameter if specified and not page 1
-            if page > 1:
-                search_url += f"&p={page}"
-            
             # Navigate to search URL
-            driver.get(search_url)
-            time.sleep(SELENIUM_WAIT_TIME)
+            driver.get(self.page_url(search_url))
+            self.wait_for_page_ready(driver, self.SERP_CARD_LOCATOR, "search_results")
+            self.capture_driver_page(driver, search_url, "search", params)
             
             # Check if cookie accept/deny dialog is present and handle it
             try:
@@ -165,17 +214,24 @@ class HelloWorkScraper(BaseScraper):
             print(f"Error searching jobs: {e}")
             return []
         finally:
-            driver.quit()
+            self.release_driver(driver)
     
-    def get_job_details(self, url):
-        """Get detailed information about a specific job"""
-        driver = self.setup_driver()
+    def _fetch_job_details(self, url):
+        """Scrape detailed information about a specific job"""
+        # Fast path: server-rendered job page fetched without a browser
+        if HTTP_FAST_PATH:
+            section_data = self._get_job_details_http(url)
+            if section_data:
+                return section_data
+        
+        driver = self.acquire_driver()
         if not driver:
             return None
             
         try:
-            driver.get(url)
-            time.sleep(SELENIUM_WAIT_TIME)
+            driver.get(self.page_url(url))
+            self.wait_for_page_ready(driver, self.JOB_DETAILS_LOCATOR, "job_details")
+            self.capture_driver_page(driver, url, "detail")
             
             # Extract job details
             section_data = self._get_section_text(driver)
@@ -188,7 +244,119 @@ class HelloWorkScraper(BaseScraper):
             print(f"Error getting job details: {e}")
             return None
         finally:
-            driver.quit()
+            self.release_driver(driver)
+    
+    def _search_jobs_http(self, search_url, page=1, all_pages=False, max_pages=3, params=None):
+        """
+        Search for jobs over plain HTTP
+        
+        Returns None when the first page cannot be parsed without JavaScript,
+        so the caller can fall back to Selenium.
+        """
+        session = self.http_session()
+        
+        html = fetch_html(session, self.page_url(search_url))
+        job_cards = self._parse_serp_cards(html) if html else None
+        if not job_cards:
+            return None
+        self.capture_page(search_url, html, "search", params, session_cookies(session))
+        
+        print(f"Found {len(job_cards)} SERP cards over HTTP")
+        all_results = list(job_cards)
+        
+        # If all_pages is True, fetch additional pages
+        current_page = page
+        if all_pages:
+            while current_page < max_pages:
+                current_page += 1
+                page_url = search_url.split("&p=")[0] + f"&p={current_page}"
+                html = fetch_html(session, self.page_url(page_url))
+                more_cards = self._parse_serp_cards(html) if html else None
+                if not more_cards:
+                    break
+                self.capture_page(page_url, html, "search", cookies=session_cookies(session))
+                all_results.extend(more_cards)
+                print(f"Added {len(more_cards)} jobs from page {current_page}")
+        
+        return all_results
+    
+    def _get_job_details_http(self, url):
+        """Get job details over plain HTTP (None if the page needs JavaScript)"""
+        session = self.http_session()
+        html = fetch_html(session, self.page_url(url))
+        section_data = self._parse_section_text(html) if html else None
+        if section_data:
+            self.capture_page(url, html, "detail", cookies=session_cookies(session))
+        return section_data
+    
+    def _parse_serp_cards(self, html):
+        """Extract job cards from search results HTML, same shape as _get_all_serp_cards"""
+        soup = BeautifulSoup(html, "html.parser")
+        card_elements = soup.select('[data-cy="serpCard"]')
+        
+        results = []
+        for card in card_elements:
+            heading = card.find("h3")
+            lines = heading.get_text("\n", strip=True).split("\n") if heading else []
+            location = card.select_one('[data-cy="localisationCard"]')
+            link = card.find("a", href=True)
+            
+            results.append({
+                "title": lines[0] if lines else None,
+                "company": lines[1] if len(lines) > 1 else None,
+                "location": location.get_text(" ", strip=True) if location else None,
+                "link": urljoin(HELLOWORK_URL, link["href"]) if link else None,
+                "text": None  # Will be populated when getting job details
+            })
+        
+        # Cards without titles or links mean the content is rendered client-side
+        if not any(card["title"] and card["link"] for card in results):
+            return None
+        
+        return results
+    
+    def _parse_section_text(self, html):
+        """Extract the job description from job page HTML, same shape as _get_section_text"""
+        soup = BeautifulSoup(html, "html.parser")
+        base_div = soup.select_one(JOB_DETAILS_CSS)
+        if base_div is None:
+            return None
+        
+        excluded_texts = []
+        for element in soup.select("div button"):
+            text = element.get_text(" ", strip=True)
+            if text in string.punctuation:
+                # Skip punctuation-only texts
+                continue
+            excluded_texts.append(text)
+        
+        full_text = base_div.get_text("\n", strip=True)
+        if not full_text:
+            return None
+        
+        cleaned_text = full_text
+        for text_to_exclude in excluded_texts:
+            cleaned_text = cleaned_text.replace(text_to_exclude, "")
+        
+        section = base_div.find("section", recursive=False)
+        h2 = section.find("h2", recursive=False) if section else None
+        if h2 is None:
+            return {
+                "structure_found": False,
+                "original_text": full_text,
+                "cleaned_text": cleaned_text,
+                "excluded_sections": excluded_texts
+            }
+        
+        p = section.find("p", recursive=False)
+        return {
+            "structure_found": True,
+            "original_text": full_text,
+            "cleaned_text": cleaned_text,
+            "h2_text": h2.get_text(" ", strip=True),
+            "p_text": p.get_text(" ", strip=True) if p else None,
+            "excluded_sections": excluded_texts
+        }
     
     def _get_all_serp_cards(self, driver):
         """Extract all job cards from search results"""
@@ -198,6 +366,12 @@ class HelloWorkScraper(BaseScraper):
                 EC.presence_of_element_located((By.CSS_SELECTOR, '[data-cy="serpCard"]'))
             )
             
+            # Fast path: read every card in a single round trip
+            results = self.extract_cards_js(driver, SERP_CARDS_SCRIPT)
+            if results is not None:
+                print(f"Extracted {len(results)} SERP cards with script")
+                return results
+            
             # Find all elements with data-cy="serpCard"
             card_elements = driver.find_elements(By.CSS_SELECTOR, '[data-cy="serpCard"]')
             
@@ -0,0 +1,73 @@
+import json
+import threading
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import HTTP_TIMEOUT, HTTP_POOL_SIZE, HTTP_USER_AGENT
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _load_cookie_jar(session, cookies_path):
+    """Copy cookies saved by Selenium into a requests session"""
+    cookies_path = Path(cookies_path)
+    if not cookies_path.exists():
+        return 0
+
+    try:
+        cookies = json.loads(cookies_path.read_text(encoding='utf-8'))
+    except Exception as e:
+        print(f"Failed to read cookies from {cookies_path}: {e}")
+        return 0
+
+    for cookie in cookies:
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain"),
+            path=cookie.get("path", "/")
+        )
+    return len(cookies)
+
+
+def get_http_session(site, cookies_path):
+    """
+    Return the process-wide keep-alive session for a site
+
+    Args:
+        site (str): Site key, one session is shared per site
+        cookies_path (Path): Selenium cookie file to authenticate with
+
+    Returns:
+        requests.Session: Session with pooled connections and saved cookies
+    """
+    with _sessions_lock:
+        if site not in _sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "User-Agent": HTTP_USER_AGENT,
+                "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.8",
+            })
+            loaded = _load_cookie_jar(session, cookies_path)
+            print(f"Loaded {loaded} cookies into HTTP session for {site}")
+            _sessions[site] = session
+        return _sessions[site]
+
+
+def fetch_html(session, url):
+    """Fetch a page and return its HTML, or None if it could not be retrieved"""
+    try:
+        response = session.get(url, timeout=HTTP_TIMEOUT)
+        if response.status_code != 200:
+            print(f"HTTP fast path got status {response.status_code} for {url}")
+            return None
+        return response.text
+    except requests.RequestException as e:
+        print(f"HTTP fast path failed for {url}: {e}")
+        return None
@@ -0,0 +1,85 @@
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from config import JOB_CACHE_PATH, JOB_CACHE_TTL, JOB_CACHE_MAX_ENTRIES
+from utils.disk_cache import DiskCache
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"q", "o", "from", "ref", "gclid", "fbclid"}
+
+
+def canonical_url(url):
+    """Normalize a job posting URL so that the same posting always maps to the same key"""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in TRACKING_PARAMS and not name.startswith("utm_")
+    )
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip("/") or "/",
+        urlencode(query),
+        ""
+    ))
+
+
+class JobCache:
+    """On-disk cache of job card metadata and full job details keyed by canonical URL"""
+
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        self.cache = DiskCache(
+            path or JOB_CACHE_PATH,
+            ttl=ttl or JOB_CACHE_TTL,
+            max_entries=max_entries or JOB_CACHE_MAX_ENTRIES
+        )
+
+    def get_details(self, url, allow_stale=False):
+        """Return the cached details of a job posting, or None"""
+        if not url:
+            return None
+        return self.cache.get(f"details:{canonical_url(url)}", allow_stale=allow_stale)
+
+    def lookup_details(self, url):
+        """Return the cached details of a job posting and whether they are fresh, or (None, False)"""
+        if not url:
+            return None, False
+        return self.cache.lookup(f"details:{canonical_url(url)}")
+
+    def record_stale(self, served):
+        """Report whether stale details from lookup_details were served or fetched again"""
+        self.cache.record_stale(served)
+
+    def put_details(self, url, details):
+        """Store the details of a job posting as returned by get_job_details"""
+        if url and details:
+            self.cache.set(f"details:{canonical_url(url)}", details)
+
+    def get_card(self, url):
+        """Return the cached search card of a job posting, or None"""
+        if not url:
+            return None
+        return self.cache.get(f"card:{canonical_url(url)}")
+
+    def put_cards(self, cards):
+        """Store search result cards by their link"""
+        for card in cards:
+            if card.get("link"):
+                self.cache.set(f"card:{canonical_url(card['link'])}", card)
+
+    def stats(self):
+        """Return hit/miss counts and the cache size"""
+        return self.cache.stats()
+
+
+_job_cache = None
+_job_cache_lock = threading.Lock()
+
+
+def get_job_cache():
+    """Return the process-wide job cache shared by all Streamlit sessions"""
+    global _job_cache
+    with _job_cache_lock:
+        if _job_cache is None:
+            _job_cache = JobCache()
+        return _job_cache
@@ -0,0 +1,78 @@
+import time
+import importlib
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from config import MULTI_SOURCE_TIMEOUT
+
+# Job sources by display name: (module, scraper class). The scraper modules
+# import selenium, requests and BeautifulSoup, so they load on first use.
+SOURCES = {
+    "HelloWork": ("scrapers.hellowork", "HelloWorkScraper"),
+    "Welcome to the Jungle": ("scrapers.wttj", "WTTJScraper"),
+}
+
+ALL_SOURCES = "All sources"
+
+
+def scraper_class(source):
+    """Return the scraper class of a source, or None if it is not supported"""
+    if source not in SOURCES:
+        return None
+    module_name, class_name = SOURCES[source]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def search_all_sources(keywords, location, job_type=None, page=1, sources=None, timeout=None):
+    """
+    Search several job sites concurrently and merge their results
+
+    Each site runs in its own thread (and leases from its own driver pool),
+    so the search takes as long as the slowest site rather than the sum.
+    Sites that fail or do not answer within the timeout are reported and
+    left out, the results of the others are still returned.
+
+    Args:
+        keywords (str): Job keywords to search for
+        location (str): Location to search in
+        job_type (str, optional): Type of job (e.g., internship, full-time)
+        page (int): Results page to fetch on every site
+        sources (list, optional): Source names to query, all of SOURCES by default
+        timeout (float, optional): Seconds to wait for the sites
+
+    Returns:
+        tuple: (jobs, errors) where each job dictionary has a "source" key and
+            errors maps each failed source to an error message
+    """
+    sources = sources or list(SOURCES)
+    timeout = timeout or MULTI_SOURCE_TIMEOUT
+    jobs = []
+    errors = {}
+
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="search")
+    start = time.perf_counter()
+    futures = {
+        executor.submit(scraper_class(source)().search_jobs, keywords, location, job_type, page=page): source
+        for source in sources
+    }
+    done, not_done = wait(futures, timeout=timeout)
+    # Do not block on a site that timed out, its thread finishes in the background
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    for future in futures:
+        source = futures[future]
+        if future in not_done:
+            errors[source] = f"timed out after {timeout}s"
+            continue
+        try:
+            results = future.result() or []
+        except Exception as e:
+            errors[source] = str(e)
+            continue
+        for job in results:
+            job["source"] = source
+        jobs.extend(results)
+
+    for source, error in errors.items():
+        print(f"Error searching {source}: {error}")
+    print(f"Searched {len(sources)} sources in {time.perf_counter() - start:.1f}s, found {len(jobs)} jobs")
+    return jobs, errors
@@ -0,0 +1,93 @@
+import threading
+from collections import defaultdict, deque
+
+
+class WaitRecorder:
+    """Record how long each kind of readiness wait actually took"""
+
+    def __init__(self, max_samples=500):
+        self.max_samples = max_samples
+        self._durations = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self._timeouts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, label, duration, timed_out=False):
+        """Store the duration in seconds of one wait"""
+        with self._lock:
+            self._durations[label].append(duration)
+            if timed_out:
+                self._timeouts[label] += 1
+
+    def summary(self):
+        """
+        Summarize recorded waits per label
+
+        Returns:
+            dict: label -> count, timeouts, mean, p95 and max duration in seconds
+        """
+        with self._lock:
+            samples = {label: sorted(durations) for label, durations in self._durations.items()}
+            timeouts = dict(self._timeouts)
+
+        result = {}
+        for label, durations in samples.items():
+            if not durations:
+                continue
+            p95_index = min(len(durations) - 1, int(round(0.95 * (len(durations) - 1))))
+            result[label] = {
+                "count": len(durations),
+                "timeouts": timeouts.get(label, 0),
+                "mean": sum(durations) / len(durations),
+                "p95": durations[p95_index],
+                "max": durations[-1],
+            }
+        return result
+
+    def reset(self):
+        """Forget all recorded waits"""
+        with self._lock:
+            self._durations.clear()
+            self._timeouts.clear()
+
+
+# Process-wide recorder shared by all scrapers
+wait_stats = WaitRecorder()
+
+
+def document_ready(driver):
+    """Condition: the document has finished loading"""
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def element_present(locator):
+    """Condition: at least one element matches the (By, value) locator"""
+    def condition(driver):
+        return len(driver.find_elements(*locator)) > 0
+    return condition
+
+
+def network_idle(idle_time=0.5):
+    """Condition: no new resource has been fetched for idle_time seconds"""
+    state = {"count": None, "since": None}
+
+    def condition(driver):
+        count, now = driver.execute_script(
+            "return [performance.getEntriesByType('resource').length, performance.now()]"
+        )
+        if count != state["count"]:
+            state["count"] = count
+            state["since"] = now
+            return False
+        return (now - state["since"]) >= idle_time * 1000
+    return condition
+
+
+def section_expanded(element, collapsed_text="Voir plus"):
+    """Condition: a 'see more' toggle has been consumed, hidden or relabelled"""
+    def condition(driver):
+        try:
+            return not element.is_displayed() or collapsed_text not in element.text
+        except Exception:
+            # A stale toggle means the section was re-rendered expanded
+            return True
+    return condition
@@ -6,19 +6,50 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 
 import time
 import os
 
 from .base import BaseScraper
-from config import SELENIUM_TIMEOUT, SELENIUM_WAIT_TIME, HEADLESS_BROWSER, COOKIES_PATH
+from .waits import section_expanded
+from config import SELENIUM_TIMEOUT, HEADLESS_BROWSER, COOKIES_PATH
 from config import WTTJ_LOGIN_EMAIL, WTTJ_LOGIN_PASSWORD
 
+WTTJ_URL = "https://www.welcometothejungle.com"
+
+
+# Extracts every job card with the same selectors as the Selenium path,
+# skipping cards where one of them is missing
+JOB_CARDS_SCRIPT = """
+return Array.from(document.querySelectorAll('[data-role="jobs:thumb"]')).map(function (card) {
+    var title = card.querySelector('h4.wui-text div[role="mark"]');
+    var company = card.querySelector('span.wui-text');
+    var location = card.querySelector('p.wui-text span span');
+    var link = card.querySelector('a[href*="/jobs/"]');
+    if (!title || !company || !location || !link) {
+        return null;
+    }
+    return {
+        title: title.innerText,
+        company: company.innerText,
+        location: location.innerText,
+        link: link.href,
+        text: null
+    };
+}).filter(function (card) { return card !== null; });
+"""
+
 
 class WTTJScraper(BaseScraper):
     """Scraper for Welcome to the Jungle job site"""
     
+    site = "wttj"
+    origin = WTTJ_URL
+    
+    # Readiness markers for search result and job detail pages
+    JOB_CARD_LOCATOR = (By.CSS_SELECTOR, '[data-role="jobs:thumb"]')
+    JOB_DETAILS_LOCATOR = (By.CSS_SELECTOR, '[id="the-position-section"]')
+    
     def _accept_cookies(self, driver):
         """Accept cookies if the prompt appears"""
         try:
@@ -115,7 +146,8 @@ class WTTJScraper(BaseScraper):
             
             # Navigate to the new URL
             driver.get(new_url)
-            time.sleep(SELENIUM_WAIT_TIME)
+            self.wait_for_page_ready(driver, self.JOB_CARD_LOCATOR, "search_results")
+            self.capture_driver_page(driver, new_url, "search")
             return True
         except Exception as e:
             print(f"Error navigating to page {page_number}: {e}")
@@ -165,7 +197,7 @@ class WTTJScraper(BaseScraper):
                         try:
                             # Scroll to the element to make sure it's in view
                             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                            time.sleep(1)  # Give time for the page to settle
+                            self.wait_for(driver, EC.element_to_be_clickable(element), "voir_plus_clickable")
                             
                             # Click the element
                             element.click()
@@ -174,8 +206,8 @@ class WTTJScraper(BaseScraper):
                             found_new = True
                             print(f"Clicked 'Voir Plus' button #{buttons_clicked}")
                             
-                            # Wait for content to load
-                            time.sleep(2)
+                            # Wait for the section to expand
+                            self.wait_for(driver, section_expanded(element), "section_expanded")
                         except Exception as e:
                             print(f"Error clicking button: {e}")
                 
@@ -201,7 +233,7 @@ class WTTJScraper(BaseScraper):
         - all_pages: whether to fetch all pages up to max_pages (default: False)
         - max_pages: maximum number of pages to fetch when all_pages is True (default: 3)
         """
-        driver = self.setup_driver()
+        driver = self.acquire_driver()
         if not driver:
             return []
             
@@ -213,7 +245,7 @@ class WTTJScraper(BaseScraper):
             formatted_location = location.split(",")[0].strip() if "," in location else location
             
             # Create the search URL and navigate to it
-            base_url = "https://www.welcometothejungle.com/fr/jobs"
+            base_url = f"{WTTJ_URL}/fr/jobs"
             query_param = f"?query={keywords.replace(' ', '%20')}"
             location_param = f"&aroundQuery={formatted_location.replace(' ', '%20')}"
             radius_param = "&aroundRadius=20"
@@ -229,8 +261,11 @@ class WTTJScraper(BaseScraper):
             search_url = f"{base_url}{query_param}{location_param}{radius_param}{page_param}{country_param}{contract_param}"
             
             # Navigate to search URL
-            driver.get(search_url)
-            time.sleep(SELENIUM_WAIT_TIME)
+            driver.get(self.page_url(search_url))
+            self.wait_for_page_ready(driver, self.JOB_CARD_LOCATOR, "search_results")
+            self.capture_driver_page(driver, search_url, "search", {
+                "keywords": keywords, "location": location, "job_type": job_type, "page": page
+            })
             
             # Initialize results list
             all_results = []
@@ -267,7 +302,7 @@ class WTTJScraper(BaseScraper):
             print(f"Error searching jobs: {e}")
             return []
         finally:
-            driver.quit()
+            self.release_driver(driver)
     
     def _get_all_job_cards(self, driver):
         """Extract all job cards from search results"""
@@ -277,6 +312,12 @@ class WTTJScraper(BaseScraper):
                 EC.presence_of_element_located((By.CSS_SELECTOR, '[data-role="jobs:thumb"]'))
             )
             
+            # Fast path: read every card in a single round trip
+            results = self.extract_cards_js(driver, JOB_CARDS_SCRIPT)
+            if results is not None:
+                print(f"Extracted {len(results)} job cards with script")
+                return results
+            
             # Find all job card elements
             card_elements = driver.find_elements(By.CSS_SELECTOR, '[data-role="jobs:thumb"]')
             
@@ -328,18 +369,19 @@ class WTTJScraper(BaseScraper):
             print(f"Error retrieving job cards: {e}")
             return []
     
-    def get_job_details(self, url):
-        """Get detailed information about a specific job"""
-        driver = self.setup_driver()
+    def _fetch_job_details(self, url):
+        """Scrape detailed information about a specific job"""
+        driver = self.acquire_driver()
         if not driver:
             return None
             
         try:
-            driver.get(url)
-            time.sleep(SELENIUM_WAIT_TIME)
+            driver.get(self.page_url(url))
+            self.wait_for_page_ready(driver, self.JOB_DETAILS_LOCATOR, "job_details")
             
             # Click on any "Voir Plus" buttons to expand content
             self.click_all_voir_plus_buttons(driver)
+            self.capture_driver_page(driver, url, "detail")
             
             # Extract job details
             job_text = self._extract_job_details(driver)
@@ -352,7 +394,7 @@ class WTTJScraper(BaseScraper):
             print(f"Error getting job details: {e}")
             return None
         finally:
-            driver.quit()
+            self.release_driver(driver)
     
     def _extract_job_details(self, driver):
         """Extract detailed job information from the job page"""
@@ -1,20 +1,45 @@
 import os
-from openai import OpenAI
+import time
+import asyncio
 
-from config import DEFAULT_MODEL
+from config import DEFAULT_MODEL, LLM_CONCURRENCY, LLM_REQUEST_TIMEOUT
+from models.analysis import JobAnalysis
+from .llm_cache import get_llm_cache, make_key
+from .streaming import stream_output_text
+from .prompts import build_messages
+from .usage_stats import usage_stats
+from .token_budget import prepare_inputs
+from .scheduler import get_scheduler, estimate_tokens
+from .openai_client import get_openai_client, create_async_openai_client
 
 class JobResumeAnalyzer:
     """Analyze the match between a resume and a job description"""
     
-    def __init__(self, model=None):
-        self.client = OpenAI()
+    def __init__(self, model=None, client=None):
+        # Without an explicit client, the shared pooled client is looked up per call
+        self._client = client
         self.model = model or DEFAULT_MODEL
+        self.scheduler = get_scheduler()
         
-        # Load prompt template
+        # Load prompt templates
         self.prompt_template = self._load_prompt_template()
+        self.structured_prompt_template = self._load_structured_prompt_template()
+    
+    @property
+    def client(self):
+        """OpenAI client used for blocking and streaming calls"""
+        return self._client or get_openai_client()
     
     def _load_prompt_template(self):
         """Load the prompt template for analysis"""
+        return self._load_instructions() + self._load_markdown_format()
+    
+    def _load_structured_prompt_template(self):
+        """Load the prompt template for analysis with JSON output"""
+        return self._load_instructions() + self._load_structured_format()
+    
+    def _load_instructions(self):
+        """Load the role and process instructions shared by every output format"""
         return """
 You are an expert Resume-Job Matching Specialist with years of experience in HR and recruitment. Your task is to analyze the match between a candidate's resume and a job description.
 INPUT
@@ -63,7 +88,11 @@ Make a clear recommendation about suitability for the position
 
 
 
-OUTPUT FORMAT
+"""
+    
+    def _load_markdown_format(self):
+        """Load the free-form markdown output format"""
+        return """OUTPUT FORMAT
 Present your analysis in clearly organized sections:
 ## Skills Extraction
 Resume Skills:
@@ -89,33 +118,217 @@ Skills Gaps:
 
 ## Summary Assessment
 [3-5 sentence qualitative assessment explaining match quality and recommendation]
-INPUT VARIABLES
-Job description: {job_description}
-Resume: {resume}
 """
     
-    def analyze(self, resume, job_description):
+    def _load_structured_format(self):
+        """Load the output instructions for the JSON schema mode"""
+        return """OUTPUT FORMAT
+Return your analysis as JSON matching the provided schema:
+- resume_hard_skills, resume_soft_skills: skills extracted from the resume
+- required_skills, preferred_skills: skills extracted from the job description
+- direct_matches, transferable_skills, skills_gaps: results of the matching analysis
+- match_score: overall score from 0 to 100 following the rubric
+- score_breakdown: one entry per category (technical skills, experience, education, ...) with its 0-100 score and a short explanation
+- summary: the 3-5 sentence qualitative assessment and recommendation
+"""
+    
+    def analyze(self, resume, job_description, bypass_cache=False):
         """
         Analyze the match between a resume and a job description
         
         Args:
             resume (str): The candidate's resume text
             job_description (str): The job description text
+            bypass_cache (bool): Skip the response cache lookup and overwrite
+                the cached analysis with a fresh one
             
         Returns:
             str: Analysis of the match
         """
-        prompt = self.prompt_template.format(
-            resume=resume,
-            job_description=job_description
-        )
+        resume, job_description = prepare_inputs(self.model, resume, job_description, "analysis")
+        llm_cache = get_llm_cache()
+        cache_key = self._cache_key(resume, job_description)
+        if not bypass_cache:
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        prompt = self._build_input(self.prompt_template, resume, job_description)
         
         try:
-            response = self.client.responses.create(
-                model=self.model,
-                input=prompt
+            start = time.perf_counter()
+            response = self.scheduler.call(
+                lambda: self.client.responses.create(model=self.model, input=prompt),
+                estimate_tokens(self.model, prompt)
             )
+            usage_stats.record_call("analysis", response, time.perf_counter() - start)
+            llm_cache.set(cache_key, response.output_text)
             return response.output_text
         except Exception as e:
             print(f"Error analyzing resume and job: {e}")
-            return f"Error analyzing resume and job: {e}"
\ No newline at end of file
+            return f"Error analyzing resume and job: {e}"
+    
+    def analyze_structured(self, resume, job_description, bypass_cache=False):
+        """
+        Analyze the match between a resume and a job description as validated JSON
+        
+        Args:
+            resume (str): The candidate's resume text
+            job_description (str): The job description text
+            bypass_cache (bool): Skip the response cache lookup
+            
+        Returns:
+            JobAnalysis: Parsed analysis with a numeric match score, or None on error
+        """
+        resume, job_description = prepare_inputs(self.model, resume, job_description, "analysis")
+        llm_cache = get_llm_cache()
+        cache_key = self._structured_cache_key(resume, job_description)
+        if not bypass_cache:
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                return JobAnalysis.model_validate(cached)
+        
+        prompt = self._build_input(self.structured_prompt_template, resume, job_description)
+        
+        try:
+            start = time.perf_counter()
+            response = self.scheduler.call(
+                lambda: self.client.responses.parse(model=self.model, input=prompt, text_format=JobAnalysis),
+                estimate_tokens(self.model, prompt)
+            )
+            usage_stats.record_call("analysis", response, time.perf_counter() - start)
+            analysis = response.output_parsed
+            llm_cache.set(cache_key, analysis.model_dump())
+            return analysis
+        except Exception as e:
+            print(f"Error analyzing resume and job: {e}")
+            return None
+    
+    def stream_analyze(self, resume, job_description, bypass_cache=False):
+        """
+        Analyze the match between a resume and a job description, streaming the output
+        
+        Args:
+            resume (str): The candidate's resume text
+            job_description (str): The job description text
+            bypass_cache (bool): Skip the response cache lookup
+            
+        Yields:
+            str: Chunks of the analysis as they are generated
+        """
+        resume, job_description = prepare_inputs(self.model, resume, job_description, "analysis")
+        llm_cache = get_llm_cache()
+        cache_key = self._cache_key(resume, job_description)
+        if not bypass_cache:
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        
+        prompt = self._build_input(self.prompt_template, resume, job_description)
+        
+        try:
+            start = time.perf_counter()
+            analysis = ""
+            for delta in stream_output_text(
+                self.client, self.model, prompt,
+                on_completed=lambda response: usage_stats.record_call(
+                    "analysis", response, time.perf_counter() - start
+                )
+            ):
+                analysis += delta
+                yield delta
+            llm_cache.set(cache_key, analysis)
+        except Exception as e:
+            print(f"Error analyzing resume and job: {e}")
+            yield f"Error analyzing resume and job: {e}"
+    
+    async def analyze_many(self, resume, job_descriptions, concurrency=None, timeout=None, structured=False):
+        """
+        Analyze one resume against many job descriptions concurrently
+        
+        Args:
+            resume (str): The candidate's resume text
+            job_descriptions (list): Job description texts
+            concurrency (int, optional): Maximum number of requests in flight
+            timeout (float, optional): Seconds allowed per request
+            structured (bool): Return JobAnalysis objects (None on error)
+                instead of markdown strings
+            
+        Returns:
+            list: Analyses in the same order as job_descriptions
+        """
+        semaphore = asyncio.Semaphore(concurrency or LLM_CONCURRENCY)
+        timeout = timeout or LLM_REQUEST_TIMEOUT
+        
+        async with create_async_openai_client() as client:
+            return await asyncio.gather(*[
+                self._analyze_async(client, semaphore, timeout, resume, job_description, structured)
+                for job_description in job_descriptions
+            ])
+    
+    async def _analyze_async(self, client, semaphore, timeout, resume, job_description, structured=False):
+        """Analyze a single job within analyze_many"""
+        resume, job_description = prepare_inputs(self.model, resume, job_description, "analysis")
+        llm_cache = get_llm_cache()
+        if structured:
+            cache_key = self._structured_cache_key(resume, job_description)
+            template = self.structured_prompt_template
+        else:
+            cache_key = self._cache_key(resume, job_description)
+            template = self.prompt_template
+        
+        # The cache is SQLite on disk, keep its I/O off the event loop
+        cached = await asyncio.to_thread(llm_cache.get, cache_key)
+        if cached is not None:
+            return JobAnalysis.model_validate(cached) if structured else cached
+        
+        prompt = self._build_input(template, resume, job_description)
+        tokens = estimate_tokens(self.model, prompt)
+        
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                if structured:
+                    response = await self.scheduler.acall(
+                        lambda: asyncio.wait_for(
+                            client.responses.parse(model=self.model, input=prompt, text_format=JobAnalysis),
+                            timeout
+                        ),
+                        tokens
+                    )
+                    usage_stats.record_call("analysis", response, time.perf_counter() - start)
+                    analysis = response.output_parsed
+                    await asyncio.to_thread(llm_cache.set, cache_key, analysis.model_dump())
+                    return analysis
+                
+                response = await self.scheduler.acall(
+                    lambda: asyncio.wait_for(client.responses.create(model=self.model, input=prompt), timeout),
+                    tokens
+                )
+                usage_stats.record_call("analysis", response, time.perf_counter() - start)
+                await asyncio.to_thread(llm_cache.set, cache_key, response.output_text)
+                return response.output_text
+            except asyncio.TimeoutError:
+                error = f"Error analyzing resume and job: timed out after {timeout}s"
+            except Exception as e:
+                error = f"Error analyzing resume and job: {e}"
+            
+            print(error)
+            return None if structured else error
+    
+    def _build_input(self, template, resume, job_description):
+        """Build the input messages: instructions, then resume, then job description"""
+        return build_messages(
+            template,
+            candidate_sections=[("Resume", resume)],
+            job_sections=[("Job description", job_description)]
+        )
+    
+    def _cache_key(self, resume, job_description):
+        """Key of an analysis in the response cache"""
+        return make_key("analyze", self.model, self.prompt_template, resume, job_description)
+    
+    def _structured_cache_key(self, resume, job_description):
+        """Key of a structured analysis in the response cache"""
+        return make_key("analyze_structured", self.model, self.structured_prompt_template, resume, job_description)
\ No newline at end of file
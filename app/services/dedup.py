@@ -0,0 +1,202 @@
+import re
+import zlib
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+
+from config import DEDUP_SIMILARITY_THRESHOLD, DEDUP_SHINGLE_SIZE, DEDUP_NUM_PERM, DEDUP_LSH_BANDS
+
+# Gender markers that French job titles append in many spellings: (H/F), F/H, H/F/X...
+GENDER_MARKER_RE = re.compile(r"\(?\b[hfx](?:\s*/\s*[hfx]){1,2}\b\)?")
+NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+COMPANY_SUFFIXES = {"sa", "sas", "sasu", "sarl", "group", "groupe", "inc", "ltd", "gmbh"}
+
+# Hash functions h(x) = (a * x + b) mod p of the MinHash signatures
+MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, MERSENNE_PRIME, size=DEDUP_NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, MERSENNE_PRIME, size=DEDUP_NUM_PERM, dtype=np.uint64)
+
+
+def normalize(text):
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    if not isinstance(text, str):
+        return ""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return NON_WORD_RE.sub(" ", text).strip()
+
+
+def job_key(job):
+    """
+    Normalized (title, company, city) key of a job card
+
+    Returns:
+        tuple: The key, or None when the card has no title or no company
+    """
+    title = job.get("title")
+    title = normalize(GENDER_MARKER_RE.sub(" ", title.lower()) if isinstance(title, str) else "")
+    if not title:
+        return None
+
+    company = " ".join(word for word in normalize(job.get("company")).split() if word not in COMPANY_SUFFIXES)
+    if not company:
+        # Same title and city alone would merge offers of unrelated employers
+        return None
+
+    # "Paris 75001", "Paris - 75" and "Paris, Ile-de-France" are the same city
+    location = job.get("location")
+    location = re.split(r",| - |\(", location)[0] if isinstance(location, str) else ""
+    location = " ".join(word for word in normalize(location).split() if not word.isdigit())
+
+    return title, company, location
+
+
+def shingles(text, size=DEDUP_SHINGLE_SIZE):
+    """Hashes of the word shingles of a text, as an array of integers"""
+    words = normalize(text).split()
+    if len(words) < size:
+        return np.array([], dtype=np.uint64)
+    hashes = {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes)) % MERSENNE_PRIME
+
+
+def minhash(shingle_hashes):
+    """MinHash signature of a set of shingle hashes"""
+    values = (np.outer(shingle_hashes, _PERM_A) + _PERM_B) % MERSENNE_PRIME
+    return values.min(axis=0)
+
+
+def _find(parents, item):
+    while parents[item] != item:
+        parents[item] = parents[parents[item]]
+        item = parents[item]
+    return item
+
+
+def _union(parents, first, second):
+    # The earlier row stays the root so clusters are named after their first posting
+    first, second = _find(parents, first), _find(parents, second)
+    if first != second:
+        parents[max(first, second)] = min(first, second)
+
+
+def find_duplicates(jobs, threshold=None):
+    """
+    Cluster near-duplicate job postings
+
+    Postings are merged when their normalized title, company and city are
+    equal, or when their descriptions are near duplicates. Descriptions are
+    compared with MinHash signatures bucketed by LSH bands, so only postings
+    sharing a bucket are compared instead of every pair.
+
+    Args:
+        jobs (list): Job dictionaries with title, company, location and optional text
+        threshold (float, optional): Estimated Jaccard similarity of descriptions
+            above which postings are duplicates
+
+    Returns:
+        list: Cluster number of each job, the position of the first job of its cluster
+    """
+    threshold = threshold or DEDUP_SIMILARITY_THRESHOLD
+    parents = list(range(len(jobs)))
+
+    first_with_key = {}
+    for position, job in enumerate(jobs):
+        key = job_key(job)
+        if key is None:
+            continue
+        if key in first_with_key:
+            _union(parents, first_with_key[key], position)
+        else:
+            first_with_key[key] = position
+
+    signatures = {}
+    for position, job in enumerate(jobs):
+        shingle_hashes = shingles(job.get("text"))
+        if len(shingle_hashes):
+            signatures[position] = minhash(shingle_hashes)
+
+    rows = DEDUP_NUM_PERM // DEDUP_LSH_BANDS
+    buckets = defaultdict(list)
+    for position, signature in signatures.items():
+        for band in range(DEDUP_LSH_BANDS):
+            buckets[(band, signature[band * rows:(band + 1) * rows].tobytes())].append(position)
+
+    compared = set()
+    for members in buckets.values():
+        for i, first in enumerate(members):
+            for second in members[i + 1:]:
+                if (first, second) in compared:
+                    continue
+                compared.add((first, second))
+                # The share of equal MinHash values estimates the Jaccard similarity
+                if np.mean(signatures[first] == signatures[second]) >= threshold:
+                    _union(parents, first, second)
+
+    return [_find(parents, position) for position in range(len(jobs))]
+
+
+def dedup_jobs(jobs_df, threshold=None, keep_representatives=True):
+    """
+    Mark the near-duplicate postings of a results table
+
+    Adds a cluster column (shared by the copies of a posting), cluster_size
+    and is_representative. The representative of a cluster is its first row
+    with a description, or its first row, so ranked tables keep their best
+    copy. When the table was clustered before, a row that already
+    represented its cluster keeps doing so, so re-clustering after new
+    descriptions arrive does not move the analysis to another copy. Rows are
+    kept in place so duplicates can still be displayed.
+
+    Args:
+        jobs_df (DataFrame): Jobs with title, company, location and optional text columns
+        threshold (float, optional): Description similarity threshold
+        keep_representatives (bool): Prefer the previous representatives, set
+            to False to pick them again, e.g. after ranking
+
+    Returns:
+        DataFrame: jobs_df with the cluster columns (original index kept)
+    """
+    if jobs_df.empty:
+        return jobs_df
+
+    records = jobs_df.to_dict("records")
+    clusters = find_duplicates(records, threshold)
+    if keep_representatives and "is_representative" in jobs_df.columns:
+        previous = jobs_df["is_representative"].fillna(False).astype(bool).tolist()
+    else:
+        previous = [False] * len(records)
+
+    def preference(position):
+        # Lower is better: previous representatives first, then rows with a description
+        return (not previous[position], not isinstance(records[position].get("text"), str))
+
+    representatives = {}
+    for position, cluster in enumerate(clusters):
+        current = representatives.get(cluster)
+        if current is None or preference(position) < preference(current):
+            representatives[cluster] = position
+
+    sizes = defaultdict(int)
+    for cluster in clusters:
+        sizes[cluster] += 1
+
+    deduped = jobs_df.assign(
+        cluster=clusters,
+        cluster_size=[sizes[cluster] for cluster in clusters],
+        is_representative=[representatives[cluster] == position for position, cluster in enumerate(clusters)]
+    )
+    merged = len(jobs_df) - len(representatives)
+    if merged:
+        print(f"Found {merged} duplicate postings in {len(jobs_df)} jobs")
+    return deduped
+
+
+def cluster_members(jobs_df, index):
+    """Return the other rows of the cluster of a row, or an empty DataFrame"""
+    if "cluster" not in jobs_df.columns:
+        return jobs_df.iloc[0:0]
+    cluster = jobs_df.loc[index, "cluster"]
+    return jobs_df[(jobs_df["cluster"] == cluster) & (jobs_df.index != index)]
@@ -1,19 +1,51 @@
 import os
-from openai import OpenAI
-
-from config import DEFAULT_MODEL
+import re
+import time
+import asyncio
+
+from config import DEFAULT_MODEL, LLM_CONCURRENCY, LLM_REQUEST_TIMEOUT, COVER_LETTER_STRATEGY, COVER_LETTER_STRATEGIES
+from .llm_cache import get_llm_cache, make_key
+from .streaming import stream_output_text
+from .usage_stats import usage_stats, response_usage
+from .prompts import build_messages
+from .token_budget import prepare_inputs
+from .scheduler import get_scheduler, estimate_tokens
+from .openai_client import get_openai_client, create_async_openai_client
+
+# Cover letter pipelines, from cheapest to most thorough:
+# - single: one writer pass
+# - write_review: writer, reviewer, then a revision that continues the draft's
+#   conversation instead of resending the resume and job description
+# - full: writer, reviewer, then a second writer pass from scratch
+STRATEGIES = COVER_LETTER_STRATEGIES
+
+REVISION_PROMPT = """Revise your cover letter following the review below. Keep every constraint of your original instructions and return only the revised cover letter.
+
+Review:
+{review}
+"""
 
 class CoverLetterGenerator:
     """Generate cover letters based on resume, job description, and analysis"""
     
-    def __init__(self, model=None):
-        self.client = OpenAI()
+    def __init__(self, model=None, strategy=None, client=None):
+        # Without an explicit client, the shared pooled client is looked up per call
+        self._client = client
         self.model = model or DEFAULT_MODEL
+        self.scheduler = get_scheduler()
+        self.strategy = strategy or COVER_LETTER_STRATEGY
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown cover letter strategy: {self.strategy}")
         
         # Load prompt templates
         self.writer_template = self._load_writer_template()
         self.reviewer_template = self._load_reviewer_template()
     
+    @property
+    def client(self):
+        """OpenAI client used for blocking and streaming calls"""
+        return self._client or get_openai_client()
+    
     def _load_writer_template(self):
         """Load the prompt template for cover letter writing"""
         return """
@@ -78,11 +110,6 @@ CONSTRAINTS
 - No overly formal phrases like "I wish to apply" or "Please find attached"
 - No mentions of the cover letter being AI-generated
 
-INPUT VARIABLES
-Job description: {job_description}
-Resume: {resume}
-Match analysis: {analysis}
-Additional candidate info: {extra_information}
 """
     
     def _load_reviewer_template(self):
@@ -156,13 +183,13 @@ Provide your review in these clear sections:
 
 ## Final Recommendations
 [3-5 bullet points summarizing the most important changes to make]
-INPUT VARIABLES
-Job description: {job_description}
-Resume: {resume}
-Cover letter: {cover_letter}
+
+## Verdict
+[APPROVED if the letter needs no substantive changes, otherwise REVISE]
 """
     
-    def generate(self, resume, job_description, analysis, extra_information=""):
+    def generate(self, resume, job_description, analysis, extra_information="", bypass_cache=False,
+                 return_stats=False):
         """
         Generate a cover letter based on resume, job description, and analysis
         
@@ -171,51 +198,262 @@ Cover letter: {cover_letter}
             job_description (str): The job description text
             analysis (str): The job-resume match analysis
             extra_information (str): Additional candidate information
+            bypass_cache (bool): Skip the response cache lookup and overwrite
+                the cached letter with a fresh one, as for "Regenerate"
+            return_stats (bool): Also return the timing and token usage of the run
             
         Returns:
-            str: Generated cover letter
+            str: Generated cover letter, or (cover_letter, run) with return_stats,
+                where run is None for a cached letter or a failed run
         """
-        # Generate initial cover letter
-        prompt = self.writer_template.format(
-            resume=resume,
-            job_description=job_description,
-            analysis=analysis,
-            extra_information=extra_information
-        )
+        resume, job_description = prepare_inputs(self.model, resume, job_description, "cover_letter")
+        llm_cache = get_llm_cache()
+        cache_key = self._cache_key(resume, job_description, analysis, extra_information)
+        if not bypass_cache:
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                return (cached, None) if return_stats else cached
         
+        run = self._start_run()
+        plan = self._plan(resume, job_description, analysis, extra_information)
         try:
-            response = self.client.responses.create(
-                model=self.model,
-                input=prompt
-            )
-            cover_letter = response.output_text
-            
-            # Review and improve the cover letter
-            review_prompt = self.reviewer_template.format(
-                resume=resume,
-                job_description=job_description,
-                cover_letter=cover_letter
-            )
-            
-            review_response = self.client.responses.create(
-                model=self.model,
-                input=review_prompt
-            )
-            
-            # Generate final cover letter based on the review
-            final_prompt = self.writer_template.format(
-                resume=resume,
-                job_description=job_description,
-                analysis=review_response.output_text,
-                extra_information=extra_information
-            )
-            
-            final_response = self.client.responses.create(
-                model=self.model,
-                input=final_prompt
-            )
+            result = None
+            while True:
+                stage, request = plan.send(result)
+                start = time.perf_counter()
+                response = self.scheduler.call(
+                    lambda: self.client.responses.create(model=self.model, **request),
+                    estimate_tokens(self.model, request["input"])
+                )
+                self._record_call(run, stage, response, time.perf_counter() - start)
+                result = (response.output_text, response.id)
+        except StopIteration as stop:
+            cover_letter = stop.value
+        except Exception as e:
+            print(f"Error generating cover letter: {e}")
+            error = f"Error generating cover letter: {e}"
+            return (error, None) if return_stats else error
+        
+        self._finish_run(run)
+        llm_cache.set(cache_key, cover_letter)
+        return (cover_letter, run) if return_stats else cover_letter
+    
+    def stream_generate(self, resume, job_description, analysis, extra_information="", bypass_cache=False):
+        """
+        Run the same pipeline as generate, streaming each stage as it is written
+        
+        Args:
+            resume (str): The candidate's resume text
+            job_description (str): The job description text
+            analysis (str): The job-resume match analysis
+            extra_information (str): Additional candidate information
+            bypass_cache (bool): Skip the response cache lookup
             
-            return final_response.output_text
+        Yields:
+            tuple: (stage, text) chunks, where stage is "draft", "review" or "final",
+                then ("stats", run) with the timing and token usage of the run
+                unless the letter came from the cache
+        """
+        resume, job_description = prepare_inputs(self.model, resume, job_description, "cover_letter")
+        llm_cache = get_llm_cache()
+        cache_key = self._cache_key(resume, job_description, analysis, extra_information)
+        if not bypass_cache:
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                yield "final", cached
+                return
+        
+        run = self._start_run()
+        plan = self._plan(resume, job_description, analysis, extra_information)
+        try:
+            result = None
+            while True:
+                stage, request = plan.send(result)
+                result = yield from self._stream_stage(run, stage, request)
+        except StopIteration as stop:
+            cover_letter = stop.value
         except Exception as e:
             print(f"Error generating cover letter: {e}")
-            return f"Error generating cover letter: {e}"
\ No newline at end of file
+            yield "final", f"Error generating cover letter: {e}"
+            return
+        
+        if run["stages"][-1] != "final":
+            # The reviewer approved the draft, which becomes the final letter
+            yield "final", cover_letter
+        
+        self._finish_run(run)
+        llm_cache.set(cache_key, cover_letter)
+        yield "stats", run
+    
+    def _stream_stage(self, run, stage, request):
+        """Stream one stage of the pipeline and return its (text, response id)"""
+        request = dict(request)
+        prompt = request.pop("input")
+        completed = {}
+        start = time.perf_counter()
+        
+        text = ""
+        for delta in stream_output_text(
+            self.client, self.model, prompt,
+            on_completed=lambda response: completed.setdefault("response", response),
+            **request
+        ):
+            text += delta
+            yield stage, delta
+        
+        response = completed.get("response")
+        self._record_call(run, stage, response, time.perf_counter() - start)
+        return text, getattr(response, "id", None)
+    
+    async def generate_many(self, resume, jobs, extra_information="", concurrency=None, timeout=None):
+        """
+        Generate cover letters for many jobs concurrently
+        
+        Args:
+            resume (str): The candidate's resume text
+            jobs (list): (job_description, analysis) pairs
+            extra_information (str): Additional candidate information
+            concurrency (int, optional): Maximum number of cover letters in progress
+            timeout (float, optional): Seconds allowed per request
+            
+        Returns:
+            list: Cover letters in the same order as jobs
+        """
+        semaphore = asyncio.Semaphore(concurrency or LLM_CONCURRENCY)
+        timeout = timeout or LLM_REQUEST_TIMEOUT
+        
+        async with create_async_openai_client() as client:
+            return await asyncio.gather(*[
+                self._generate_async(client, semaphore, timeout, resume, job_description, analysis, extra_information)
+                for job_description, analysis in jobs
+            ])
+    
+    async def _generate_async(self, client, semaphore, timeout, resume, job_description, analysis, extra_information):
+        """Generate a single cover letter within generate_many"""
+        resume, job_description = prepare_inputs(self.model, resume, job_description, "cover_letter")
+        llm_cache = get_llm_cache()
+        cache_key = self._cache_key(resume, job_description, analysis, extra_information)
+        # The cache is SQLite on disk, keep its I/O off the event loop
+        cached = await asyncio.to_thread(llm_cache.get, cache_key)
+        if cached is not None:
+            return cached
+        
+        async with semaphore:
+            run = self._start_run()
+            plan = self._plan(resume, job_description, analysis, extra_information)
+            try:
+                result = None
+                while True:
+                    stage, request = plan.send(result)
+                    start = time.perf_counter()
+                    response = await self.scheduler.acall(
+                        lambda: asyncio.wait_for(client.responses.create(model=self.model, **request), timeout),
+                        estimate_tokens(self.model, request["input"])
+                    )
+                    self._record_call(run, stage, response, time.perf_counter() - start)
+                    result = (response.output_text, response.id)
+            except StopIteration as stop:
+                cover_letter = stop.value
+            except asyncio.TimeoutError:
+                print(f"Error generating cover letter: timed out after {timeout}s")
+                return f"Error generating cover letter: timed out after {timeout}s"
+            except Exception as e:
+                print(f"Error generating cover letter: {e}")
+                return f"Error generating cover letter: {e}"
+        
+        self._finish_run(run)
+        await asyncio.to_thread(llm_cache.set, cache_key, cover_letter)
+        return cover_letter
+    
+    def _plan(self, resume, job_description, analysis, extra_information):
+        """
+        Describe the API calls of the selected strategy
+        
+        A generator shared by the sync, streaming and async runners: it yields
+        (stage, request parameters), receives (output text, response id) back
+        and returns the final cover letter.
+        """
+        draft_stage = "final" if self.strategy == "single" else "draft"
+        cover_letter, draft_id = yield draft_stage, {"input": self._writer_input(
+            resume, job_description, analysis, extra_information
+        )}
+        
+        if self.strategy == "single":
+            return cover_letter
+        
+        review, _ = yield "review", {"input": self._reviewer_input(
+            resume, job_description, cover_letter
+        )}
+        
+        # Early exit: nothing substantive to fix
+        if self._is_approved(review):
+            return cover_letter
+        
+        if self.strategy == "write_review" and draft_id:
+            # Continue the draft's conversation, the model already has the inputs
+            final_cover_letter, _ = yield "final", {
+                "input": REVISION_PROMPT.format(review=review),
+                "previous_response_id": draft_id
+            }
+        else:
+            final_cover_letter, _ = yield "final", {"input": self._writer_input(
+                resume, job_description, review, extra_information
+            )}
+        
+        return final_cover_letter
+    
+    def _writer_input(self, resume, job_description, analysis, extra_information):
+        """Build the writer messages, candidate-level inputs before job-level ones"""
+        return build_messages(
+            self.writer_template,
+            candidate_sections=[("Resume", resume), ("Additional candidate info", extra_information)],
+            job_sections=[("Job description", job_description), ("Match analysis", analysis)]
+        )
+    
+    def _reviewer_input(self, resume, job_description, cover_letter):
+        """Build the reviewer messages, candidate-level inputs before job-level ones"""
+        return build_messages(
+            self.reviewer_template,
+            candidate_sections=[("Resume", resume)],
+            job_sections=[("Job description", job_description), ("Cover letter", cover_letter)]
+        )
+    
+    def _is_approved(self, review):
+        """Check whether the reviewer found no substantive issues"""
+        verdict = re.search(r"##\s*Verdict\s*\W*(APPROVED|REVISE)", review or "", re.IGNORECASE)
+        return bool(verdict) and verdict.group(1).upper() == "APPROVED"
+    
+    def _start_run(self):
+        """Start collecting timing and token usage for one pipeline run"""
+        return {
+            "strategy": self.strategy,
+            "stages": [],
+            "stage_seconds": [],
+            "seconds": 0.0,
+            "input_tokens": 0,
+            "cached_tokens": 0,
+            "output_tokens": 0,
+            "start": time.perf_counter(),
+        }
+    
+    def _record_call(self, run, stage, response, seconds):
+        """Add one API call to the run and the process-wide usage stats"""
+        usage_stats.record_call(f"cover_letter:{self.strategy}", response, seconds)
+        input_tokens, cached_tokens, output_tokens = response_usage(response)
+        run["stages"].append(stage)
+        run["stage_seconds"].append(seconds)
+        run["input_tokens"] += input_tokens
+        run["cached_tokens"] += cached_tokens
+        run["output_tokens"] += output_tokens
+    
+    def _finish_run(self, run):
+        """Close a run and count it in the process-wide usage stats"""
+        run["seconds"] = time.perf_counter() - run.pop("start")
+        usage_stats.record_run(f"cover_letter:{self.strategy}")
+    
+    def _cache_key(self, resume, job_description, analysis, extra_information):
+        """Key of a cover letter in the response cache"""
+        return make_key(
+            "generate", self.model, self.strategy, self.writer_template, self.reviewer_template,
+            resume, job_description, analysis, extra_information
+        )
\ No newline at end of file
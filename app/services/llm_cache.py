@@ -0,0 +1,49 @@
+import hashlib
+import json
+import threading
+
+from config import LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_MAX_BYTES, LLM_BACKEND
+from utils.disk_cache import DiskCache
+
+
+def make_key(*parts):
+    """Hash the inputs of an LLM call into a content-addressed cache key"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Disk cache of LLM outputs keyed by a hash of everything that shapes them"""
+
+    def __init__(self, path=None, max_bytes=None, enabled=None):
+        # Mock outputs must never be served in place of real ones
+        self.enabled = (LLM_CACHE_ENABLED and LLM_BACKEND != "mock") if enabled is None else enabled
+        self.cache = DiskCache(path or LLM_CACHE_PATH, max_bytes=max_bytes or LLM_CACHE_MAX_BYTES)
+
+    def get(self, key):
+        """Return the cached output for a key, or None"""
+        if not self.enabled:
+            return None
+        return self.cache.get(key)
+
+    def set(self, key, output):
+        """Store an output under a key"""
+        if self.enabled:
+            self.cache.set(key, output)
+
+    def stats(self):
+        """Return hit/miss counts and the cache size"""
+        return self.cache.stats()
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Return the process-wide LLM response cache"""
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache()
+        return _llm_cache
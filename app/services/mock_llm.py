@@ -0,0 +1,166 @@
+import re
+import time
+import asyncio
+import itertools
+import threading
+from collections import deque
+from types import SimpleNamespace
+
+import httpx
+import openai
+
+from .token_budget import count_tokens
+
+MOCK_URL = "https://mock.invalid/v1/responses"
+
+
+def rate_limit_error(retry_after=1.0):
+    """Build the 429 error the API raises when a rate limit is hit"""
+    request = httpx.Request("POST", MOCK_URL)
+    response = httpx.Response(429, headers={"retry-after": f"{retry_after:.3f}"}, request=request)
+    return openai.RateLimitError("Rate limit reached (mock)", response=response, body=None)
+
+
+def server_error():
+    """Build the error the API raises on a 500"""
+    request = httpx.Request("POST", MOCK_URL)
+    response = httpx.Response(500, request=request)
+    return openai.InternalServerError("Internal server error (mock)", response=response, body=None)
+
+
+def timeout_error():
+    """Build the error the client raises when a request times out"""
+    return openai.APITimeoutError(request=httpx.Request("POST", MOCK_URL))
+
+
+FAILURES = {
+    "rate_limit": rate_limit_error,
+    "server_error": server_error,
+    "timeout": timeout_error,
+}
+
+
+class MockLLM:
+    """
+    Offline stand-in for the OpenAI client's Responses API
+
+    Supports responses.create (plain and stream=True) and responses.parse,
+    with a fixed latency, scripted failures and an optional requests/minute
+    limit that answers with 429 and Retry-After like the real API. Every call
+    is appended to `calls` for inspection.
+
+    Args:
+        output_text (str): Text of every response
+        latency (float): Seconds each call takes
+        failures (list): Errors raised by the first calls, in order: exceptions
+            or "rate_limit", "server_error", "timeout"
+        requests_per_minute (int, optional): Limit above which calls get a 429
+        parsed: Object returned as output_parsed by responses.parse
+    """
+
+    def __init__(self, output_text="Mock response", latency=0.0, failures=None, requests_per_minute=None, parsed=None):
+        self.output_text = output_text
+        self.latency = latency
+        self.failures = deque(failures or [])
+        self.requests_per_minute = requests_per_minute
+        self.parsed = parsed
+        self.calls = []
+        self.responses = _MockResponses(self)
+        self._ids = itertools.count(1)
+        self._accepted = deque()
+        self._lock = threading.Lock()
+
+    def _respond(self, kwargs):
+        """Record a call and return its response, or raise the scripted error"""
+        with self._lock:
+            self.calls.append(kwargs)
+            if self.failures:
+                failure = self.failures.popleft()
+                raise FAILURES[failure]() if isinstance(failure, str) else failure
+
+            if self.requests_per_minute:
+                now = time.monotonic()
+                while self._accepted and now - self._accepted[0] >= 60:
+                    self._accepted.popleft()
+                if len(self._accepted) >= self.requests_per_minute:
+                    raise rate_limit_error(60 - (now - self._accepted[0]))
+                self._accepted.append(now)
+
+            response_id = f"resp_mock_{next(self._ids)}"
+
+        prompt = kwargs.get("input", "")
+        if not isinstance(prompt, str):
+            prompt = "\n".join(message.get("content", "") for message in prompt)
+        model = kwargs.get("model", "")
+        return SimpleNamespace(
+            id=response_id,
+            output_text=self.output_text,
+            output_parsed=self.parsed,
+            usage=SimpleNamespace(
+                input_tokens=count_tokens(prompt, model),
+                output_tokens=count_tokens(self.output_text, model),
+                input_tokens_details=SimpleNamespace(cached_tokens=0)
+            )
+        )
+
+
+class _MockResponses:
+    """The client.responses namespace of MockLLM"""
+
+    def __init__(self, llm):
+        self.llm = llm
+
+    def create(self, **kwargs):
+        time.sleep(self.llm.latency)
+        response = self.llm._respond(kwargs)
+        if kwargs.get("stream"):
+            return _MockStream(response)
+        return response
+
+    def parse(self, **kwargs):
+        time.sleep(self.llm.latency)
+        return self.llm._respond(kwargs)
+
+
+class _MockStream:
+    """Event stream of a mock response, word by word"""
+
+    def __init__(self, response):
+        self.response = response
+
+    def __iter__(self):
+        for word in re.findall(r"\s*\S+", self.response.output_text):
+            yield SimpleNamespace(type="response.output_text.delta", delta=word)
+        yield SimpleNamespace(type="response.completed", response=self.response)
+
+    def close(self):
+        pass
+
+
+class AsyncMockLLM(MockLLM):
+    """Offline stand-in for AsyncOpenAI, see MockLLM"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.responses = _AsyncMockResponses(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class _AsyncMockResponses:
+    """The client.responses namespace of AsyncMockLLM"""
+
+    def __init__(self, llm):
+        self.llm = llm
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(self.llm.latency)
+        return self.llm._respond(kwargs)
+
+    async def parse(self, **kwargs):
+        await asyncio.sleep(self.llm.latency)
+        return self.llm._respond(kwargs)
@@ -0,0 +1,328 @@
+import os
+import json
+import time
+import asyncio
+import itertools
+
+import httpx
+
+from config import (
+    MOCK_LLM_LATENCY,
+    MOCK_LLM_TOKENS_PER_SECOND,
+    MOCK_LLM_OUTPUT_TOKENS,
+    LLM_FIXTURES_DIR,
+)
+from .llm_cache import make_key
+from .token_budget import count_tokens
+
+# Canned outputs, picked from the instructions of the request
+ANALYSIS_OUTPUT = """## Skills Extraction
+Resume Skills:
+- Python
+- Communication
+
+Job Requirements:
+- Python
+- SQL
+
+## Match Analysis
+Direct Matches:
+- Python
+
+Transferable Skills:
+- Communication
+
+Skills Gaps:
+- SQL
+
+## Match Score: 72
+- Technical skills: 75/100
+- Experience: 70/100
+
+## Summary Assessment
+"""
+REVIEW_OUTPUT = """## Overall Assessment
+The letter is relevant but generic in places.
+
+## Verdict
+REVISE
+
+"""
+FILLER_WORDS = (
+    "the candidate brings hands-on experience with data pipelines and has delivered "
+    "measurable results for teams that rely on clear communication and steady execution"
+).split()
+
+
+def _filler(tokens):
+    """Deterministic placeholder text of roughly the given number of tokens"""
+    return " ".join(FILLER_WORDS[index % len(FILLER_WORDS)] for index in range(tokens))
+
+
+def sample_from_schema(schema, definitions=None):
+    """Build a minimal value that validates against a JSON schema"""
+    definitions = definitions if definitions is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return sample_from_schema(definitions[schema["$ref"].split("/")[-1]], definitions)
+    if "anyOf" in schema:
+        return sample_from_schema(schema["anyOf"][0], definitions)
+
+    schema_type = schema.get("type")
+    if schema_type == "object":
+        return {
+            name: sample_from_schema(prop, definitions)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if schema_type == "array":
+        return [sample_from_schema(schema.get("items", {}), definitions)]
+    if schema_type == "integer":
+        return 72
+    if schema_type == "number":
+        return 0.72
+    if schema_type == "boolean":
+        return True
+    if schema_type == "null":
+        return None
+    return "mock"
+
+
+def _prompt_text(body):
+    """Concatenate the input of a Responses request"""
+    prompt = body.get("input", "")
+    if isinstance(prompt, str):
+        return prompt
+    return "\n".join(message.get("content", "") for message in prompt if isinstance(message.get("content"), str))
+
+
+def synthesize_output(body, output_tokens=None):
+    """Pick or build the output text for a Responses request"""
+    output_tokens = output_tokens or MOCK_LLM_OUTPUT_TOKENS
+    text_format = (body.get("text") or {}).get("format") or {}
+    if text_format.get("type") == "json_schema":
+        return json.dumps(sample_from_schema(text_format["schema"]))
+
+    prompt = _prompt_text(body)
+    if "Review Specialist" in prompt:
+        return REVIEW_OUTPUT + _filler(output_tokens // 3)
+    if "Matching Specialist" in prompt:
+        return ANALYSIS_OUTPUT + _filler(output_tokens // 3)
+    return _filler(output_tokens)
+
+
+def fixture_key(body):
+    """Key of a request in the fixtures directory, independent of streaming and response chaining"""
+    return make_key({name: value for name, value in body.items() if name not in ("stream", "previous_response_id")})
+
+
+def _response_text(response):
+    """Output text of a Responses API response body"""
+    return "".join(
+        content.get("text", "")
+        for item in response.get("output", [])
+        if item.get("type") == "message"
+        for content in item.get("content", [])
+        if content.get("type") == "output_text"
+    )
+
+
+class MockResponsesTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    httpx transport that answers the Responses endpoint locally
+
+    Plugged into the OpenAI client, it lets the real SDK code paths (plain,
+    streamed and structured calls) run offline. Replies are replayed from
+    recorded fixtures when one matches the request, otherwise synthesized.
+    Timing follows a time-to-first-token latency plus an output throughput.
+
+    Args:
+        latency (float): Seconds before the first token
+        tokens_per_second (float): Output throughput
+        output_tokens (int): Length of synthesized outputs
+        fixtures_dir (str): Directory of recorded responses, see RecordingTransport
+    """
+
+    def __init__(self, latency=None, tokens_per_second=None, output_tokens=None, fixtures_dir=None):
+        self.latency = MOCK_LLM_LATENCY if latency is None else latency
+        self.tokens_per_second = tokens_per_second or MOCK_LLM_TOKENS_PER_SECOND
+        self.output_tokens = output_tokens or MOCK_LLM_OUTPUT_TOKENS
+        self.fixtures_dir = fixtures_dir or LLM_FIXTURES_DIR
+        self._ids = itertools.count(1)
+
+    def handle_request(self, request):
+        response, delay = self._respond(request)
+        time.sleep(delay)
+        return response
+
+    async def handle_async_request(self, request):
+        response, delay = self._respond(request)
+        await asyncio.sleep(delay)
+        return response
+
+    def _respond(self, request):
+        """Build the response to a request and how long to wait before returning it"""
+        if request.method != "POST" or not request.url.path.endswith("/responses"):
+            error = {"error": {"message": f"Not supported by the mock: {request.method} {request.url.path}"}}
+            return httpx.Response(404, json=error, request=request), 0.0
+
+        body = json.loads(request.content or b"{}")
+        response = self._load_fixture(body) or self._synthesize(body)
+        response["id"] = f"resp_mock_{next(self._ids)}"
+
+        text = _response_text(response)
+        chunks = text.split(" ")
+        model = body.get("model", "")
+        chunk_delay = count_tokens(text, model) / len(chunks) / self.tokens_per_second
+        token_delays = [chunk_delay] * len(chunks)
+
+        if not body.get("stream"):
+            return httpx.Response(200, json=response, request=request), self.latency + sum(token_delays)
+
+        events = [{"type": "response.created", "response": {**response, "status": "in_progress", "output": []}}]
+        for index, chunk in enumerate(chunks):
+            events.append({
+                "type": "response.output_text.delta",
+                "item_id": "msg_mock",
+                "output_index": 0,
+                "content_index": 0,
+                "delta": chunk if index == 0 else " " + chunk,
+            })
+        events.append({"type": "response.completed", "response": response})
+
+        # Created right away, the first delta after the latency, then one delta per token interval
+        token_delays[0] += self.latency
+        stream = _EventStream(events, [0.0] + token_delays + [0.0])
+        headers = {"content-type": "text/event-stream"}
+        return httpx.Response(200, headers=headers, stream=stream, request=request), 0.0
+
+    def _load_fixture(self, body):
+        path = os.path.join(self.fixtures_dir, f"{fixture_key(body)}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _synthesize(self, body):
+        text = synthesize_output(body, self.output_tokens)
+        model = body.get("model", "")
+        input_tokens = count_tokens(_prompt_text(body), model)
+        output_tokens = count_tokens(text, model)
+        return {
+            "id": "",
+            "object": "response",
+            "created_at": int(time.time()),
+            "model": model,
+            "status": "completed",
+            "error": None,
+            "incomplete_details": None,
+            "instructions": None,
+            "metadata": {},
+            "parallel_tool_calls": True,
+            "previous_response_id": body.get("previous_response_id"),
+            "temperature": 1.0,
+            "tool_choice": "auto",
+            "tools": [],
+            "top_p": 1.0,
+            "output": [{
+                "type": "message",
+                "id": "msg_mock",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }],
+            "usage": {
+                "input_tokens": input_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens": output_tokens,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": input_tokens + output_tokens,
+            },
+        }
+
+
+class _EventStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Server-sent events written out with a delay before each one"""
+
+    def __init__(self, events, delays):
+        self.events = events
+        self.delays = delays
+
+    def _encode(self, event):
+        return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8")
+
+    def __iter__(self):
+        for event, delay in zip(self.events, self.delays):
+            time.sleep(delay)
+            yield self._encode(event)
+
+    async def __aiter__(self):
+        for event, delay in zip(self.events, self.delays):
+            await asyncio.sleep(delay)
+            yield self._encode(event)
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    httpx transport that forwards to OpenAI and saves each Responses reply as a fixture
+
+    Streamed replies are buffered while recording, the completed response
+    is stored the same way as a plain one.
+
+    Args:
+        transport: The real transport (httpx.HTTPTransport or AsyncHTTPTransport)
+        fixtures_dir (str): Directory the fixtures are written to
+    """
+
+    def __init__(self, transport, fixtures_dir=None):
+        self.transport = transport
+        self.fixtures_dir = fixtures_dir or LLM_FIXTURES_DIR
+
+    def handle_request(self, request):
+        response = self.transport.handle_request(request)
+        if not self._is_recordable(request, response):
+            return response
+        response = httpx.Response(response.status_code, headers=response.headers, stream=response.stream, request=request)
+        response.read()
+        return self._record(request, response)
+
+    async def handle_async_request(self, request):
+        response = await self.transport.handle_async_request(request)
+        if not self._is_recordable(request, response):
+            return response
+        response = httpx.Response(response.status_code, headers=response.headers, stream=response.stream, request=request)
+        await response.aread()
+        return self._record(request, response)
+
+    def close(self):
+        self.transport.close()
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+    def _is_recordable(self, request, response):
+        return request.method == "POST" and request.url.path.endswith("/responses") and response.status_code == 200
+
+    def _record(self, request, response):
+        """Save the reply and hand back a copy the SDK can still read"""
+        body = json.loads(request.content or b"{}")
+        if body.get("stream"):
+            completed = None
+            for line in response.text.splitlines():
+                if line.startswith("data:"):
+                    event = json.loads(line[len("data:"):])
+                    if event.get("type") == "response.completed":
+                        completed = event["response"]
+        else:
+            completed = response.json()
+
+        if completed is not None:
+            os.makedirs(self.fixtures_dir, exist_ok=True)
+            path = os.path.join(self.fixtures_dir, f"{fixture_key(body)}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(completed, f, ensure_ascii=False, indent=2)
+
+        # The content is already decoded, drop the headers that describe the wire format
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        }
+        return httpx.Response(response.status_code, headers=headers, content=response.content, request=request)
@@ -0,0 +1,110 @@
+import os
+import threading
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
+
+from config import (
+    LLM_BACKEND,
+    LLM_REQUEST_TIMEOUT,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    OPENAI_KEEPALIVE_EXPIRY,
+    OPENAI_CONNECT_TIMEOUT,
+)
+from .mock_transport import MockResponsesTransport, RecordingTransport
+
+BACKENDS = ("openai", "mock", "record")
+
+
+def _limits():
+    """Connection limits of the OpenAI HTTP pools"""
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY
+    )
+
+
+def _timeout():
+    return httpx.Timeout(LLM_REQUEST_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT)
+
+
+def _check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {backend}")
+
+
+def create_http_client(backend=None):
+    """Create the httpx client of a backend: the real API, the offline mock or the recorder"""
+    backend = backend or LLM_BACKEND
+    _check_backend(backend)
+    if backend == "mock":
+        return httpx.Client(transport=MockResponsesTransport(), timeout=_timeout())
+    if backend == "record":
+        return httpx.Client(transport=RecordingTransport(httpx.HTTPTransport(limits=_limits())), timeout=_timeout())
+    return httpx.Client(limits=_limits(), timeout=_timeout())
+
+
+def _api_key(backend):
+    # The mock accepts any key, so it also runs without one
+    return os.getenv("OPENAI_API_KEY") or ("mock" if backend == "mock" else None)
+
+
+def create_openai_client(backend=None, http_client=None):
+    """
+    Create an OpenAI client on its own pool, e.g. for a benchmark
+
+    Args:
+        backend (str, optional): "openai", "mock" or "record", LLM_BACKEND by default
+        http_client (httpx.Client, optional): Pool to use instead of a new one
+    """
+    backend = backend or LLM_BACKEND
+    return OpenAI(
+        api_key=_api_key(backend),
+        http_client=http_client or create_http_client(backend),
+        max_retries=0
+    )
+
+
+_http_client = None
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_openai_client():
+    """
+    Return the process-wide OpenAI client
+
+    All clients share one keep-alive httpx pool, so calls reuse open TLS
+    connections instead of handshaking again. A new client (on the same pool)
+    is only made when the API key changes, e.g. from the Settings page.
+    Retries are left to the shared request scheduler.
+    """
+    global _http_client
+    api_key = _api_key(LLM_BACKEND)
+    with _clients_lock:
+        if _http_client is None:
+            _http_client = create_http_client()
+        if api_key not in _clients:
+            _clients[api_key] = create_openai_client(http_client=_http_client)
+        return _clients[api_key]
+
+
+def create_async_openai_client(backend=None):
+    """
+    Create an AsyncOpenAI client with the same pool settings
+
+    Async connections are bound to the event loop that opened them, so each
+    bulk run creates its own client and closes it with `async with`.
+    """
+    backend = backend or LLM_BACKEND
+    _check_backend(backend)
+    if backend == "mock":
+        http_client = httpx.AsyncClient(transport=MockResponsesTransport(), timeout=_timeout())
+    elif backend == "record":
+        transport = RecordingTransport(httpx.AsyncHTTPTransport(limits=_limits()))
+        http_client = httpx.AsyncClient(transport=transport, timeout=_timeout())
+    else:
+        http_client = httpx.AsyncClient(limits=_limits(), timeout=_timeout())
+    return AsyncOpenAI(api_key=_api_key(backend), http_client=http_client, max_retries=0)
@@ -0,0 +1,197 @@
+import time
+import queue
+import threading
+
+from config import PIPELINE_QUEUE_SIZE
+
+# Marks the end of the items in a queue
+_DONE = object()
+
+
+class Stage:
+    """
+    One step of a Pipeline, a function applied to every item by worker threads
+
+    The function returns the item for the next stage, or None to drop it
+    (after recording why, e.g. in a checkpoint). An exception drops the
+    item and is reported in the errors of the run.
+    """
+
+    def __init__(self, name, function, workers=1, queue_size=None):
+        """
+        Args:
+            name (str): Stage name used in the statistics
+            function (callable): Called with each item
+            workers (int): Items processed at once
+            queue_size (int, optional): Items waiting for this stage before the
+                previous one blocks, PIPELINE_QUEUE_SIZE by default
+        """
+        self.name = name
+        self.function = function
+        self.workers = workers
+        self.queue_size = queue_size or PIPELINE_QUEUE_SIZE
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.processed = 0
+            self.dropped = 0
+            self.failed = 0
+            self.busy_seconds = 0.0
+            self.blocked_seconds = 0.0
+            self.started_at = None
+            self.finished_at = None
+
+    def _record(self, seconds, outcome):
+        with self._lock:
+            self.busy_seconds += seconds
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def _record_blocked(self, seconds):
+        with self._lock:
+            self.blocked_seconds += seconds
+
+    def stats(self):
+        """
+        Return the throughput counters of the stage
+
+        Returns:
+            dict: Items processed, dropped and failed, items per second while
+                the stage was active, worker utilization and the seconds spent
+                blocked on a full downstream queue (backpressure)
+        """
+        with self._lock:
+            elapsed = (self.finished_at or time.perf_counter()) - self.started_at if self.started_at else 0.0
+            return {
+                "stage": self.name,
+                "workers": self.workers,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "items_per_second": round(self.processed / elapsed, 2) if elapsed else 0.0,
+                "utilization": round(self.busy_seconds / (elapsed * self.workers), 2) if elapsed else 0.0,
+                "blocked_seconds": round(self.blocked_seconds, 2),
+            }
+
+
+class Pipeline:
+    """
+    Stream items through stages connected by bounded queues
+
+    Each item moves to the next stage as soon as a stage is done with it, so
+    the stages overlap (pages are scraped while earlier jobs are with the
+    LLM). A stage that falls behind fills its input queue, which blocks the
+    stages before it instead of letting their output pile up in memory.
+    """
+
+    def __init__(self, stages, source_name="source"):
+        """
+        Args:
+            stages (list): Stage objects, in order
+            source_name (str): Name of the stage producing the items
+        """
+        self.stages = stages
+        self.source = Stage(source_name, None)
+
+    def run(self, items):
+        """
+        Process every item
+
+        Args:
+            items (iterable): Items, or a generator producing them while the
+                pipeline runs
+
+        Returns:
+            tuple: (results, errors) with the items that went through every
+                stage and (stage name, item, error message) for each failure
+        """
+        queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        results = []
+        errors = []
+        threads = []
+        alive = [stage.workers for stage in self.stages]
+        alive_lock = threading.Lock()
+
+        for stage in [self.source] + self.stages:
+            stage.reset_stats()
+            stage.started_at = time.perf_counter()
+
+        for position, stage in enumerate(self.stages):
+            outbox = queues[position + 1] if position + 1 < len(self.stages) else None
+            for worker in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(stage, position, queues[position], outbox, results, errors, alive, alive_lock),
+                    name=f"pipeline-{stage.name}-{worker}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        self._feed(items, queues[0] if queues else None, results, errors)
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def _feed(self, items, outbox, results, errors):
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            except Exception as e:
+                print(f"Error in pipeline stage {self.source.name}: {e}")
+                errors.append((self.source.name, None, str(e)))
+                break
+            self.source._record(time.perf_counter() - start, "processed")
+            self._put(self.source, outbox, item, results)
+
+        self.source.finished_at = time.perf_counter()
+        if outbox is not None:
+            outbox.put(_DONE)
+
+    def _work(self, stage, position, inbox, outbox, results, errors, alive, alive_lock):
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                # Let the other workers of the stage see the end too
+                inbox.put(_DONE)
+                break
+
+            start = time.perf_counter()
+            try:
+                result = stage.function(item)
+            except Exception as e:
+                stage._record(time.perf_counter() - start, "failed")
+                print(f"Error in pipeline stage {stage.name}: {e}")
+                errors.append((stage.name, item, str(e)))
+                continue
+
+            if result is None:
+                stage._record(time.perf_counter() - start, "dropped")
+                continue
+            stage._record(time.perf_counter() - start, "processed")
+            self._put(stage, outbox, result, results)
+
+        with alive_lock:
+            alive[position] -= 1
+            last = alive[position] == 0
+        if last:
+            stage.finished_at = time.perf_counter()
+            if outbox is not None:
+                outbox.put(_DONE)
+
+    def _put(self, stage, outbox, item, results):
+        if outbox is None:
+            results.append(item)
+            return
+        start = time.perf_counter()
+        outbox.put(item)
+        stage._record_blocked(time.perf_counter() - start)
+
+    def stats(self):
+        """Return the counters of every stage, the source first"""
+        return [stage.stats() for stage in [self.source] + self.stages]
@@ -0,0 +1,22 @@
+def build_messages(instructions, candidate_sections, job_sections):
+    """
+    Lay out a prompt as a message array with the most stable content first
+
+    Provider-side prompt caching reuses the longest identical prefix of a
+    request. Static instructions come first, then what is identical for every
+    job of one candidate (resume, extra information), then the job-specific
+    inputs, so bulk runs for the same candidate share a cached prefix.
+
+    Args:
+        instructions (str): Static system instructions
+        candidate_sections (list): (label, text) pairs that only depend on the candidate
+        job_sections (list): (label, text) pairs that change with every job or call
+
+    Returns:
+        list: Responses API input messages
+    """
+    messages = [{"role": "system", "content": instructions.strip()}]
+    for label, text in list(candidate_sections) + list(job_sections):
+        if text:
+            messages.append({"role": "user", "content": f"{label}:\n{text}"})
+    return messages
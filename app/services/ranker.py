@@ -0,0 +1,54 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Card fields used when a job's description has not been scraped yet
+CARD_COLUMNS = ["title", "company", "location"]
+
+
+def _job_documents(jobs_df):
+    """Build one text per job from its card fields and description"""
+    documents = None
+    for column in CARD_COLUMNS + ["text"]:
+        if column in jobs_df.columns:
+            values = jobs_df[column].fillna("").astype(str)
+            documents = values if documents is None else documents + " " + values
+    return documents.tolist() if documents is not None else [""] * len(jobs_df)
+
+
+def score_jobs(jobs_df, resume):
+    """
+    Score every job against a resume without calling an LLM
+
+    The jobs and the resume are embedded with TF-IDF (rows are L2-normalized,
+    so a sparse dot product gives the cosine similarity).
+
+    Args:
+        jobs_df (DataFrame): Jobs with title, company, location and text columns
+        resume (str): The candidate's resume text, None before one is provided
+
+    Returns:
+        ndarray: Similarity scores between 0 and 100, aligned with jobs_df rows
+    """
+    if jobs_df.empty or not (resume or "").strip():
+        return np.zeros(len(jobs_df))
+
+    vectorizer = TfidfVectorizer(
+        strip_accents="unicode",
+        sublinear_tf=True,
+        dtype=np.float32
+    )
+    try:
+        matrix = vectorizer.fit_transform(_job_documents(jobs_df) + [resume])
+    except ValueError:
+        # Every document was empty or made only of stop characters
+        return np.zeros(len(jobs_df))
+
+    job_matrix, resume_vector = matrix[:-1], matrix[-1]
+    similarities = (job_matrix @ resume_vector.T).toarray().ravel()
+    return np.round(similarities.astype(np.float64) * 100, 1)
+
+
+def rank_jobs(jobs_df, resume):
+    """Return jobs_df with a score column, best matches first (original index kept)"""
+    ranked = jobs_df.assign(score=score_jobs(jobs_df, resume))
+    return ranked.sort_values("score", ascending=False, kind="stable")
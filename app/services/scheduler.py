@@ -0,0 +1,264 @@
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from config import (
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_OUTPUT_TOKENS_ESTIMATE,
+    LLM_MAX_ATTEMPTS,
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX,
+)
+from .token_budget import count_tokens
+from .usage_stats import response_usage
+
+
+def is_retryable(error):
+    """Tell transient API failures (rate limits, timeouts, 5xx) from permanent ones"""
+    # Imported here so the scheduler (and its stats on the Settings page) loads without openai
+    import openai
+    if isinstance(error, openai.RateLimitError):
+        # An exhausted quota does not recover by waiting
+        return getattr(error, "code", None) != "insufficient_quota"
+    return isinstance(error, (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+        asyncio.TimeoutError,
+    ))
+
+
+def retry_after(error):
+    """Return the delay in seconds requested by the Retry-After headers of an error, or None"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        # HTTP-date form
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(model, prompt):
+    """Estimate the tokens a call will consume: its input plus a reserve for the output"""
+    if isinstance(prompt, str):
+        input_tokens = count_tokens(prompt, model)
+    else:
+        input_tokens = sum(count_tokens(message.get("content", ""), model) for message in prompt)
+    return input_tokens + LLM_OUTPUT_TOKENS_ESTIMATE
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount):
+        """
+        Take tokens from the bucket, going into debt if it runs short
+
+        Returns:
+            float: Seconds to wait before the reserved tokens may be used
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # A single oversized call would otherwise never fit
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+    def refund(self, amount):
+        """Give back tokens that were reserved but not used (negative to take more)"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RequestScheduler:
+    """
+    Rate-limit and retry OpenAI calls shared by all services
+
+    Every call first reserves one request and its estimated tokens from the
+    requests/minute and tokens/minute buckets, sleeping until they are
+    available. Transient failures are retried with jittered exponential
+    backoff; when the API sends Retry-After, that delay is used instead and
+    every caller pauses until it has passed.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, max_attempts=None,
+                 backoff_base=None, backoff_max=None):
+        self.requests = TokenBucket(requests_per_minute or LLM_REQUESTS_PER_MINUTE)
+        self.tokens = TokenBucket(tokens_per_minute or LLM_TOKENS_PER_MINUTE)
+        self.max_attempts = max_attempts or LLM_MAX_ATTEMPTS
+        self.backoff = wait_random_exponential(
+            multiplier=backoff_base or LLM_BACKOFF_BASE,
+            max=backoff_max or LLM_BACKOFF_MAX
+        )
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"attempts": 0, "retries": 0, "rate_limited": 0, "failures": 0, "throttled_seconds": 0.0}
+
+    def call(self, request, tokens=0):
+        """
+        Run a blocking API call under the rate limits, retrying transient failures
+
+        Args:
+            request (callable): Makes the API call, called once per attempt
+            tokens (int): Estimated tokens of the call, see estimate_tokens
+
+        Returns:
+            The API response
+        """
+        try:
+            for attempt in Retrying(**self._retry_options()):
+                with attempt:
+                    time.sleep(self._reserve(tokens))
+                    try:
+                        response = request()
+                    except Exception:
+                        # A failed attempt consumed no tokens
+                        self.tokens.refund(tokens)
+                        raise
+        except Exception:
+            self._count("failures")
+            raise
+        self.settle(tokens, response)
+        return response
+
+    async def acall(self, request, tokens=0):
+        """
+        Async version of call
+
+        Args:
+            request (callable): Returns the API call awaitable, called once per attempt
+            tokens (int): Estimated tokens of the call, see estimate_tokens
+
+        Returns:
+            The API response
+        """
+        try:
+            async for attempt in AsyncRetrying(**self._retry_options()):
+                with attempt:
+                    await asyncio.sleep(self._reserve(tokens))
+                    try:
+                        response = await request()
+                    except Exception:
+                        self.tokens.refund(tokens)
+                        raise
+        except Exception:
+            self._count("failures")
+            raise
+        self.settle(tokens, response)
+        return response
+
+    def stats(self):
+        """Return attempt, retry and throttling counts"""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        """Forget the recorded counts"""
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def _retry_options(self):
+        return {
+            "retry": retry_if_exception(is_retryable),
+            "wait": self._wait,
+            "stop": stop_after_attempt(self.max_attempts),
+            "before_sleep": self._before_sleep,
+            "reraise": True,
+        }
+
+    def _reserve(self, tokens):
+        """Reserve one request and its tokens, returning how long to wait first"""
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        with self._lock:
+            wait = max(wait, self._paused_until - time.monotonic())
+            self._stats["attempts"] += 1
+            if wait > 0:
+                self._stats["throttled_seconds"] += wait
+        return max(0.0, wait)
+
+    def settle(self, tokens, response):
+        """
+        Correct the token reservation of a call with the usage the API reported
+
+        call and acall settle plain responses themselves. A stream carries no
+        usage, so streaming callers settle with the completed response once
+        the stream ends.
+        """
+        input_tokens, _, output_tokens = response_usage(response)
+        if input_tokens or output_tokens:
+            self.tokens.refund(tokens - input_tokens - output_tokens)
+
+    def _wait(self, retry_state):
+        """Wait as long as Retry-After asks, or back off exponentially with jitter"""
+        delay = retry_after(retry_state.outcome.exception())
+        if delay is None:
+            return self.backoff(retry_state)
+        with self._lock:
+            # Hold back every caller, not just the one that got the 429
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    def _before_sleep(self, retry_state):
+        import openai
+        error = retry_state.outcome.exception()
+        self._count("retries")
+        if isinstance(error, openai.RateLimitError):
+            self._count("rate_limited")
+        print(
+            f"Retrying OpenAI call in {retry_state.next_action.sleep:.1f}s "
+            f"(attempt {retry_state.attempt_number}/{self.max_attempts}): {error}"
+        )
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide request scheduler"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler()
+        return _scheduler
@@ -0,0 +1,41 @@
+from .scheduler import get_scheduler, estimate_tokens
+
+
+def stream_output_text(client, model, prompt, on_completed=None, **kwargs):
+    """
+    Stream a Responses API call and yield output text as it arrives
+
+    Args:
+        client: OpenAI client
+        model (str): Model name
+        prompt: Input of the response, a string or a list of messages
+        on_completed (callable, optional): Called with the completed response,
+            which carries its id and token usage
+        **kwargs: Extra Responses API parameters (e.g. previous_response_id)
+
+    Yields:
+        str: Output text deltas
+    """
+    # Only opening the stream is retried, deltas already yielded cannot be taken back
+    scheduler = get_scheduler()
+    tokens = estimate_tokens(model, prompt)
+    stream = scheduler.call(
+        lambda: client.responses.create(model=model, input=prompt, stream=True, **kwargs),
+        tokens
+    )
+    try:
+        for event in stream:
+            if event.type == "response.output_text.delta":
+                yield event.delta
+            elif event.type == "response.completed":
+                # The stream object had no usage, the completed response does
+                scheduler.settle(tokens, event.response)
+                if on_completed:
+                    on_completed(event.response)
+            elif event.type == "response.failed":
+                error = event.response.error
+                raise RuntimeError(error.message if error else "Response failed")
+            elif event.type == "error":
+                raise RuntimeError(event.message)
+    finally:
+        stream.close()
@@ -0,0 +1,154 @@
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import TASK_WORKERS, TASK_STORE_PATH, TASK_TTL, TASK_MAX_ENTRIES
+from utils.disk_cache import DiskCache
+
+ACTIVE_STATES = ("queued", "running")
+
+# Task run by the current worker thread, for report_progress
+_current = threading.local()
+
+
+def report_progress(progress=None, message=None, partial=None):
+    """
+    Update the task running in this thread (does nothing outside of a task)
+
+    Args:
+        progress (float, optional): Completed fraction between 0 and 1
+        message (str, optional): Short status text
+        partial (str, optional): Output produced so far, e.g. streamed tokens
+    """
+    task_queue = getattr(_current, "queue", None)
+    if task_queue is None:
+        return
+    changes = {"progress": progress, "message": message, "partial": partial}
+    # Streamed output changes many times a second, only persist the rest
+    task_queue.update(
+        _current.task_id,
+        persist=progress is not None or message is not None,
+        **{name: value for name, value in changes.items() if value is not None}
+    )
+
+
+class TaskQueue:
+    """
+    Worker threads running long jobs outside of the Streamlit script
+
+    A task is a plain function returning a JSON-serializable result. Its
+    record (status, progress, message, result or error) is kept in memory
+    while the process runs and saved to disk, so it outlives reruns and
+    can still be read after the session that started it is gone.
+    """
+
+    def __init__(self, workers=None, path=None, ttl=None, max_entries=None):
+        self.store = DiskCache(
+            path or TASK_STORE_PATH,
+            ttl=ttl or TASK_TTL,
+            max_entries=max_entries or TASK_MAX_ENTRIES
+        )
+        self.ttl = ttl or TASK_TTL
+        self.executor = ThreadPoolExecutor(max_workers=workers or TASK_WORKERS, thread_name_prefix="task")
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, label, function, *args, **kwargs):
+        """
+        Queue a function call
+
+        Args:
+            kind (str): Task type, e.g. "search" or "analyze"
+            label (str): Description shown to the user
+            function (callable): Called with args and kwargs in a worker thread
+
+        Returns:
+            str: Task id
+        """
+        task_id = uuid.uuid4().hex[:12]
+        record = {
+            "id": task_id,
+            "kind": kind,
+            "label": label,
+            "status": "queued",
+            "progress": 0.0,
+            "message": None,
+            "partial": None,
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        with self._lock:
+            self._forget_expired()
+            self._tasks[task_id] = record
+        self.store.set(f"task:{task_id}", record)
+        self.executor.submit(self._run, task_id, function, args, kwargs)
+        return task_id
+
+    def _run(self, task_id, function, args, kwargs):
+        _current.queue, _current.task_id = self, task_id
+        self.update(task_id, status="running", started_at=time.time())
+        try:
+            result = function(*args, **kwargs)
+        except Exception as e:
+            print(f"Task {task_id} failed: {e}")
+            self.update(task_id, status="failed", error=str(e), partial=None, finished_at=time.time())
+        else:
+            self.update(task_id, status="done", progress=1.0, result=result, partial=None, finished_at=time.time())
+        finally:
+            _current.queue = _current.task_id = None
+
+    def update(self, task_id, persist=True, **changes):
+        """Change fields of a task record"""
+        with self._lock:
+            record = self._tasks.get(task_id)
+            if record is None:
+                return
+            record.update(changes)
+            snapshot = dict(record)
+        if persist:
+            self.store.set(f"task:{task_id}", snapshot)
+
+    def get(self, task_id):
+        """Return a copy of a task record, or None if it is unknown or expired"""
+        with self._lock:
+            record = self._tasks.get(task_id)
+            if record is not None:
+                return dict(record)
+
+        record = self.store.get(f"task:{task_id}")
+        if record is not None and record["status"] in ACTIVE_STATES:
+            # Started by a process that has stopped since
+            record.update(status="failed", error="Interrupted by an app restart")
+        return record
+
+    def _forget_expired(self):
+        # Finished tasks stay readable from the store
+        cutoff = time.time() - self.ttl
+        for task_id in [task_id for task_id, record in self._tasks.items()
+                        if record["finished_at"] and record["finished_at"] < cutoff]:
+            del self._tasks[task_id]
+
+    def stats(self):
+        """Return the number of tasks of this process in each state"""
+        with self._lock:
+            counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+            for record in self._tasks.values():
+                counts[record["status"]] += 1
+        return counts
+
+
+_task_queue = None
+_task_queue_lock = threading.Lock()
+
+
+def get_task_queue():
+    """Return the process-wide task queue"""
+    global _task_queue
+    with _task_queue_lock:
+        if _task_queue is None:
+            _task_queue = TaskQueue()
+        return _task_queue
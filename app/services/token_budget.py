@@ -0,0 +1,208 @@
+import re
+from functools import lru_cache
+
+from config import TOKEN_BUDGETS, DEFAULT_TOKEN_BUDGET
+
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to a character-based estimate
+    tiktoken = None
+
+# Lines that scrapers pick up from buttons, banners and page chrome
+BOILERPLATE_PATTERNS = [
+    r"^(postuler|candidater|je postule|postuler maintenant|apply|apply now)$",
+    r"^(voir plus|voir moins|lire la suite|afficher plus|show more|see more)$",
+    r"^(partager|sauvegarder|enregistrer|signaler cette offre|share|save)$",
+    r"^(candidature simplifi[ée]e|candidature facile|easy apply)$",
+    r"^(publi[ée]e? (le|il y a).*|mise? à jour (le|il y a).*|posted .* ago)$",
+    r"^(offres similaires|vous pourriez aussi aimer|similar jobs).*$",
+    r".*\b(nous utilisons|we use|accepter|accept)\b.{0,40}\bcookies?\b.*",
+    r"^(politique de confidentialit[ée]|privacy policy|mentions l[ée]gales)$",
+]
+BOILERPLATE_RE = re.compile("|".join(f"(?:{pattern})" for pattern in BOILERPLATE_PATTERNS), re.IGNORECASE)
+
+# Section headings by priority: requirements and missions are kept first,
+# company blurbs and perks are dropped first
+HIGH_PRIORITY_HEADINGS = re.compile(
+    r"mission|profil|comp[ée]tence|requirement|qualification|responsabilit|"
+    r"le poste|descriptif|description du poste|vos t[âa]ches|what you.ll do|"
+    r"exp[ée]rience|formation|education|skills|savoir",
+    re.IGNORECASE
+)
+LOW_PRIORITY_HEADINGS = re.compile(
+    r"entreprise|soci[ée]t[ée]|about|qui sommes|à propos|a propos|nos valeurs|"
+    r"avantages|benefits|pourquoi nous|process|d[ée]roulement|recrutement|"
+    r"loisirs|hobbies|centres d.int[ée]r[êe]t|interests",
+    re.IGNORECASE
+)
+HIGH, NORMAL, LOW = 0, 1, 2
+
+
+@lru_cache(maxsize=8)
+def _encoding(model):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        try:
+            return tiktoken.get_encoding("o200k_base")
+        except Exception:
+            return None
+
+
+def count_tokens(text, model):
+    """Count the tokens of a text for a model, or estimate them without tiktoken"""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text, tokens, model):
+    """Return the start of a text that fits in a number of tokens, cut at a word boundary when possible"""
+    if tokens <= 0 or not text:
+        return ""
+    encoding = _encoding(model)
+    if encoding is None:
+        # Inverse of the estimate in count_tokens
+        cut = text[:(tokens - 1) * 4]
+    else:
+        cut = encoding.decode(encoding.encode(text, disallowed_special=())[:tokens])
+    if len(cut) < len(text) and not text[len(cut)].isspace() and " " in cut.strip():
+        # Do not end on half a word
+        cut = cut.rstrip().rsplit(" ", 1)[0]
+    return cut.rstrip()
+
+
+def strip_boilerplate(text):
+    """Drop lines that are page chrome rather than content"""
+    lines = [line for line in text.splitlines() if not BOILERPLATE_RE.match(line.strip())]
+    return "\n".join(lines)
+
+
+def dedupe_paragraphs(text):
+    """
+    Remove repeated paragraphs, keeping their first occurrence
+
+    Only whole blank-line-separated blocks are compared, so lines that
+    legitimately repeat inside different blocks (dates, skills of two
+    resume entries) are kept.
+    """
+    seen = set()
+    paragraphs = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        key = " ".join(paragraph.lower().split())
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        paragraphs.append("\n".join(line.rstrip() for line in paragraph.strip("\n").splitlines()))
+    return "\n\n".join(paragraphs).strip()
+
+
+def _is_heading(line):
+    stripped = line.strip().rstrip(":").strip("#* ")
+    return 0 < len(stripped) <= 60 and len(stripped.split()) <= 8 and not stripped.endswith(".")
+
+
+def split_sections(text):
+    """Split a text into (priority, section text) blocks at heading-like lines"""
+    sections = []
+    current = []
+    priority = NORMAL
+
+    for line in text.splitlines():
+        if _is_heading(line) and (HIGH_PRIORITY_HEADINGS.search(line) or LOW_PRIORITY_HEADINGS.search(line)):
+            if current:
+                sections.append((priority, "\n".join(current)))
+            current = [line]
+            priority = HIGH if HIGH_PRIORITY_HEADINGS.search(line) else LOW
+        else:
+            current.append(line)
+
+    if current:
+        sections.append((priority, "\n".join(current)))
+    return sections
+
+
+def truncate_to_budget(text, budget, model):
+    """
+    Fit a text into a token budget, keeping the most important sections
+
+    Sections are admitted by priority (requirements and missions first,
+    company blurbs last) and written back in their original order. A section
+    that does not fit is skipped so smaller ones after it can still be kept,
+    then the most important skipped section is cut to fill what is left of
+    the budget, within its first line that does not fit, so text with few
+    line breaks (PDF extracts, scraped descriptions) is not lost entirely.
+    """
+    if count_tokens(text, model) <= budget:
+        return text
+
+    sections = split_sections(text)
+    order = sorted(range(len(sections)), key=lambda index: sections[index][0])
+    kept = {}
+    skipped = []
+    remaining = budget
+
+    for index in order:
+        section = sections[index][1]
+        tokens = count_tokens(section, model)
+        if tokens <= remaining:
+            kept[index] = section
+            remaining -= tokens
+        else:
+            skipped.append(index)
+
+    if skipped:
+        # Keep as many leading lines of the most important skipped section as still fit
+        lines = []
+        for line in sections[skipped[0]][1].splitlines():
+            line_tokens = count_tokens(line + "\n", model)
+            if line_tokens > remaining:
+                line = truncate_tokens(line, remaining - 1, model)
+                if line:
+                    lines.append(line)
+                break
+            lines.append(line)
+            remaining -= line_tokens
+        if lines:
+            kept[skipped[0]] = "\n".join(lines)
+
+    return "\n".join(kept[index] for index in sorted(kept))
+
+
+def fit_to_budget(text, model, field):
+    """
+    Clean a scraped text and trim it to the model's budget for a field
+
+    Args:
+        text (str): Job description or resume text
+        model (str): Model the prompt is sent to
+        field (str): "job_description" or "resume"
+
+    Returns:
+        tuple: (trimmed text, tokens before, tokens after)
+    """
+    if not text:
+        return text, 0, 0
+
+    before = count_tokens(text, model)
+    budget = TOKEN_BUDGETS.get(model, DEFAULT_TOKEN_BUDGET)[field]
+
+    trimmed = dedupe_paragraphs(strip_boilerplate(text))
+    trimmed = truncate_to_budget(trimmed, budget, model)
+    return trimmed, before, count_tokens(trimmed, model)
+
+
+def prepare_inputs(model, resume, job_description, label):
+    """Fit the resume and job description to the model's budgets and log the savings"""
+    resume, resume_before, resume_after = fit_to_budget(resume, model, "resume")
+    job_description, job_before, job_after = fit_to_budget(job_description, model, "job_description")
+    print(
+        f"Token budget [{label}]: job description {job_before} -> {job_after} tokens, "
+        f"resume {resume_before} -> {resume_after} tokens"
+    )
+    return resume, job_description
@@ -0,0 +1,66 @@
+import threading
+from collections import defaultdict
+
+USAGE_FIELDS = ["runs", "calls", "seconds", "input_tokens", "cached_tokens", "output_tokens"]
+
+
+def response_usage(response):
+    """Extract (input, cached, output) token counts from a Responses API response"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0, 0
+
+    details = getattr(usage, "input_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", 0) or 0
+    return usage.input_tokens or 0, cached_tokens, usage.output_tokens or 0
+
+
+class UsageRecorder:
+    """Accumulate latency and token usage of LLM calls per label"""
+
+    def __init__(self):
+        self._totals = defaultdict(lambda: dict.fromkeys(USAGE_FIELDS, 0))
+        self._lock = threading.Lock()
+
+    def record_call(self, label, response, seconds=0.0):
+        """Add the usage of one API response"""
+        input_tokens, cached_tokens, output_tokens = response_usage(response)
+        with self._lock:
+            totals = self._totals[label]
+            totals["calls"] += 1
+            totals["seconds"] += seconds
+            totals["input_tokens"] += input_tokens
+            totals["cached_tokens"] += cached_tokens
+            totals["output_tokens"] += output_tokens
+
+    def record_run(self, label):
+        """Count one complete run (e.g. one cover letter) under a label"""
+        with self._lock:
+            self._totals[label]["runs"] += 1
+
+    def summary(self):
+        """
+        Summarize usage per label
+
+        Returns:
+            dict: label -> totals plus per-run averages of seconds and tokens
+        """
+        with self._lock:
+            totals = {label: dict(values) for label, values in self._totals.items()}
+
+        for values in totals.values():
+            runs = values["runs"] or 1
+            values["seconds_per_run"] = values["seconds"] / runs
+            values["input_tokens_per_run"] = values["input_tokens"] / runs
+            values["output_tokens_per_run"] = values["output_tokens"] / runs
+            values["cached_ratio"] = values["cached_tokens"] / values["input_tokens"] if values["input_tokens"] else 0.0
+        return totals
+
+    def reset(self):
+        """Forget all recorded usage"""
+        with self._lock:
+            self._totals.clear()
+
+
+# Process-wide recorder shared by all services
+usage_stats = UsageRecorder()
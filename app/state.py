@@ -1,4 +1,5 @@
 import streamlit as st
+from config import COVER_LETTER_STRATEGY
 
 def initialize_session_state():
     """Initialize session state variables if they don't exist."""
@@ -14,6 +15,12 @@ def initialize_session_state():
         st.session_state.cover_letter = None
     if "extra_info" not in st.session_state:
         st.session_state.extra_info = ""
+    if "cover_letter_strategy" not in st.session_state:
+        st.session_state.cover_letter_strategy = COVER_LETTER_STRATEGY
+    if "tasks" not in st.session_state:
+        st.session_state.tasks = []  # ids of the background tasks started by this session
+    if "task_callbacks" not in st.session_state:
+        st.session_state.task_callbacks = {}  # task id -> function applying its result
 
 def update_resume_text():
     """Update the resume text from the text area."""
@@ -0,0 +1,166 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class DiskCache:
+    """SQLite-backed key/value cache shared by every session of the process and across processes"""
+
+    def __init__(self, path, ttl=None, max_entries=None, max_bytes=None):
+        """
+        Args:
+            path (str): Path of the SQLite database file
+            ttl (float, optional): Seconds after which an entry is stale
+            max_entries (int, optional): Least recently used entries beyond this are evicted
+            max_bytes (int, optional): Least recently used entries are evicted until
+                the stored values fit in this many bytes
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _is_fresh(self, created_at):
+        return self.ttl is None or time.time() - created_at < self.ttl
+
+    def get(self, key, allow_stale=False):
+        """
+        Look up a value
+
+        Args:
+            key (str): Cache key
+            allow_stale (bool): Return entries older than the TTL instead of None
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+
+            if row is None or not (allow_stale or self._is_fresh(row[1])):
+                self.misses += 1
+                return None
+
+            if self._is_fresh(row[1]):
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return json.loads(row[0])
+
+    def lookup(self, key):
+        """
+        Look up a value whatever its age, with a single query
+
+        Fresh entries count as hits and absent ones as misses. A stale entry
+        is not counted yet: the caller revalidates it and reports the outcome
+        with record_stale, so one lookup is counted once and a stale entry
+        that was fetched again counts as a miss.
+
+        Returns:
+            tuple: (value, fresh), or (None, False) on a miss
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None, False
+
+            fresh = self._is_fresh(row[1])
+            if fresh:
+                self.hits += 1
+
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return json.loads(row[0]), fresh
+
+    def record_stale(self, served):
+        """Count a stale entry from lookup as a stale hit if it was served, else as a miss"""
+        with self._lock:
+            if served:
+                self.stale_hits += 1
+            else:
+                self.misses += 1
+
+    def set(self, key, value):
+        """Store a JSON-serializable value and evict entries beyond the size limit"""
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload.encode("utf-8")), now, now)
+            )
+            self._evict(conn)
+
+    def delete(self, key):
+        """Remove a single entry"""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        """Remove every entry and reset the counters"""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+            self.hits = self.misses = self.stale_hits = 0
+
+    def _evict(self, conn):
+        if self.max_entries is not None:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+        if self.max_bytes is not None:
+            # Keep the most recently used entries whose cumulative size fits the budget
+            conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS total "
+                "FROM entries) WHERE total > ?)",
+                (self.max_bytes,)
+            )
+
+    def stats(self):
+        """Return hit/miss counters for this process and the current cache size"""
+        with self._lock, self._connect() as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+
+        lookups = self.hits + self.misses + self.stale_hits
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
@@ -0,0 +1,108 @@
+"""
+Import-time profile of the app, in the spirit of python -X importtime
+
+enable() wraps the import statement so that every module imported for the
+first time afterwards is timed, in whatever thread imports it. Call it
+before the other app imports.
+"""
+import sys
+import time
+import builtins
+import threading
+import importlib.util
+
+_original_import = builtins.__import__
+_lock = threading.Lock()
+_local = threading.local()
+_enabled_at = None
+_imports = []
+_milestones = {}
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    module_name = name
+    if level:
+        try:
+            module_name = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+        except (ImportError, ValueError):
+            pass
+    if module_name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+
+    # Children add their time to their parent's so self time excludes it
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        cumulative = time.perf_counter() - start
+        children = stack.pop()
+        if stack:
+            stack[-1] += cumulative
+        with _lock:
+            _imports.append({
+                "module": module_name,
+                "self_ms": round((cumulative - children) * 1000, 1),
+                "cumulative_ms": round(cumulative * 1000, 1),
+                "at_s": round(start - _enabled_at, 3),
+                "thread": threading.current_thread().name,
+            })
+
+
+def enable():
+    """Start timing imports (later calls do nothing)"""
+    global _enabled_at
+    with _lock:
+        if _enabled_at is not None:
+            return
+        _enabled_at = time.perf_counter()
+        builtins.__import__ = _timed_import
+
+
+def disable():
+    """Stop timing imports, keeping what was recorded"""
+    builtins.__import__ = _original_import
+
+
+def mark(name):
+    """Record the seconds since enable() at which a startup step finished, once per name"""
+    if _enabled_at is None:
+        return
+    with _lock:
+        _milestones.setdefault(name, round(time.perf_counter() - _enabled_at, 3))
+
+
+def milestones():
+    """Return step name -> seconds since enable()"""
+    with _lock:
+        return dict(_milestones)
+
+
+def import_times(limit=None, min_ms=0.0):
+    """
+    Return the timed imports, slowest first
+
+    Args:
+        limit (int, optional): Number of modules to return
+        min_ms (float): Skip the modules whose cumulative time is below this
+
+    Returns:
+        list: One dictionary per module with its self and cumulative import
+            time in milliseconds, when it was imported (seconds since
+            enable()) and by which thread
+    """
+    with _lock:
+        rows = [row for row in _imports if row["cumulative_ms"] >= min_ms]
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:limit] if limit else rows
+
+
+def total_seconds(until=None):
+    """Seconds spent in top-level imports, optionally only those started before a time since enable()"""
+    with _lock:
+        # Self times add up to the total without counting nested imports twice
+        return round(sum(row["self_ms"] for row in _imports if until is None or row["at_s"] <= until) / 1000, 3)
@@ -28,8 +28,13 @@ def convert_response_to_pdf(response_dict, output_filename="job_application_pack
     # Content
     pdf.set_font("Arial", "", 11)
     
+    # Render structured analyses to the same markdown layout
+    analysis = response_dict["analysis"]
+    if hasattr(analysis, "to_markdown"):
+        analysis = analysis.to_markdown()
+    
     # Split the analysis text into lines and sections
-    analysis_lines = response_dict["analysis"].split('\n')
+    analysis_lines = analysis.split('\n')
     
     for line in analysis_lines:
         # Replace all problematic Unicode characters
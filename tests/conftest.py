@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The app imports its modules relative to the app directory (from config import ...)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
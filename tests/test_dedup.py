@@ -0,0 +1,120 @@
+import pandas as pd
+
+from services.dedup import cluster_members, dedup_jobs, find_duplicates, job_key
+
+DESCRIPTION = (
+    "Nous recherchons un data scientist pour concevoir et deployer des modeles de machine learning "
+    "en production avec Python SQL et Airflow sur AWS au sein d une equipe agile de dix personnes "
+    "qui travaille sur la prevision de la demande et la detection de fraude pour nos clients"
+)
+
+
+def job(link, title="Data Scientist", company="Acme", location="Paris", text=None):
+    return {"title": title, "company": company, "location": location, "link": link, "text": text}
+
+
+def test_job_key_ignores_gender_markers_legal_suffixes_and_postal_codes():
+    keys = {
+        job_key(job("a", title="Data Scientist (H/F)", company="Acme SAS", location="Paris 75001")),
+        job_key(job("b", title="Data Scientist F/H", company="ACME", location="Paris - 75")),
+        job_key(job("c", title="Data Scientist H/F/X", company="Acme Group", location="Paris, Ile-de-France")),
+        job_key(job("d", title="Data  Scientist", company="Acmé", location="paris")),
+    }
+    assert keys == {("data scientist", "acme", "paris")}
+
+
+def test_job_key_needs_a_title_and_a_company():
+    assert job_key(job("a", title=None)) is None
+    assert job_key(job("a", title="(H/F)")) is None
+    assert job_key(job("a", company=None)) is None
+    assert job_key(job("a", company="SAS")) is None
+
+
+def test_same_key_postings_are_merged():
+    jobs = [job("a"), job("b", title="Data Scientist (H/F)", company="Acme SA"), job("c", title="Data Analyst")]
+    assert find_duplicates(jobs) == [0, 0, 2]
+
+
+def test_postings_without_company_are_not_merged_on_the_key():
+    jobs = [job("a", company=None), job("b", company=None)]
+    assert find_duplicates(jobs) == [0, 1]
+
+
+def test_postings_without_company_are_merged_on_their_description():
+    jobs = [job("a", company=None, text=DESCRIPTION), job("b", company=None, text=DESCRIPTION + " Postulez vite")]
+    assert find_duplicates(jobs) == [0, 0]
+
+
+def test_near_duplicate_descriptions_are_merged_across_titles_and_sites():
+    jobs = [
+        job("a", title="Data Scientist", company="Acme", text=DESCRIPTION),
+        job("b", title="Machine Learning Engineer", company="Acme Recrutement", location="Lyon",
+            text=DESCRIPTION.replace("dix", "douze")),
+        job("c", title="Comptable", company="Beta", text="Tenue de la comptabilite generale et analytique " * 5),
+    ]
+    assert find_duplicates(jobs) == [0, 0, 2]
+
+
+def test_clusters_are_transitive():
+    jobs = [
+        job("a", text=None),
+        job("b", title="Data Scientist H/F", text=DESCRIPTION),
+        job("c", title="Senior ML Engineer", company="Other", text=DESCRIPTION),
+    ]
+    # a and b share the key, b and c the description
+    assert find_duplicates(jobs) == [0, 0, 0]
+
+
+def test_dedup_jobs_marks_one_representative_per_cluster():
+    jobs_df = pd.DataFrame([job("a"), job("b", text=DESCRIPTION), job("c", title="Data Analyst")])
+
+    deduped = dedup_jobs(jobs_df)
+
+    assert deduped["cluster_size"].tolist() == [2, 2, 1]
+    # The copy with a description represents its cluster
+    assert deduped["is_representative"].tolist() == [False, True, True]
+    assert cluster_members(deduped, 1)["link"].tolist() == ["a"]
+    assert cluster_members(deduped, 2).empty
+
+
+def test_representatives_stay_put_when_descriptions_arrive():
+    jobs_df = pd.DataFrame([
+        job("a", text=None),
+        job("b", title="Senior ML Engineer", company="Other", text=DESCRIPTION),
+    ])
+    deduped = dedup_jobs(jobs_df)
+    assert deduped["is_representative"].tolist() == [True, True]
+
+    # Hydrating a reveals it is a copy of b: the cluster keeps one of its previous representatives
+    deduped.at[0, "text"] = DESCRIPTION
+    reclustered = dedup_jobs(deduped)
+    assert reclustered["cluster"].tolist() == [0, 0]
+    assert reclustered["is_representative"].tolist() == [True, False]
+
+    # Reversed order: b was the representative and stays one
+    jobs_df = pd.DataFrame([job("a"), job("b", text=DESCRIPTION)])
+    deduped = dedup_jobs(jobs_df)
+    assert deduped["is_representative"].tolist() == [False, True]
+    deduped.at[0, "text"] = DESCRIPTION
+    assert dedup_jobs(deduped)["is_representative"].tolist() == [False, True]
+
+
+def test_representatives_can_be_picked_again():
+    jobs_df = pd.DataFrame([job("a"), job("b", text=DESCRIPTION)])
+    deduped = dedup_jobs(jobs_df)
+    assert deduped["is_representative"].tolist() == [False, True]
+
+    # After ranking, the best ranked copy with a description should win
+    deduped.at[0, "text"] = DESCRIPTION
+    assert dedup_jobs(deduped, keep_representatives=False)["is_representative"].tolist() == [True, False]
+
+
+def test_dedup_jobs_keeps_the_index():
+    jobs_df = pd.DataFrame([job("a"), job("b")], index=[7, 3])
+    deduped = dedup_jobs(jobs_df)
+    assert deduped.index.tolist() == [7, 3]
+    assert cluster_members(deduped, 7).index.tolist() == [3]
+
+
+def test_empty_table():
+    assert dedup_jobs(pd.DataFrame()).empty
@@ -0,0 +1,121 @@
+import time
+import threading
+
+import pytest
+
+from services.pipeline import Pipeline, Stage
+
+
+def run_with_timeout(pipeline, items, timeout=10):
+    """Run a pipeline in a thread so a hang fails the test instead of blocking it"""
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.update(result=pipeline.run(items)), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "pipeline did not finish"
+    return outcome["result"]
+
+
+def stats_of(pipeline, name):
+    return next(stats for stats in pipeline.stats() if stats["stage"] == name)
+
+
+def test_single_workers_keep_the_order():
+    pipeline = Pipeline([Stage("double", lambda x: x * 2), Stage("increment", lambda x: x + 1)])
+
+    results, errors = run_with_timeout(pipeline, range(20))
+
+    assert results == [x * 2 + 1 for x in range(20)]
+    assert errors == []
+
+
+def test_dropped_and_failed_items_are_counted():
+    def check(x):
+        if x % 5 == 0:
+            raise ValueError(f"bad item {x}")
+        return x
+
+    pipeline = Pipeline([
+        Stage("odd", lambda x: x if x % 2 else None),
+        Stage("check", check),
+    ])
+
+    results, errors = run_with_timeout(pipeline, range(20))
+
+    assert sorted(results) == [1, 3, 7, 9, 11, 13, 17, 19]
+    assert sorted(item for _, item, _ in errors) == [5, 15]
+    assert {stage for stage, _, _ in errors} == {"check"}
+    assert stats_of(pipeline, "odd")["dropped"] == 10
+    assert stats_of(pipeline, "odd")["processed"] == 10
+    assert stats_of(pipeline, "check")["failed"] == 2
+    assert stats_of(pipeline, "check")["processed"] == 8
+
+
+def test_a_failing_source_is_reported_and_earlier_items_still_finish():
+    def items():
+        yield 1
+        yield 2
+        raise RuntimeError("search crashed")
+
+    pipeline = Pipeline([Stage("identity", lambda x: x, workers=3)], source_name="discovery")
+
+    results, errors = run_with_timeout(pipeline, items())
+
+    assert sorted(results) == [1, 2]
+    assert errors == [("discovery", None, "search crashed")]
+
+
+def test_every_worker_of_every_stage_stops():
+    pipeline = Pipeline([
+        Stage("first", lambda x: x, workers=4, queue_size=1),
+        Stage("second", lambda x: x, workers=3, queue_size=1),
+        Stage("third", lambda x: x, workers=2, queue_size=1),
+    ])
+
+    results, errors = run_with_timeout(pipeline, range(50))
+
+    assert sorted(results) == list(range(50))
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("pipeline-")]
+
+
+def test_empty_input_finishes():
+    pipeline = Pipeline([Stage("identity", lambda x: x, workers=2)])
+    assert run_with_timeout(pipeline, []) == ([], [])
+
+
+def test_a_slow_stage_holds_back_the_source():
+    in_flight = []
+    lock = threading.Lock()
+    produced = []
+
+    def items():
+        for x in range(10):
+            produced.append(x)
+            yield x
+
+    def slow(x):
+        with lock:
+            # Items the source produced that the slow stage has not finished
+            in_flight.append(len(produced) - x)
+        time.sleep(0.02)
+        return x
+
+    pipeline = Pipeline([Stage("slow", slow, workers=2, queue_size=1)])
+
+    results, _ = run_with_timeout(pipeline, items())
+
+    assert sorted(results) == list(range(10))
+    # Two items being processed, one in the queue and one blocked in the source at most
+    assert max(in_flight) <= 4
+    assert stats_of(pipeline, "source")["blocked_seconds"] > 0
+
+
+def test_workers_process_items_concurrently():
+    pipeline = Pipeline([Stage("sleep", lambda x: time.sleep(0.1) or x, workers=5)])
+
+    start = time.perf_counter()
+    results, _ = run_with_timeout(pipeline, range(5))
+
+    assert sorted(results) == list(range(5))
+    assert time.perf_counter() - start < 0.4
+    assert stats_of(pipeline, "sleep")["utilization"] == pytest.approx(1, abs=0.5)
@@ -0,0 +1,149 @@
+import time
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from services import scheduler as scheduler_module
+from services.mock_llm import MockLLM, AsyncMockLLM, MOCK_URL, rate_limit_error
+from services.scheduler import RequestScheduler
+
+
+def quota_error():
+    request = httpx.Request("POST", MOCK_URL)
+    response = httpx.Response(429, request=request)
+    return openai.RateLimitError(
+        "You exceeded your current quota (mock)", response=response, body={"code": "insufficient_quota"}
+    )
+
+
+def create(llm):
+    return lambda: llm.responses.create(model="gpt-4o-mini", input="Write a cover letter")
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the scheduler's throttling sleeps instead of waiting (retry backoffs still sleep)"""
+    recorded = []
+    clock = SimpleNamespace(sleep=recorded.append, monotonic=time.monotonic, time=time.time)
+    monkeypatch.setattr(scheduler_module, "time", clock)
+    return recorded
+
+
+def test_retries_after_the_delay_of_a_rate_limit():
+    llm = MockLLM(failures=[rate_limit_error(0.3)])
+    scheduler = RequestScheduler(max_attempts=3, backoff_base=30, backoff_max=30)
+
+    start = time.monotonic()
+    response = scheduler.call(create(llm))
+    elapsed = time.monotonic() - start
+
+    assert response.output_text == "Mock response"
+    assert len(llm.calls) == 2
+    # Retry-After is honored instead of the (much longer) exponential backoff
+    assert 0.3 <= elapsed < 5
+    assert scheduler.stats()["rate_limited"] == 1
+    assert scheduler.stats()["retries"] == 1
+
+
+def test_rate_limit_pauses_every_caller():
+    llm = MockLLM(failures=[rate_limit_error(0.3)])
+    scheduler = RequestScheduler(max_attempts=3)
+
+    scheduler.call(create(llm))
+    # The pause has passed, a later call runs right away
+    assert scheduler._reserve(0) == 0.0
+
+
+def test_does_not_retry_an_exhausted_quota():
+    llm = MockLLM(failures=[quota_error()])
+    scheduler = RequestScheduler(max_attempts=5)
+
+    with pytest.raises(openai.RateLimitError):
+        scheduler.call(create(llm))
+
+    assert len(llm.calls) == 1
+    assert scheduler.stats()["retries"] == 0
+    assert scheduler.stats()["failures"] == 1
+
+
+def test_gives_up_after_max_attempts():
+    llm = MockLLM(failures=["server_error"] * 5)
+    scheduler = RequestScheduler(max_attempts=2, backoff_base=0.01, backoff_max=0.01)
+
+    with pytest.raises(openai.InternalServerError):
+        scheduler.call(create(llm))
+
+    assert len(llm.calls) == 2
+
+
+def test_throttles_requests_over_the_per_minute_limit(sleeps):
+    llm = MockLLM()
+    scheduler = RequestScheduler(requests_per_minute=2)
+
+    for _ in range(3):
+        scheduler.call(create(llm))
+
+    # Two requests fit in the bucket, the third waits for one to refill (30s at 2/min)
+    assert sleeps[0] == 0.0 and sleeps[1] == 0.0
+    assert sleeps[2] == pytest.approx(30, abs=1)
+    assert scheduler.stats()["throttled_seconds"] == pytest.approx(30, abs=1)
+
+
+def test_throttles_tokens_over_the_per_minute_limit(sleeps):
+    llm = MockLLM(output_text="word " * 400)
+    scheduler = RequestScheduler(tokens_per_minute=600)
+
+    scheduler.call(create(llm), tokens=600)
+    # The reservation was corrected to the reported usage, not fully refunded
+    used = 600 - scheduler.tokens.tokens
+    assert used > 100
+
+    scheduler.call(create(llm), tokens=600)
+    assert sleeps[0] == 0.0
+    assert sleeps[1] > 0
+
+
+def test_failed_attempts_give_back_their_tokens(sleeps):
+    llm = MockLLM(failures=["server_error", "server_error", "server_error"])
+    scheduler = RequestScheduler(tokens_per_minute=1000, max_attempts=3, backoff_base=0.01, backoff_max=0.01)
+
+    with pytest.raises(openai.InternalServerError):
+        scheduler.call(create(llm), tokens=400)
+
+    assert scheduler.tokens.tokens == pytest.approx(1000, abs=1)
+    # Every retry found the bucket full again
+    assert sleeps == [0.0, 0.0, 0.0]
+
+
+def test_async_call_retries_and_refunds():
+    llm = AsyncMockLLM(failures=["timeout"])
+    scheduler = RequestScheduler(tokens_per_minute=1000, backoff_base=0.01, backoff_max=0.01)
+
+    response = asyncio.run(scheduler.acall(
+        lambda: llm.responses.create(model="gpt-4o-mini", input="Write a cover letter"), tokens=400
+    ))
+
+    assert response.output_text == "Mock response"
+    assert len(llm.calls) == 2
+    # Only the successful attempt is charged, at its reported usage
+    usage = response.usage.input_tokens + response.usage.output_tokens
+    assert scheduler.tokens.tokens == pytest.approx(1000 - usage, abs=1)
+
+
+def test_streamed_calls_are_settled_with_the_completed_usage(monkeypatch):
+    from services import streaming
+
+    llm = MockLLM(output_text="A short streamed answer")
+    scheduler = RequestScheduler(tokens_per_minute=10000)
+    monkeypatch.setattr(streaming, "get_scheduler", lambda: scheduler)
+
+    text = "".join(streaming.stream_output_text(llm, "gpt-4o-mini", "Write a cover letter"))
+
+    assert text == "A short streamed answer"
+    # Only the reported usage stays reserved, not the output estimate
+    response = llm.responses.create(model="gpt-4o-mini", input="Write a cover letter")
+    usage = response.usage.input_tokens + response.usage.output_tokens
+    assert scheduler.tokens.tokens == pytest.approx(10000 - usage, abs=1)
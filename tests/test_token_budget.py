@@ -0,0 +1,62 @@
+from services.token_budget import (
+    count_tokens,
+    dedupe_paragraphs,
+    fit_to_budget,
+    truncate_tokens,
+    truncate_to_budget,
+)
+
+MODEL = "gpt-4.1"
+
+
+def test_text_without_newlines_is_cut_not_dropped():
+    text, before, after = fit_to_budget("word " * 20000, MODEL, "resume")
+
+    assert before > 3000
+    assert 0 < after <= 3000
+    assert text.startswith("word word")
+    # Cut between words
+    assert text.endswith("word")
+
+
+def test_one_long_line_in_a_section_is_cut_to_the_remaining_budget():
+    text = "Missions\n" + "task " * 10000 + "\nProfil\nshort line"
+
+    trimmed = truncate_to_budget(text, 200, MODEL)
+
+    assert count_tokens(trimmed, MODEL) <= 200
+    assert trimmed.startswith("Missions\ntask task")
+    assert trimmed.endswith("Profil\nshort line")
+
+
+def test_smaller_sections_after_one_that_does_not_fit_are_kept():
+    text = "Missions\n" + "\n".join(["build models"] * 300) + "\nProfil\nPython and SQL\nAvantages\nTickets restaurant"
+
+    trimmed = truncate_to_budget(text, 150, MODEL)
+
+    assert count_tokens(trimmed, MODEL) <= 150
+    assert "Profil\nPython and SQL" in trimmed
+    assert "Avantages\nTickets restaurant" in trimmed
+    assert "build models" in trimmed
+
+
+def test_text_within_budget_is_unchanged():
+    text = "Missions\nBuild models\n\nProfil\nPython"
+    assert truncate_to_budget(text, 1000, MODEL) == text
+
+
+def test_truncate_tokens():
+    assert truncate_tokens("alpha beta gamma", 0, MODEL) == ""
+    cut = truncate_tokens("alpha beta gamma " * 100, 10, MODEL)
+    assert 0 < count_tokens(cut, MODEL) <= 10
+    assert cut.split()[-1] in {"alpha", "beta", "gamma"}
+
+
+def test_dedupe_keeps_lines_repeated_in_different_paragraphs():
+    resume = "Data Engineer, Acme\n2019-2021\n- Python\n\nML Engineer, Beta\n2019-2021\n- Python\n- SQL"
+    assert dedupe_paragraphs(resume) == resume
+
+
+def test_dedupe_drops_repeated_paragraphs_and_blank_runs():
+    text = "Intro\n\n\n\nPostuler ici\nnow\n\npostuler  ici\nNOW\n\nEnd"
+    assert dedupe_paragraphs(text) == "Intro\n\nPostuler ici\nnow\n\nEnd"